@@ -0,0 +1,84 @@
+"""
+Benchmark del estado de partida en memoria (GAME_STATE_ENGINE).
+
+Mide cuánto tarda cada acción de juego (descartar, reponer del mazo de
+robo, pasar el turno y reponer el draft) sin contar el commit, con el motor
+apagado (todo por la base) y prendido. Cada ronda es una unit of work como
+en los endpoints; el commit, con las escrituras en tandas, se mide aparte.
+
+    cd Backend && python -m benchmarks.bench_game_state --games 12 --rounds 8
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from collections import defaultdict
+
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.bench_sqlite_profile import make_engine, seed_game, start_flow
+from src.gameLogic.advance_turn_service import advance_turn
+from src.gameLogic.discard_card_service import discard_card
+from src.gameLogic.game_state import game_states
+from src.gameLogic.restock_cards_service import restock_card
+from src.gameLogic.restock_draft_deck import restock_draft_deck
+from src.models.db import unit_of_work
+from src.playerCard.services import PlayerCardService
+
+
+def timed(timings: dict, name: str, fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    timings[name].append(time.perf_counter() - started)
+    return result
+
+
+def play_round(Session, game_id: int, timings: dict) -> None:
+    with unit_of_work(Session()) as db:
+        player_id = advance_turn(db, game_id)
+        hand = PlayerCardService(db).get_player_cards(player_id)
+        card = next(c for c in hand if not c.name.startswith("secret_"))
+        db.commit()
+
+        timed(timings, "descartar", discard_card, db, game_id, player_id, card.id)
+        timed(timings, "reponer", restock_card, db, game_id, player_id, [], 1)
+        timed(timings, "pasar turno", advance_turn, db, game_id)
+        timed(timings, "reponer draft", restock_draft_deck, db, game_id)
+        started = time.perf_counter()
+    timings["commit"].append(time.perf_counter() - started)
+
+
+def bench(enabled: bool, games: int, rounds: int) -> dict:
+    game_states.enabled = enabled
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(os.path.join(tmp, "bench.db"), tuned=True)
+        Session = sessionmaker(bind=engine, autoflush=False)
+        game_ids = [seed_game(Session) for _ in range(games)]
+        for game_id in game_ids:
+            start_flow(Session, game_id)
+            # La primera acción carga la partida en memoria: no se mide
+            play_round(Session, game_id, defaultdict(list))
+
+        timings = defaultdict(list)
+        for _ in range(rounds):
+            for game_id in game_ids:
+                play_round(Session, game_id, timings)
+        engine.dispose()
+        return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=12)
+    parser.add_argument("--rounds", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{'motor':<10} {'acción':<14} {'acciones':>9} {'ms/acción':>10}")
+    for label, enabled in (("apagado", False), ("prendido", True)):
+        for name, samples in bench(enabled, args.games, args.rounds).items():
+            print(f"{label:<10} {name:<14} {len(samples):>9} {1000 * sum(samples) / len(samples):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark del perfil de conexión de SQLite.
+
+Mide commits por segundo de los flujos start_game y reponer cartas
+(descartar + restock_card) con los valores por defecto de SQLite
+(rollback journal, synchronous=FULL) y con el perfil de Settings
+(WAL, synchronous, cache, mmap, busy_timeout...). Cada flujo corre en
+varios threads a la vez, cada uno con sus partidas, como varias
+requests concurrentes. Cada acción (start_game, descartar, reponer) es
+una unit of work como en los endpoints: un solo commit al final.
+
+    cd Backend && python -m benchmarks.bench_sqlite_profile --games 12 --threads 4
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from datetime import date
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import src.api  # noqa: F401 (registra todos los modelos en Base)
+from src.game.models import Game
+from src.gameLogic.discard_card_service import discard_card
+from src.gameLogic.restock_cards_service import restock_card
+from src.gameLogic.start_game import start_game
+from src.gamePlayer.models import PlayerGame
+from src.models.db import Base, apply_sqlite_pragmas, pool_options, unit_of_work
+from src.player.models import Player
+from src.playerCard.services import PlayerCardService
+
+
+def make_engine(path: str, tuned: bool):
+    url = f"sqlite:///{path}"
+    engine = create_engine(url, connect_args={"check_same_thread": False}, **pool_options(url))
+    if tuned:
+        event.listen(engine, "connect", apply_sqlite_pragmas)
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def seed_game(Session, players: int = 4) -> int:
+    with Session() as db:
+        game = Game(name="bench", max_players=6, min_players=2)
+        db.add(game)
+        db.commit()
+        for i in range(players):
+            player = Player(name=f"p{i}", birthdate=date(1990, 1, i + 1), avatar="a",
+                            is_Social_Disgrace=False, is_Your_Turn=False, is_Owner=i == 0, rol="innocent")
+            db.add(player)
+            db.commit()
+            db.add(PlayerGame(game_id=game.id, player_id=player.id))
+        db.commit()
+        return game.id
+
+
+def start_flow(Session, game_id: int) -> int:
+    with unit_of_work(Session()) as db:
+        start_game(db, game_id)
+    return 1
+
+
+def restock_flow(Session, game_id: int) -> int:
+    with Session() as db:
+        player_ids = [pg.player_id for pg in db.query(PlayerGame).filter(PlayerGame.game_id == game_id)]
+    for player_id in player_ids:
+        with unit_of_work(Session()) as db:
+            hand = PlayerCardService(db).get_player_cards(player_id)
+            card = next(c for c in hand if not c.name.startswith("secret_"))
+            discard_card(db, game_id, player_id, card.id)
+        with unit_of_work(Session()) as db:
+            restock_card(db, game_id, player_id, [], 1)
+    return 2 * len(player_ids)
+
+
+def run_concurrently(flow, Session, game_ids: list[int], threads: int) -> tuple[float, int, int]:
+    errors = []
+    actions = []
+
+    def worker(ids):
+        for game_id in ids:
+            try:
+                actions.append(flow(Session, game_id))
+            except Exception as e:
+                errors.append(e)
+
+    chunks = [game_ids[i::threads] for i in range(threads)]
+    workers = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+    started = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return time.perf_counter() - started, sum(actions), len(errors)
+
+
+def bench(tuned: bool, games: int, threads: int) -> list[tuple]:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(os.path.join(tmp, "bench.db"), tuned)
+        commits = 0
+
+        def count_commit(conn):
+            nonlocal commits
+            commits += 1
+
+        event.listen(engine, "commit", count_commit)
+        Session = sessionmaker(bind=engine, autoflush=False)
+        game_ids = [seed_game(Session) for _ in range(games)]
+
+        rows = []
+        for name, flow in (("start_game", start_flow), ("restock", restock_flow)):
+            commits = 0
+            elapsed, actions, errors = run_concurrently(flow, Session, game_ids, threads)
+            rows.append((name, commits, elapsed, commits / elapsed, commits / max(actions, 1),
+                         1000 * elapsed / max(actions, 1), errors))
+        engine.dispose()
+        return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=12)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{'perfil':<10} {'flujo':<11} {'commits':>8} {'segundos':>9} {'commits/s':>10} "
+          f"{'commits/acción':>15} {'ms/acción':>10} {'errores':>8}")
+    for label, tuned in (("default", False), ("settings", True)):
+        for name, commits, elapsed, rate, per_action, ms, errors in bench(tuned, args.games, args.threads):
+            print(f"{label:<10} {name:<11} {commits:>8} {elapsed:>9.2f} {rate:>10.0f} "
+                  f"{per_action:>15.1f} {ms:>10.1f} {errors:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Cache LRU de la metadata de cada carta (nombre, descripción, imagen,
+is_murderes_escapes) por id. Es inmutable mientras la carta no se edite, así
+que los restock arman el CardOut sin ir a la base.
+"""
+
+import threading
+from collections import OrderedDict
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from src.settings import settings
+from src.cards.catalog import CatalogEntry, card_catalog
+from src.cards.models import Card
+from src.cards.schemas import CardOut
+
+PENDING_KEY = "card_cache_pending"
+
+
+def _url(bind) -> str:
+    return str(bind.engine.url)
+
+
+class CardCache:
+    """
+    Read-through LRU cache of card id -> catalog entry, one per database.
+
+    Entries read or loaded inside a transaction are kept in the session and
+    published when it commits: a rolled back card id can be reused by
+    SQLite for another card. Editing or deleting a card evicts it.
+    """
+
+    def __init__(self, max_size: int | None = None):
+        self.max_size = max_size or settings.CARD_CACHE_SIZE
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, int], CatalogEntry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _pending(self, session: Session) -> dict[int, CatalogEntry]:
+        return session.info.setdefault(PENDING_KEY, {})
+
+    def _lookup(self, session: Session, card_id: int) -> CatalogEntry | None:
+        key = (_url(session.get_bind()), card_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+        entry = session.info.get(PENDING_KEY, {}).get(card_id)
+        with self._lock:
+            if entry is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return entry
+
+    def get(self, session: Session, card_id: int) -> CatalogEntry | None:
+        """Entrada del catálogo de la carta, o None si no existe."""
+        entry = self._lookup(session, card_id)
+        if entry is None:
+            catalog_id = session.execute(select(Card.catalog_id).where(Card.id == card_id)).scalar()
+            if catalog_id is None:
+                return None
+            entry = card_catalog.get(session, catalog_id)
+            self._pending(session)[card_id] = entry
+        return entry
+
+    def card_out(self, session: Session, card_id: int) -> CardOut | None:
+        entry = self.get(session, card_id)
+        return None if entry is None else CardOut(id=card_id, **entry.fields())
+
+    def remember(self, session: Session, entries: dict[int, CatalogEntry]) -> None:
+        """Carga de una vez las cartas de una partida nueva; se publican con el commit."""
+        # Sin transacción no hay commit ni rollback que las confirme o descarte
+        if session.in_transaction():
+            self._pending(session).update(entries)
+
+    def commit(self, session: Session) -> None:
+        pending = session.info.pop(PENDING_KEY, None)
+        if not pending:
+            return
+        url = _url(session.get_bind())
+        with self._lock:
+            for card_id, entry in pending.items():
+                self._entries[(url, card_id)] = entry
+                self._entries.move_to_end((url, card_id))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, session: Session) -> None:
+        session.info.pop(PENDING_KEY, None)
+
+    def invalidate(self, bind, card_ids) -> None:
+        url = _url(bind)
+        with self._lock:
+            for card_id in card_ids:
+                self._entries.pop((url, card_id), None)
+
+    def clear(self, bind=None) -> None:
+        with self._lock:
+            if bind is None:
+                self._entries.clear()
+            else:
+                url = _url(bind)
+                for key in [key for key in self._entries if key[0] == url]:
+                    del self._entries[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+card_cache = CardCache()
+
+
+@event.listens_for(Session, "after_commit")
+def _commit_card_entries(session):
+    card_cache.commit(session)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_card_entries(session, previous_transaction):
+    # Cualquier rollback (también de un savepoint): a lo sumo cuesta un miss
+    card_cache.discard(session)
+
+
+@event.listens_for(Card, "after_update", propagate=True)
+@event.listens_for(Card, "after_delete", propagate=True)
+def _evict_card(mapper, connection, card):
+    # Editada (otra entrada del catálogo) o borrada: la próxima lectura va a la base
+    card_cache.invalidate(connection, [card.id])
+    session = Session.object_session(card)
+    if session is not None:
+        session.info.get(PENDING_KEY, {}).pop(card.id, None)
+
+
+@event.listens_for(Card.__table__, "after_create")
+@event.listens_for(Card.__table__, "after_drop")
+def _reset_card_cache(target, connection, **kw):
+    card_cache.clear(connection)
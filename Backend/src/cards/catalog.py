@@ -0,0 +1,229 @@
+"""
+Catálogo de cartas: nombre, descripción, imagen y tipo de cada carta distinta,
+compartidos por todas las partidas. Cada partida solo guarda filas livianas en
+`cards` que apuntan a una entrada del catálogo (catalog_id) y su estado.
+"""
+
+import threading
+from dataclasses import asdict, dataclass
+
+from sqlalchemy import Boolean, Column, Integer, String, UniqueConstraint, event, inspect, select, text, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from src.models.db import Base
+
+
+class CardCatalog(Base):
+    """
+    Represent a catalog entry, immutable once created
+
+    """
+
+    __tablename__ = "card_catalog"
+    __table_args__ = (
+        UniqueConstraint("kind", "name", "description", "image_url", "is_murderes_escapes", name="uq_card_catalog_entry"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    # polymorphic_identity del modelo: card, secret_card, detective_card o event_card
+    kind = Column(String, nullable=False)
+    name = Column(String, nullable=False)
+    description = Column(String, nullable=False)
+    image_url = Column(String, nullable=False)
+    is_murderes_escapes = Column(Boolean, nullable=False)
+
+
+CATALOG_FIELDS = ("name", "description", "image_url", "is_murderes_escapes")
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    id: int
+    kind: str
+    name: str
+    description: str
+    image_url: str
+    is_murderes_escapes: bool
+
+    @property
+    def key(self) -> tuple:
+        return catalog_key(self.kind, **self.fields())
+
+    def fields(self) -> dict:
+        data = asdict(self)
+        return {field: data[field] for field in CATALOG_FIELDS}
+
+
+def catalog_key(kind: str, name: str, description: str, image_url: str, is_murderes_escapes: bool) -> tuple:
+    return (kind, name, description, image_url, bool(is_murderes_escapes))
+
+
+def _url(bind) -> str:
+    return str(bind.engine.url)
+
+
+class CardCatalogCache:
+    """
+    Entradas del catálogo en memoria, por base de datos (URL del engine). La
+    primera vez que se usa una base se carga el catálogo completo; después solo
+    se agregan las entradas nuevas, y recién cuando su transacción hace commit
+    (un rollback no deja ids que no existen).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_url: dict[str, tuple[dict[int, CatalogEntry], dict[tuple, CatalogEntry]]] = {}
+
+    def _entries(self, session: Session) -> tuple[dict[int, CatalogEntry], dict[tuple, CatalogEntry]]:
+        url = _url(session.get_bind())
+        entries = self._by_url.get(url)
+        if entries is None:
+            rows = session.execute(select(CardCatalog.__table__)).all()
+            by_id = {row.id: CatalogEntry(**row._mapping) for row in rows}
+            with self._lock:
+                entries = self._by_url.setdefault(url, (by_id, {e.key: e for e in by_id.values()}))
+        return entries
+
+    def _remember(self, session: Session, entries: list[CatalogEntry]) -> None:
+        """Agrega `entries` al cache cuando la transacción de `session` haga commit."""
+        if entries:
+            session.info.setdefault("card_catalog_pending", []).extend(entries)
+
+    def commit(self, session: Session) -> None:
+        pending = session.info.pop("card_catalog_pending", None)
+        entries = self._by_url.get(_url(session.get_bind())) if pending else None
+        if entries is None:
+            # Sin cache de esa base todavía: la carga completa ya las va a leer
+            return
+        by_id, by_key = entries
+        with self._lock:
+            for entry in pending:
+                by_id[entry.id] = entry
+                by_key[entry.key] = entry
+
+    def discard(self, session: Session) -> None:
+        session.info.pop("card_catalog_pending", None)
+
+    def clear(self, bind=None) -> None:
+        with self._lock:
+            if bind is None:
+                self._by_url.clear()
+            else:
+                self._by_url.pop(_url(bind), None)
+
+    def get(self, session: Session, catalog_id: int) -> CatalogEntry:
+        by_id, _ = self._entries(session)
+        entry = by_id.get(catalog_id)
+        if entry is None:
+            # Creada por otro worker, o en esta transacción todavía sin commit
+            row = session.execute(
+                select(CardCatalog.__table__).where(CardCatalog.__table__.c.id == catalog_id)
+            ).one()
+            entry = CatalogEntry(**row._mapping)
+            self._remember(session, [entry])
+        return entry
+
+    def entries(self, session: Session) -> list[CatalogEntry]:
+        by_id, _ = self._entries(session)
+        return sorted(by_id.values(), key=lambda entry: entry.id)
+
+    def resolve_many(self, session: Session, keys: list[tuple]) -> dict[tuple, CatalogEntry]:
+        """
+        Entradas de cada clave (kind, name, description, image_url, is_murderes_escapes),
+        creando las que falten con un solo INSERT. Retorna {clave: entrada}.
+        """
+        _, by_key = self._entries(session)
+        # Las creadas en esta misma transacción todavía no están en el cache
+        pending = {entry.key: entry for entry in session.info.get("card_catalog_pending", ())}
+        found = {key: by_key.get(key) or pending[key] for key in keys if key in by_key or key in pending}
+        missing = list(dict.fromkeys(key for key in keys if key not in found))
+        if not missing:
+            return found
+
+        table = CardCatalog.__table__
+        rows = [dict(zip(("kind", *CATALOG_FIELDS), key)) for key in missing]
+        dialect = session.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            # Otra request (u otro worker) pudo crear la misma entrada a la vez
+            insert_stmt = (sqlite.insert if dialect == "sqlite" else postgresql.insert)(table)
+            session.execute(insert_stmt.on_conflict_do_nothing(), rows)
+        else:
+            session.execute(table.insert(), rows)
+
+        columns = (table.c.kind, table.c.name, table.c.description, table.c.image_url, table.c.is_murderes_escapes)
+        created = [
+            CatalogEntry(**row._mapping)
+            for row in session.execute(select(table).where(tuple_(*columns).in_(missing))).all()
+        ]
+        self._remember(session, created)
+        found.update((entry.key, entry) for entry in created)
+        return found
+
+    def resolve(self, session: Session, kind: str, **fields) -> CatalogEntry:
+        key = catalog_key(kind, **fields)
+        return self.resolve_many(session, [key])[key]
+
+
+card_catalog = CardCatalogCache()
+
+
+@event.listens_for(Session, "after_commit")
+def _commit_catalog_entries(session):
+    card_catalog.commit(session)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_catalog_entries(session):
+    card_catalog.discard(session)
+
+
+@event.listens_for(CardCatalog.__table__, "after_create")
+@event.listens_for(CardCatalog.__table__, "after_drop")
+def _reset_catalog_cache(target, connection, **kw):
+    # Una tabla nueva o borrada (p. ej. los tests) invalida los ids de esa base
+    card_catalog.clear(connection)
+
+
+def migrate_legacy_cards(bind) -> int:
+    """
+    Pasa una tabla `cards` de antes del catálogo (con name, description, image_url
+    e is_murderes_escapes en cada fila) a card_catalog + cards.catalog_id.
+    Idempotente; retorna la cantidad de cartas migradas. Todo va en una sola
+    transacción y las columnas se miran dentro de ella: si otro proceso migró
+    antes (con SQLite los serializa migration_lock; con PostgreSQL, el lock de
+    la tabla) no queda nada por hacer.
+    """
+    if not inspect(bind).has_table("cards"):
+        return 0
+
+    kind = (
+        "CASE WHEN c.id IN (SELECT id FROM secret_cards) THEN 'secret_card' "
+        "WHEN c.id IN (SELECT id FROM detective_cards) THEN 'detective_card' "
+        "WHEN c.id IN (SELECT id FROM event_cards) THEN 'event_card' ELSE 'card' END"
+    )
+    same_entry = (
+        f"cc.kind = {kind} AND cc.name = c.name AND cc.description = c.description "
+        "AND cc.image_url = c.image_url AND cc.is_murderes_escapes = c.is_murderes_escapes"
+    )
+    with bind.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.execute(text("LOCK TABLE cards IN ACCESS EXCLUSIVE MODE"))
+        columns = {column["name"] for column in inspect(conn).get_columns("cards")}
+        if "name" not in columns:
+            return 0
+        if "catalog_id" not in columns:
+            conn.execute(text("ALTER TABLE cards ADD COLUMN catalog_id INTEGER REFERENCES card_catalog(id)"))
+        conn.execute(text(
+            "INSERT INTO card_catalog (kind, name, description, image_url, is_murderes_escapes) "
+            f"SELECT DISTINCT {kind}, c.name, c.description, c.image_url, c.is_murderes_escapes FROM cards c "
+            f"WHERE NOT EXISTS (SELECT 1 FROM card_catalog cc WHERE {same_entry})"
+        ))
+        migrated = conn.execute(text(
+            f"UPDATE cards SET catalog_id = (SELECT cc.id FROM card_catalog cc, cards c "
+            f"WHERE c.id = cards.id AND {same_entry})"
+        )).rowcount
+        for column in CATALOG_FIELDS:
+            conn.execute(text(f"ALTER TABLE cards DROP COLUMN {column}"))
+    card_catalog.clear(bind)
+    return migrated
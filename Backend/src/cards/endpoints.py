@@ -4,9 +4,11 @@ from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 
+from src.cards.card_cache import card_cache
+from src.cards.catalog import card_catalog
 from src.cards.models import Card
 from src.cards.schemas import (
-    CardIn, CardOut, CardResponse,
+    CardCatalogOut, CardIn, CardOut, CardResponse,
     WSAddMessage,
     WSRemoveMessage,
     WSUpdateMessage,
@@ -15,7 +17,7 @@ from src.cards.schemas import (
 from src.cards.utils import db_card_2_card_out
 from src.websocket import manager
 from src.cards.services import CardService
-from src.models.db import get_db
+from src.models.db import get_db, run_db
 
 cards_router = APIRouter()
 
@@ -49,6 +51,32 @@ async def retrieve_cards(
     )
 
 
+@cards_router.get(path="/catalog")
+async def retrieve_card_catalog(db=Depends(get_db)) -> List[CardCatalogOut]:
+    """
+    Retrieves the card catalog: every distinct card, shared by all games.
+
+    Returns
+    -------
+    List[CardCatalogOut]
+        Catalog entries ordered by id
+    """
+    return card_catalog.entries(db)
+
+
+@cards_router.get(path="/cache")
+async def card_cache_stats() -> dict:
+    """
+    Stats of the card metadata cache used by the restock paths.
+
+    Returns
+    -------
+    dict
+        size, max_size, hits, misses, evictions and hit_ratio
+    """
+    return card_cache.stats()
+
+
 @cards_router.get(path="/{id}")
 async def get_card(id: int, db=Depends(get_db)) -> CardOut:
     """
@@ -102,7 +130,7 @@ async def create_card(
         404 -> When there is an error creating the card
     """
     try:
-        created_card = CardService(db).create(card_info.to_dto())
+        created_card = await run_db(db, lambda db: CardService(db).create(card_info.to_dto()))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -112,7 +140,7 @@ async def create_card(
     ws_message = WSAddMessage(
 		payload=db_card_2_card_out(db_card=created_card)
 	)
-    await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+    await manager.broadcast(ws_message, room_id=room_id)
     return CardResponse(id=created_card.id, message="El juego fue creado correctamente")
 
 
@@ -139,7 +167,7 @@ async def delete_card(id: int,
         404 -> When card with id is not found
     """
     try:
-        deleted_id = CardService(db).delete(id=id)
+        deleted_id = await run_db(db, lambda db: CardService(db).delete(id=id))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -147,7 +175,7 @@ async def delete_card(id: int,
         )
         
     ws_message = WSRemoveMessage(payload=deleted_id)
-    await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+    await manager.broadcast(ws_message, room_id=room_id)
     return CardResponse(id=deleted_id, message="La partida se elimino correctamente")
 
 @cards_router.put(path="/{id}", response_model=CardOut)
@@ -176,7 +204,7 @@ async def update_card(id: int,
         400 -> When there is an error updating the card
     """
     try:
-        updated_card = CardService(db).update(id=id, card_dto=card_info.to_dto())
+        updated_card = await run_db(db, lambda db: CardService(db).update(id=id, card_dto=card_info.to_dto()))
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -189,5 +217,5 @@ async def update_card(id: int,
         )
         
     ws_message = WSUpdateMessage(payload=db_card_2_card_out(db_card=updated_card))
-    await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+    await manager.broadcast(ws_message, room_id=room_id)
     return updated_card  
\ No newline at end of file
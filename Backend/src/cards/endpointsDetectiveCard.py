@@ -121,7 +121,7 @@ async def get_required_amount_for_card(id: int, db: Session = Depends(get_db)):
 
 
 @detective_cards_router.post("/", status_code=201, response_model=DetectiveCardOut)
-async def create_detective_card(card: DetectiveCardIn, db: Session = Depends(get_db)):
+def create_detective_card(card: DetectiveCardIn, db: Session = Depends(get_db)):
     """
     Create a new detective card.
 
@@ -149,7 +149,7 @@ async def create_detective_card(card: DetectiveCardIn, db: Session = Depends(get
 
 
 @detective_cards_router.put("/{id}", response_model=DetectiveCardOut)
-async def update_detective_card(id: int, card: DetectiveCardIn, db: Session = Depends(get_db)):
+def update_detective_card(id: int, card: DetectiveCardIn, db: Session = Depends(get_db)):
     """
     Update an existing detective card.
 
@@ -178,7 +178,7 @@ async def update_detective_card(id: int, card: DetectiveCardIn, db: Session = De
 
 
 @detective_cards_router.delete("/{id}", response_model=CardResponse)
-async def delete_detective_card(id: int, db: Session = Depends(get_db)):
+def delete_detective_card(id: int, db: Session = Depends(get_db)):
     """
     Delete a detective card by ID.
 
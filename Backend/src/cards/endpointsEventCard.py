@@ -6,11 +6,20 @@ from typing import Optional
 from src.cards.models import EventCard
 from src.cards.schemas import EventCardIn, EventCardOut
 from src.cards.servicesEventCard import EventCardService
+from src.game_lock import game_of_card, game_param, locked_db
 from src.models.db import get_db
 
 event_cards_router = APIRouter(prefix="", tags=["EventCards"])
 
 
+def event_game(db, params) -> int | None:
+    """Partida de una carta de evento jugada: la del body, o la de la carta."""
+    return game_param()(db, params) or game_of_card(db, params.get("card_id"))
+
+
+get_event_game_db = locked_db(event_game)
+
+
 @event_cards_router.get("/{card_id}", response_model=EventCardOut)
 async def get_event_card(card_id: int, db=Depends(get_db)):
     """
@@ -44,7 +53,7 @@ async def get_event_card(card_id: int, db=Depends(get_db)):
 
 
 @event_cards_router.post("/", response_model=EventCardOut, status_code=status.HTTP_201_CREATED)
-async def create_event_card(event_card_in: EventCardIn, db=Depends(get_db)):
+def create_event_card(event_card_in: EventCardIn, db=Depends(get_db)):
     """
     Creates a new event card.
 
@@ -65,7 +74,7 @@ async def create_event_card(event_card_in: EventCardIn, db=Depends(get_db)):
 
 
 @event_cards_router.put("/{card_id}", response_model=EventCardOut)
-async def update_event_card(card_id: int, event_card_in: EventCardIn, db=Depends(get_db)):
+def update_event_card(card_id: int, event_card_in: EventCardIn, db=Depends(get_db)):
     """
     Updates an existing event card by its ID.
 
@@ -99,7 +108,7 @@ async def update_event_card(card_id: int, event_card_in: EventCardIn, db=Depends
 
 
 @event_cards_router.delete("/{card_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_event_card(card_id: int, db=Depends(get_db)):
+def delete_event_card(card_id: int, db=Depends(get_db)):
     """
     Deletes an event card by its ID.
 
@@ -131,7 +140,7 @@ async def delete_event_card(card_id: int, db=Depends(get_db)):
 
 
 @event_cards_router.put("/play/{card_id}",  response_model=EventCardOut)
-async def play_event_card(card_id: int, payload: dict = Body(...), db=Depends(get_db),
+async def play_event_card(card_id: int, payload: dict = Body(...), db=Depends(get_event_game_db),
     room_id: str = Query("0", description="ID de la sala, por defecto 0")):
     """
     Marks an event card as played.
@@ -9,12 +9,16 @@ from src.cards.schemas import SecretCardIn, SecretCardOut, CardResponse, WSSecre
 from src.player.schemas import WSReveledMurderer, ReveledMurdererPayload
 from src.cards.servicesSecretCard import SecretCardService
 from src.gameLogic.win_by_social_disgrace import WinBySocialDisgrace
-from src.models.db import get_db
+from src.game_lock import game_of_card, locked_db
+from src.models.db import get_db, run_db
 from src.websocket import manager
 from src.gameLogic.reveal_murderer_service import reveal_murderer
 
 secret_cards_router = APIRouter(prefix="", tags=["SecretCards"])
 
+# Revelar u ocultar un secreto es una acción de la partida de la carta
+get_card_game_db = locked_db(lambda db, params: game_of_card(db, params.get("id")))
+
 
 @secret_cards_router.get("/", response_model=List[SecretCardOut])
 async def get_all_secret_cards(
@@ -88,7 +92,7 @@ async def get_secret_card(id: int, db=Depends(get_db)):
 
 
 @secret_cards_router.post("/", status_code=201, response_model=SecretCardOut)
-async def create_secret_card(card: SecretCardIn, db=Depends(get_db)):
+def create_secret_card(card: SecretCardIn, db=Depends(get_db)):
     """
     Create a new secret card.
 
@@ -117,7 +121,7 @@ async def create_secret_card(card: SecretCardIn, db=Depends(get_db)):
 
 @secret_cards_router.put("/{id}", response_model=SecretCardOut)
 async def update_secret_card(id: int, card: SecretCardIn, 
-                             db=Depends(get_db),
+                             db=Depends(get_card_game_db),
                              room_id: str = Query("0", description="ID de la sala, por defecto 0")):
     """
     Update an existing secret card.
@@ -141,18 +145,18 @@ async def update_secret_card(id: int, card: SecretCardIn,
     """
     service = SecretCardService(db)
     try:
-        updated_card = service.update(id, card.to_dto())
+        updated_card = await run_db(db, lambda db: service.update(id, card.to_dto()))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     
     updated_card_out = SecretCardOut.model_validate(updated_card)
     ws_message = WSSecretUpdateMessage(payload=updated_card_out)
-    await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+    await manager.broadcast(ws_message, room_id=room_id)
     return updated_card_out
 
 
 @secret_cards_router.delete("/{id}", response_model=CardResponse)
-async def delete_secret_card(id: int, db=Depends(get_db)):
+def delete_secret_card(id: int, db=Depends(get_db)):
     """
     Delete a secret card by ID.
 
@@ -180,7 +184,7 @@ async def delete_secret_card(id: int, db=Depends(get_db)):
 
 
 @secret_cards_router.patch("/{id}/reveal", response_model=SecretCardOut)
-async def reveal_secret_card(id: int, db=Depends(get_db),
+async def reveal_secret_card(id: int, db=Depends(get_card_game_db),
                              revealed: bool = Body(True, description="Si es True se revela, si es False se oculta"),
                              room_id: str = Query("0", description="ID de la sala, por defecto 0")):
     """
@@ -203,21 +207,21 @@ async def reveal_secret_card(id: int, db=Depends(get_db),
     """
     service = SecretCardService(db)
     try:
-        updated_card = service.reveal(id, revealed)
+        updated_card = await run_db(db, lambda db: service.reveal(id, revealed))
         winBySocialDisgraceService = WinBySocialDisgrace(db, room_id)
         await winBySocialDisgraceService.check_win_by_social_disgrace()
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     updated_card_out = SecretCardOut.model_validate(updated_card)
     ws_message = WSSecretUpdateMessage(payload=updated_card_out)
-    await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+    await manager.broadcast(ws_message, room_id=room_id)
     
     ws_message = WSGameUnlock(payload=1)
-    await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+    await manager.broadcast(ws_message, room_id=room_id)
 
     if updated_card["name"] == "secret_murderer":
         try:
-            result = reveal_murderer(db, id)
+            result = await run_db(db, reveal_murderer, id)
         except Exception as e:
             raise HTTPException(status_code=404, detail=str(e))
 
@@ -227,7 +231,7 @@ async def reveal_secret_card(id: int, db=Depends(get_db),
             accomplice=accomplice.to_schema() if accomplice else None
         ))
 
-        await manager.broadcast(ws_murderer_revealed.model_dump_json(), room_id=room_id)
+        await manager.broadcast(ws_murderer_revealed, room_id=room_id)
     
     return updated_card_out
 
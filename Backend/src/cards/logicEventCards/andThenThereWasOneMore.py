@@ -6,7 +6,7 @@ from src.playerCard.models import player_card_table
 from src.gamePlayer.models import PlayerGame
 from fastapi import HTTPException, status
 from src.gameLogic.discard_card_service import discard_card
-from src.websocket import manager
+from src.websocket import Deferred, manager
 from src.gamePlayer.schemas import WSDiscardMessage, DiscardPayload
 from src.playerCard.schemas import PlayerCardTransferredDTO, CardDTO, PlayerDTO, WSUpdateMessage as PlayerCardWSUpdateMessage
 
@@ -15,10 +15,11 @@ class AndThenThereWasOneMoreService:
     def __init__(self, db: Session):
         self.db = db
 
-    async def execute(
+    def execute(
         self,
         payload: dict,
         card_id_played: int,
+        deferred: Deferred,
         room_id: str = None
     ):
         """
@@ -53,7 +54,7 @@ class AndThenThereWasOneMoreService:
                     card_discard=discard_result["card_discard"].to_schema()
                 )
                 ws_message = WSDiscardMessage(payload=ws_payload)
-                await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+                deferred.add(manager.broadcast, ws_message, room_id=room_id)
                 
                 return {
                     "message": "And Then There Was One More descartada sin efecto (no hay secretos revelados)"
@@ -128,7 +129,7 @@ class AndThenThereWasOneMoreService:
             if target_player.is_Social_Disgrace:
                 target_player.is_Social_Disgrace = False
 
-            self.db.commit()
+            self.db.flush()
 
         except HTTPException:
             self.db.rollback()
@@ -160,7 +161,7 @@ class AndThenThereWasOneMoreService:
                 card_discard=discard_result["card_discard"].to_schema()
             )
             ws_message = WSDiscardMessage(payload=ws_payload)
-            await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+            deferred.add(manager.broadcast, ws_message, room_id=room_id)
 
             card_data = self.db.query(Card).filter(Card.id == revealed_secret_card_id).first()
             transfer_payload = PlayerCardTransferredDTO(
@@ -169,7 +170,7 @@ class AndThenThereWasOneMoreService:
                 new_player=PlayerDTO(id=target_player.id, name=target_player.name)
             )
             transfer_message = PlayerCardWSUpdateMessage(payload=transfer_payload)
-            await manager.broadcast(transfer_message.model_dump_json(), room_id=room_id)
+            deferred.add(manager.broadcast, transfer_message, room_id=room_id)
 
         except Exception as e:
             print(f"Error al enviar notificación WebSocket: {str(e)}")
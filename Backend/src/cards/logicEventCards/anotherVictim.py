@@ -4,14 +4,14 @@ from src.detectiveSet.services import DetectiveSetService
 from fastapi import HTTPException, status
 from src.gameLogic.discard_card_service import discard_card 
 from src.detectiveSet.schemas import WSUpdateMessage
-from src.websocket import manager
+from src.websocket import Deferred, manager
 from src.gamePlayer.schemas import WSDiscardMessage, DiscardPayload
 
 class AnotherVictimService:
     def __init__(self, db: Session):
         self.db = db 
 
-    async def execute(self, payload, card_id_played, room_id: int):
+    def execute(self, payload, card_id_played, room_id: int, deferred: Deferred):
         selected_set_id = payload['selected_set_id']
         player_id = payload['player_id']
         game_id = payload['game_id']
@@ -49,8 +49,8 @@ class AnotherVictimService:
         )
         
         ws_message = WSDiscardMessage(payload=ws_payload)
-        await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+        deferred.add(manager.broadcast, ws_message, room_id=room_id)
         
         ws_message = WSUpdateMessage(payload=updated_set)
-        await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+        deferred.add(manager.broadcast, ws_message, room_id=room_id)
         return
\ No newline at end of file
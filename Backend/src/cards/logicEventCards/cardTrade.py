@@ -4,7 +4,7 @@ from src.player.models import Player
 from src.game.models import Game
 from src.gameCard.models import GameCard
 from src.gameLogic.discard_card_service import discard_card
-from src.websocket import manager
+from src.websocket import Deferred, manager
 from src.gamePlayer.schemas import WSDiscardMessage, DiscardPayload
 from src.cards.schemas import CardTradeRequestPayload, WSCardTradeRequest
 
@@ -12,7 +12,7 @@ class CardTradeServices:
     def __init__(self, db: Session):
         self.db = db
 
-    async def execute(self, played_card_id: int, payload: dict, room_id: int):
+    def execute(self, played_card_id: int, payload: dict, room_id: int, deferred: Deferred):
         game_id = payload.get("game_id")
         player_id = payload.get("player_id")
         target_player_id = payload.get("target_player_id") 
@@ -38,8 +38,9 @@ class CardTradeServices:
         }
 
         try:
-            result = discard_card(self.db, game_id, player_id, played_card_id)
-            self.db.commit()
+            # Savepoint: si el descarte falla se deshace solo él y la request sigue
+            with self.db.begin_nested():
+                result = discard_card(self.db, game_id, player_id, played_card_id)
 
             ws_payload = DiscardPayload(
                 player_id=result["player_id"],
@@ -47,7 +48,7 @@ class CardTradeServices:
                 card_discard=result["card_discard"].to_schema(),
             )
             ws_message = WSDiscardMessage(payload=ws_payload)
-            await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+            deferred.add(manager.broadcast, ws_message, room_id=room_id)
 
             print(f"🗑️ Carta de evento {played_card_id} descartada correctamente.")
             print(f"📣 Enviando WS 'card_trade_request' a {player_id} y {target_player_id}")
@@ -58,7 +59,7 @@ class CardTradeServices:
                 played_card_id=played_card_id
             )
             ws_msg_initiator = WSCardTradeRequest(payload=payload_to_initiator)
-            await manager.broadcast(ws_msg_initiator.model_dump_json(), room_id=room_id)
+            deferred.add(manager.send_to_player, room_id, player_id, ws_msg_initiator)
             
             payload_to_target = CardTradeRequestPayload(
                 target_id=target_player_id,
@@ -66,12 +67,11 @@ class CardTradeServices:
                 played_card_id=played_card_id
             )
             ws_msg_target = WSCardTradeRequest(payload=payload_to_target)
-            await manager.broadcast(ws_msg_target.model_dump_json(), room_id=room_id)
+            deferred.add(manager.send_to_player, room_id, target_player_id, ws_msg_target)
             
             print("✅ Mensajes de inicio de trade (A y B) enviados.")
 
         except Exception as e:
-            self.db.rollback()
             print(f"⚠️ Error al descartar la carta jugada {played_card_id}: {e}")
 
         return
@@ -4,14 +4,14 @@ from src.player.models import Player
 from src.game.models import Game
 from src.gameCard.models import GameCard
 from src.gameLogic.discard_card_service import discard_card
-from src.websocket import manager
+from src.websocket import Deferred, manager
 from src.gamePlayer.schemas import WSDiscardMessage, DiscardPayload
 
 class CardsOffTheTableService:
     def __init__(self, db: Session):
         self.db = db
 
-    async def execute(self, payload: dict, card_id_played: int, room_id: int):
+    def execute(self, payload: dict, card_id_played: int, room_id: int, deferred: Deferred):
         
         game_id = payload['game_id']
         player_id = payload['player_id']
@@ -44,8 +44,9 @@ class CardsOffTheTableService:
         else:
             for card_id in notsofast_card_ids:
                 try:
-                    result = discard_card(self.db, game_id, target_player_id, card_id)
-                    self.db.commit()
+                    # Savepoint por carta: si una falla se deshace solo esa y siguen las demás
+                    with self.db.begin_nested():
+                        result = discard_card(self.db, game_id, target_player_id, card_id)
 
                     ws_payload = DiscardPayload(
                         player_id=result["player_id"],
@@ -53,18 +54,17 @@ class CardsOffTheTableService:
                         card_discard=result["card_discard"].to_schema(),
                     )
                     ws_message = WSDiscardMessage(payload=ws_payload)
-                    await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+                    deferred.add(manager.broadcast, ws_message, room_id=room_id)
 
                     discarded_cards.append(result["card_id"])
                     print(f"   🔥 'Not So Fast' descartada del jugador {target_player_id}: {card_id}")
 
                 except Exception as e:
-                    self.db.rollback()
                     print(f"⚠️ Error al descartar carta {card_id}: {e}")
 
         try:
-            result = discard_card(self.db, game_id, player_id, card_id_played)
-            self.db.commit()
+            with self.db.begin_nested():
+                result = discard_card(self.db, game_id, player_id, card_id_played)
 
             ws_payload = DiscardPayload(
                 player_id=result["player_id"],
@@ -72,11 +72,10 @@ class CardsOffTheTableService:
                 card_discard=result["card_discard"].to_schema(),
             )
             ws_message = WSDiscardMessage(payload=ws_payload)
-            await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+            deferred.add(manager.broadcast, ws_message, room_id=room_id)
 
             print(f"🗑️ Carta de evento {card_id_played} descartada correctamente.")
         except Exception as e:
-            self.db.rollback()
             print(f"⚠️ Error al descartar la carta jugada {card_id_played}: {e}")
 
         return {
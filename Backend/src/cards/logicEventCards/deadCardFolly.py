@@ -4,7 +4,7 @@ from fastapi import HTTPException, status
 from src.player.models import Player
 from src.gamePlayer.models import PlayerGame 
 from src.gameLogic.discard_card_service import discard_card
-from src.websocket import manager
+from src.websocket import Deferred, manager
 
 from src.gamePlayer.schemas import WSDiscardMessage, DiscardPayload
 from src.cards.schemas import CardTradeRequestPayload, WSCardTradeRequest 
@@ -13,11 +13,12 @@ class DeadCardFollyService:
     def __init__(self, db: Session):
         self.db = db
 
-    async def execute(
+    def execute(
         self,
         payload: dict,
         card_id_played: int,
-        room_id: str
+        room_id: str,
+        deferred: Deferred
     ):
         
         game_id = payload.get("game_id")
@@ -37,7 +38,7 @@ class DeadCardFollyService:
                 player_id=player_id,
                 card_id=card_id_played
             )
-            self.db.commit()
+            self.db.flush()
 
             ws_payload = DiscardPayload(
                 player_id=result["player_id"],
@@ -45,7 +46,7 @@ class DeadCardFollyService:
                 card_discard=result["card_discard"].to_schema(),
             )
             ws_message = WSDiscardMessage(payload=ws_payload)
-            await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+            deferred.add(manager.broadcast, ws_message, room_id=room_id)
 
         except Exception as e:
             self.db.rollback()
@@ -80,7 +81,7 @@ class DeadCardFollyService:
                 partner_index = (i + direction_step + num_players) % num_players
                 partner_player = players_in_game[partner_index]
 
-                print(f"   -> Preparando broadcast para: {current_player.name} (ID: {current_player.id})")
+                print(f"   -> Preparando mensaje para: {current_player.name} (ID: {current_player.id})")
                 
                 if direction_step == 1:
                     print(f"Su 'other_player_id' (a quien pasa a la DERECHA) es: {partner_player.name} (ID: {partner_player.id})")
@@ -95,7 +96,7 @@ class DeadCardFollyService:
                 
                 ws_message = WSCardTradeRequest(payload=payload_to_broadcast)
                 
-                await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+                deferred.add(manager.send_to_player, room_id, current_player.id, ws_message)
             return {"message": "Dead Card Folly ejecutada. Iniciando intercambio global."}
 
         except Exception as e:
@@ -8,13 +8,13 @@ from src.gamePlayer.schemas import DiscardPayload, WSDiscardMessage
 from src.playerCard.models import player_card_table
 from fastapi import HTTPException, status
 from src.gameLogic.discard_card_service import discard_card 
-from src.websocket import manager
+from src.websocket import Deferred, manager
 
 class DelayTheMurderersEscapeService:
     def __init__(self, db: Session):
         self.db = db 
 
-    async def execute(self,card_id_played: int, payload: dict):
+    def execute(self,card_id_played: int, payload: dict, deferred: Deferred):
         game_id = payload['game_id']
         player_id = payload['player_id']
         cards = payload['cards']
@@ -44,7 +44,7 @@ class DelayTheMurderersEscapeService:
                     detail="La carta jugada no pertenece al jugador."
                 )
             
-            self.db.commit()
+            self.db.flush()
         
         except HTTPException:
             raise  # volver a lanzar la HTTPException original
@@ -97,23 +97,23 @@ class DelayTheMurderersEscapeService:
             #Actualizamos la cantidad de cartas del mazo de descarte
             game.discard_top = amount_cards_on_discard
             
-            self.db.commit()
+            self.db.flush()
             
             # Mensaje para eliminar la carta jugada del juego
             ws_message = WSRemoveMessage(payload=card_id_played)
-            await manager.broadcast(ws_message.model_dump_json(), room_id=game_id)
+            deferred.add(manager.broadcast, ws_message, room_id=game_id)
             
             
             # Mensaje para actualizar la cantidad de cartas en el mazo de descarte
             payloadTopDiscard = TopDecks(amount=(-i), deck="mazo_descarte")
             message = WsTopDecks(payload=payloadTopDiscard)
-            await manager.broadcast(message.model_dump_json(), room_id=game_id)
+            deferred.add(manager.broadcast, message, room_id=game_id)
             
             
             # Mensaje para actualizar la cantidad de cartas en el mazo de robo
             payloadTopDiscard = TopDecks(amount=(i), deck="mazo_robo")
             message = WsTopDecks(payload=payloadTopDiscard)
-            await manager.broadcast(message.model_dump_json(), room_id=game_id)
+            deferred.add(manager.broadcast, message, room_id=game_id)
             
 
         except HTTPException:
@@ -12,7 +12,7 @@ from src.player.models import Player
 from src.player.schemas import PlayerOut
 from src.playerCard.models import player_card_table
 from fastapi import HTTPException, status
-from src.websocket import manager
+from src.websocket import Deferred, manager
 import traceback
 from src.game.models import Game
 
@@ -21,7 +21,7 @@ class EarlyTrainToPaddingtonService:
     def __init__(self, db: Session):
         self.db = db 
 
-    async def execute(self, card_id_played: int, payload: dict):
+    def execute(self, card_id_played: int, payload: dict, deferred: Deferred):
         game_id = payload['game_id']
         player_id = payload['player_id']
         
@@ -50,7 +50,7 @@ class EarlyTrainToPaddingtonService:
                     detail="La carta jugada no pertenece al jugador."
                 )
             
-            self.db.commit()
+            self.db.flush()
             
             game = self.db.query(Game).filter(
                 Game.id == game_id,
@@ -95,7 +95,7 @@ class EarlyTrainToPaddingtonService:
             
                 # Mensaje de que el asesino escapó
                 message = WSMurdererEscapes(payload=payloadMurderer)
-                await manager.broadcast(message.model_dump_json(), room_id=game_id)
+                deferred.add(manager.broadcast, message, room_id=game_id)
                 
             else:
                 i = 0
@@ -134,19 +134,19 @@ class EarlyTrainToPaddingtonService:
                     )
 
                 game.draw_top = amount_cards_on_draw
-                self.db.commit()
+                self.db.flush()
                 
                 
                 # Mensaje para actualizar la cantidad de cartas en el mazo de robo
                 payloadTopDraw = TopDecks(amount=-i, deck="mazo_robo")
                 message = WsTopDecks(payload=payloadTopDraw)
-                await manager.broadcast(message.model_dump_json(), room_id=game_id)
+                deferred.add(manager.broadcast, message, room_id=game_id)
                 
                 
                 # Mensaje para actualizar la cantidad de cartas en el mazo de descarte
                 payloadTopDiscard = TopDecks(amount=(i-1), deck="mazo_descarte")
                 message = WsTopDecks(payload=payloadTopDiscard)
-                await manager.broadcast(message.model_dump_json(), room_id=game_id)
+                deferred.add(manager.broadcast, message, room_id=game_id)
                 
                 
                 # Mensaje para actualizar la carta del tope del mazo de descarte
@@ -161,12 +161,12 @@ class EarlyTrainToPaddingtonService:
                 )
                 
                 ws_message = WSDiscardMessage(payload=ws_payload)
-                await manager.broadcast(ws_message.model_dump_json(), room_id=game_id)
+                deferred.add(manager.broadcast, ws_message, room_id=game_id)
                 
                 
             # Mensaje para eliminar la carta jugada del juego
             ws_message = WSRemoveMessage(payload=card_id_played)
-            await manager.broadcast(ws_message.model_dump_json(), room_id=game_id)
+            deferred.add(manager.broadcast, ws_message, room_id=game_id)
         
         except HTTPException:
             # Deja pasar los errores HTTP originales (404, 400, etc.)
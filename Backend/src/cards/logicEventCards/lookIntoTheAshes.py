@@ -7,7 +7,7 @@ from src.playerCard.models import player_card_table
 from fastapi import HTTPException, status
 from src.gameLogic.discard_card_service import discard_card 
 from src.gamePlayer.schemas import WSDiscardMessage, DiscardPayload
-from src.websocket import manager
+from src.websocket import Deferred, manager
 
 from src.cards.schemas import WSRecieveCard, CardOut, WsTopDecks,TopDecks, RecieveCard
 
@@ -15,7 +15,7 @@ class LookIntoTheAshesService:
     def __init__(self, db: Session):
         self.db = db 
 
-    async def execute(self, payload: dict, card_id_played: int, room_id: int):
+    def execute(self, payload: dict, card_id_played: int, room_id: int, deferred: Deferred):
         selected_card_id = payload.get('selected_card_id')
         player_id = payload['player_id']
         game_id = payload['game_id']
@@ -40,7 +40,7 @@ class LookIntoTheAshesService:
             card_discard=discard_result["card_discard"].to_schema()
         )
         ws_message = WSDiscardMessage(payload=ws_payload)
-        await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+        deferred.add(manager.broadcast, ws_message, room_id=room_id)
 
         if selected_card_id is None:
             print(f"LITA jugada por {player_id} sin efecto (mazo de descarte vacío o sin selección).")
@@ -88,7 +88,7 @@ class LookIntoTheAshesService:
                 GameCard.card_order: GameCard.card_order - 1
             }, synchronize_session=False)
 
-            self.db.commit()
+            self.db.flush()
 
         except Exception as e:
             self.db.rollback()
@@ -103,10 +103,10 @@ class LookIntoTheAshesService:
         ws_payload1 = card_out.to_schema()
         ws_payload1 = RecieveCard(**ws_payload1.model_dump(), player_id=player_id)
         ws_message1 = WSRecieveCard(payload=ws_payload1)
-        await manager.broadcast(ws_message1.model_dump_json(), room_id=room_id)
+        deferred.add(manager.send_to_player, room_id, player_id, ws_message1)
 
         ws_payload2 = TopDecks(amount=-1, deck="mazo_descarte")
         ws_message2 = WsTopDecks(payload=ws_payload2)
-        await manager.broadcast(ws_message2.model_dump_json(), room_id=room_id)
+        deferred.add(manager.broadcast, ws_message2, room_id=room_id)
 
         return
\ No newline at end of file
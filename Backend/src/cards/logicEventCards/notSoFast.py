@@ -1,7 +1,7 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from typing import Dict, Optional
-from src.websocket import manager
+from src.websocket import Deferred, manager
 from src.gameLogic.discard_card_service import discard_card 
 from src.gamePlayer.schemas import WSDiscardMessage, DiscardPayload
 
@@ -35,7 +35,7 @@ class NotSoFast:
     def __init__(self, db: Session):
         self.db = db 
 
-    async def execute(self, payload: dict, card_id_played: int, room_id: int):
+    def execute(self, payload: dict, card_id_played: int, room_id: int, deferred: Deferred):
         
         player_id = payload['player_id']
         game_id = payload['game_id']
@@ -47,7 +47,7 @@ class NotSoFast:
                 player_id=player_id,
                 card_id=card_id_played
             )
-            await event_state_service.toggle(game_id)
+            deferred.add(event_state_service.toggle, game_id)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -60,7 +60,7 @@ class NotSoFast:
             card_discard=discard_result["card_discard"].to_schema()
         )
         ws_message = WSDiscardMessage(payload=ws_payload)
-        await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+        deferred.add(manager.broadcast, ws_message, room_id=room_id)
         
         return
 
@@ -6,7 +6,7 @@ from src.gameLogic.discard_card_service import discard_card
 from src.player.services import PlayerService
 from fastapi import HTTPException, status
 from collections import defaultdict
-from src.websocket import manager
+from src.websocket import Deferred, manager
 from src.gamePlayer.schemas import DiscardPayload, WSDiscardMessage
 from src.cards.schemas import (
 	SuspiciosPayload, 
@@ -22,7 +22,7 @@ End_votation: dict[int, bool] = {}
 Order_vote: dict[int, list[int]] = {}
 Current_voter_index: dict[int, int] = {}
 
-async def register_receiving_votes(db: Session, game_id: int, vote: Tuple[int, int], room_id: int):
+def register_receiving_votes(db: Session, game_id: int, vote: Tuple[int, int], room_id: int, deferred: Deferred):
 	"""
 	Register the votes in event card 'Point your Suspicions'
 	"""
@@ -51,7 +51,7 @@ async def register_receiving_votes(db: Session, game_id: int, vote: Tuple[int, i
 	else:
 		next_voter = Order_vote[game_id][Current_voter_index[game_id]]
 		ws_message = WSCurrentVoter(payload=next_voter)
-		await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+		deferred.add(manager.broadcast, ws_message, room_id=room_id)
 
 	return End_votation[game_id]
 
@@ -100,11 +100,12 @@ class PointYourSuspicions:
 	def __init__(self, db: Session):
 		self.db = db
 
-	async def execute(
+	def execute(
 		self, 
 		payload: dict, 
 		card_played_id: int, 
-		room_id: int
+		room_id: int,
+		deferred: Deferred
 	):
 
 		global Votes_received
@@ -159,14 +160,14 @@ class PointYourSuspicions:
 			card_discard=discarted_point["card_discard"].to_schema()
 		))
 
-		await manager.broadcast(ws_discard.model_dump_json(), room_id=room_id)
+		deferred.add(manager.broadcast, ws_discard, room_id=room_id)
 
 		ws_message = WSSuspiciousPlayer(payload=SuspiciosPayload(
 			suspicious_playerId= player_selected,
 			end_votation=end_votation
 		))
 
-		await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+		deferred.add(manager.broadcast, ws_message, room_id=room_id)
 
 		Votes_received.pop(game_id, None)
 		End_votation.pop(game_id, None)
@@ -125,12 +125,12 @@ def test_play_point_your_suspicions_event(client):
 
         assert mock_broadcast.call_count == 2
 
-        ws1_data = json.loads(mock_broadcast.call_args_list[0][0][0])
+        ws1_data = mock_broadcast.call_args_list[0][0][0].model_dump(mode="json")
         assert ws1_data["type"] == "gamePlayerDiscard"
         assert ws1_data["payload"]["player_id"] == created_player_id_pys
         assert ws1_data["payload"]["card_discard"]["name"] == "event_pointsuspicions"
 
-        ws2_data = json.loads(mock_broadcast.call_args_list[1][0][0])
+        ws2_data = mock_broadcast.call_args_list[1][0][0].model_dump(mode="json")
         assert ws2_data["type"] == "playerSuspicious"
         assert ws2_data["payload"]["end_votation"] is True
         assert "suspicious_playerId" in ws2_data["payload"]
@@ -182,10 +182,10 @@ def test_execute_attwom_full_effect(client, db_session):
         
         assert mock_broadcast.call_count == 2
 
-        ws1_data = json.loads(mock_broadcast.call_args_list[0][0][0])
+        ws1_data = mock_broadcast.call_args_list[0][0][0].model_dump(mode="json")
         assert ws1_data["type"] == "gamePlayerDiscard"
 
-        ws2_data = json.loads(mock_broadcast.call_args_list[1][0][0])
+        ws2_data = mock_broadcast.call_args_list[1][0][0].model_dump(mode="json")
         assert ws2_data["type"] == "playerCardUpdate"
         
         assert ws2_data["payload"]["card"]["id"] == attwom_secret_card_id
@@ -257,7 +257,7 @@ def test_execute_attwom_no_effect(client, db_session):
         
         mock_discard_card.assert_called_once()
         assert mock_broadcast.call_count == 1
-        ws1_data = json.loads(mock_broadcast.call_args_list[0][0][0])
+        ws1_data = mock_broadcast.call_args_list[0][0][0].model_dump(mode="json")
         assert ws1_data["type"] == "gamePlayerDiscard"
 
 
@@ -181,11 +181,11 @@ def test_execute_another_victim_happy_path(client, db_session):
         
         assert mock_broadcast.call_count == 2
 
-        ws1_data = json.loads(mock_broadcast.call_args_list[0][0][0])
+        ws1_data = mock_broadcast.call_args_list[0][0][0].model_dump(mode="json")
         assert ws1_data["type"] == "gamePlayerDiscard"
         assert ws1_data["payload"]["player_id"] == av_player_id_2
 
-        ws2_data = json.loads(mock_broadcast.call_args_list[1][0][0])
+        ws2_data = mock_broadcast.call_args_list[1][0][0].model_dump(mode="json")
         assert ws2_data["type"] == "detectiveSetUpdate" 
         assert ws2_data["payload"]["id"] == av_set_id
         
@@ -116,6 +116,7 @@ def test_play_cardtrade_event(client):
     # 3. Mockear las dependencias externas (manager y discard_card)
     #    Hacemos patch en el lugar donde 'cardTrade.py' las importa.
     with patch("src.cards.logicEventCards.cardTrade.manager.broadcast", new_callable=AsyncMock) as mock_broadcast, \
+         patch("src.cards.logicEventCards.cardTrade.manager.send_to_player", new_callable=AsyncMock) as mock_send_to_player, \
          patch("src.cards.logicEventCards.cardTrade.discard_card") as mock_discard_card:
         
         # 3a. Configurar el mock de discard_card (es una función SÍNCRONA)
@@ -158,26 +159,29 @@ def test_play_cardtrade_event(client):
         assert args[2] == created_player_id_1
         assert args[3] == created_cardtrade_card_id
         
-        # 6b. Se llamó al broadcast 3 VECES?
-        assert mock_broadcast.call_count == 3
+        # 6b. El descarte va a toda la room, los pedidos de trade solo a cada jugador
+        assert mock_broadcast.call_count == 1
+        assert mock_send_to_player.call_count == 2
 
         # 6c. Validar WS 1: Descarte (decodificando el JSON)
         call_args_discard_str = mock_broadcast.call_args_list[0][0][0]
-        data_discard = json.loads(call_args_discard_str)
+        data_discard = call_args_discard_str.model_dump(mode="json")
         assert data_discard['type'] == 'gamePlayerDiscard'
         assert data_discard['payload']['player_id'] == created_player_id_1
 
         # 6d. Validar WS 2: Trade al Iniciador
-        call_args_initiator_str = mock_broadcast.call_args_list[1][0][0]
-        data_initiator = json.loads(call_args_initiator_str)
+        _, initiator_id, call_args_initiator_str = mock_send_to_player.call_args_list[0][0]
+        assert initiator_id == created_player_id_1
+        data_initiator = call_args_initiator_str.model_dump(mode="json")
         assert data_initiator['type'] == 'card_trade_request'
         assert data_initiator['payload']['target_id'] == created_player_id_1
         assert data_initiator['payload']['other_player_id'] == created_player_id_2
         assert data_initiator['payload']['played_card_id'] == created_cardtrade_card_id
 
         # 6e. Validar WS 3: Trade al Objetivo
-        call_args_target_str = mock_broadcast.call_args_list[2][0][0]
-        data_target = json.loads(call_args_target_str)
+        _, target_id, call_args_target_str = mock_send_to_player.call_args_list[1][0]
+        assert target_id == created_player_id_2
+        data_target = call_args_target_str.model_dump(mode="json")
         assert data_target['type'] == 'card_trade_request'
         assert data_target['payload']['target_id'] == created_player_id_2
         assert data_target['payload']['other_player_id'] == created_player_id_1
@@ -240,17 +240,17 @@ def test_execute_cards_off_the_table_happy_path(client):
         assert mock_discard_card.call_count == 3
         assert mock_broadcast.call_count == 3
 
-        ws1_data = json.loads(mock_broadcast.call_args_list[0][0][0])
+        ws1_data = mock_broadcast.call_args_list[0][0][0].model_dump(mode="json")
         assert ws1_data["type"] == "gamePlayerDiscard"
         assert ws1_data["payload"]["player_id"] == cott_player_id_2
         assert ws1_data["payload"]["card_id"] == cott_nsf_card_id_1
 
-        ws2_data = json.loads(mock_broadcast.call_args_list[1][0][0])
+        ws2_data = mock_broadcast.call_args_list[1][0][0].model_dump(mode="json")
         assert ws2_data["type"] == "gamePlayerDiscard"
         assert ws2_data["payload"]["player_id"] == cott_player_id_2
         assert ws2_data["payload"]["card_id"] == cott_nsf_card_id_2
 
-        ws3_data = json.loads(mock_broadcast.call_args_list[2][0][0])
+        ws3_data = mock_broadcast.call_args_list[2][0][0].model_dump(mode="json")
         assert ws3_data["type"] == "gamePlayerDiscard"
         assert ws3_data["payload"]["player_id"] == cott_player_id_1
         assert ws3_data["payload"]["card_id"] == cott_event_card_id
@@ -287,6 +287,6 @@ def test_execute_cott_no_nsf_cards(client, db_session):
         mock_discard_card.assert_called_once() 
         mock_broadcast.assert_called_once() 
         
-        ws1_data = json.loads(mock_broadcast.call_args_list[0][0][0])
+        ws1_data = mock_broadcast.call_args_list[0][0][0].model_dump(mode="json")
         assert ws1_data["type"] == "gamePlayerDiscard"
         assert ws1_data["payload"]["player_id"] == cott_player_id_1
\ No newline at end of file
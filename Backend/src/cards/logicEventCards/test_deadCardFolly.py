@@ -127,6 +127,7 @@ def test_play_deadcardfolly_right_direction(client):
     client.post(f"/game/{created_game_id_1}/{created_player_id_3}", json={"position_id_player": None})
 
     with patch("src.cards.logicEventCards.deadCardFolly.manager.broadcast", new_callable=AsyncMock) as mock_broadcast, \
+         patch("src.cards.logicEventCards.deadCardFolly.manager.send_to_player", new_callable=AsyncMock) as mock_send_to_player, \
          patch("src.cards.logicEventCards.deadCardFolly.discard_card") as mock_discard_card:
 
         mock_card_discarded = MagicMock()
@@ -157,18 +158,21 @@ def test_play_deadcardfolly_right_direction(client):
 
         mock_discard_card.assert_called_once()
 
-        assert mock_broadcast.call_count == 1 + 3
+        assert mock_broadcast.call_count == 1
+        assert mock_send_to_player.call_count == 3
 
         call_discard_str = mock_broadcast.call_args_list[0][0][0]
-        data_discard = json.loads(call_discard_str)
+        data_discard = call_discard_str.model_dump(mode="json")
         assert data_discard["type"] == "gamePlayerDiscard"
         assert data_discard["payload"]["player_id"] == created_player_id_1
 
         player_ids_in_order = [created_player_id_1, created_player_id_2, created_player_id_3]
 
         for idx, player_id in enumerate(player_ids_in_order):
-            call_str = mock_broadcast.call_args_list[1 + idx][0][0]
-            data = json.loads(call_str)
+            call_room, call_player, call_str = mock_send_to_player.call_args_list[idx][0]
+            data = call_str.model_dump(mode="json")
+            assert call_room == room_id
+            assert call_player == player_id
             assert data["type"] == "card_trade_request"
             target = data["payload"]["target_id"]
             other = data["payload"]["other_player_id"]
@@ -269,6 +273,7 @@ def test_play_deadcardfolly_left_direction(client):
     client.post(f"/game/{created_game_id_1}/{created_player_id_3}", json={"position_id_player": None})
 
     with patch("src.cards.logicEventCards.deadCardFolly.manager.broadcast", new_callable=AsyncMock) as mock_broadcast, \
+         patch("src.cards.logicEventCards.deadCardFolly.manager.send_to_player", new_callable=AsyncMock) as mock_send_to_player, \
          patch("src.cards.logicEventCards.deadCardFolly.discard_card") as mock_discard_card:
 
         mock_card_discarded = MagicMock()
@@ -291,11 +296,13 @@ def test_play_deadcardfolly_left_direction(client):
         )
 
         assert response.status_code == status.HTTP_200_OK
-        assert mock_broadcast.call_count == 4
+        assert mock_broadcast.call_count == 1
+        assert mock_send_to_player.call_count == 3
         player_ids_in_order = [created_player_id_1, created_player_id_2, created_player_id_3]
         for idx, player_id in enumerate(player_ids_in_order):
-            call_str = mock_broadcast.call_args_list[1 + idx][0][0]
-            data = json.loads(call_str)
+            call_room, call_player, call_str = mock_send_to_player.call_args_list[idx][0]
+            data = call_str.model_dump(mode="json")
+            assert call_player == player_id
             assert data["type"] == "card_trade_request"
             expected_partner = player_ids_in_order[(idx - 1) % len(player_ids_in_order)]
             assert data["payload"]["target_id"] == player_id
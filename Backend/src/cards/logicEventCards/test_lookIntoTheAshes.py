@@ -133,7 +133,7 @@ def test_execute_look_into_the_ashes_happy_path(client, db_session):
     - P1 elige la carta "Pala" (lita_target_card_id_1) del descarte.
     - EFECTO: "Pala" va a la mano de P1.
     - "Té" (que estaba en orden 2) ahora pasa a orden 1.
-    - Se emiten 3 broadcasts.
+    - Se emiten 2 broadcasts y la carta recibida va solo a P1.
     """
     assert all([lita_player_id, lita_game_id, lita_event_card_id, 
                 lita_target_card_id_1, lita_target_card_id_2])
@@ -145,6 +145,7 @@ def test_execute_look_into_the_ashes_happy_path(client, db_session):
     room_id = str(lita_game_id)
 
     with patch("src.cards.logicEventCards.lookIntoTheAshes.manager.broadcast", new_callable=AsyncMock) as mock_broadcast, \
+         patch("src.cards.logicEventCards.lookIntoTheAshes.manager.send_to_player", new_callable=AsyncMock) as mock_send_to_player, \
          patch("src.cards.logicEventCards.lookIntoTheAshes.discard_card") as mock_discard_card:
         
         mock_lita_card_schema = {
@@ -171,20 +172,24 @@ def test_execute_look_into_the_ashes_happy_path(client, db_session):
         args, kwargs = mock_discard_card.call_args
         assert kwargs.get("card_id") == lita_event_card_id
         
-        assert mock_broadcast.call_count == 3
+        assert mock_broadcast.call_count == 2
+        mock_send_to_player.assert_called_once()
 
-        ws1_data = json.loads(mock_broadcast.call_args_list[0][0][0])
+        ws1_data = mock_broadcast.call_args_list[0][0][0].model_dump(mode="json")
         assert ws1_data["type"] == "gamePlayerDiscard"
         assert ws1_data["payload"]["player_id"] == lita_player_id
         assert ws1_data["payload"]["card_id"] == lita_event_card_id
 
-        ws2_data = json.loads(mock_broadcast.call_args_list[1][0][0])
+        ws2_room, ws2_player, ws2_message = mock_send_to_player.call_args[0]
+        assert ws2_room == room_id
+        assert ws2_player == lita_player_id
+        ws2_data = ws2_message.model_dump(mode="json")
         assert ws2_data["type"] == "gamePlayerRecieveCard"
         assert ws2_data["payload"]["player_id"] == lita_player_id
         assert ws2_data["payload"]["id"] == lita_target_card_id_1 # "Pala"
 
         # WS 3 (Actualización del mazo de descarte)
-        ws3_data = json.loads(mock_broadcast.call_args_list[2][0][0])
+        ws3_data = mock_broadcast.call_args_list[1][0][0].model_dump(mode="json")
         assert ws3_data["type"] == "gamePlayerTopDecks"
         assert ws3_data["payload"]["amount"] == -1
         assert ws3_data["payload"]["deck"] == "mazo_descarte"
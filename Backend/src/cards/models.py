@@ -1,30 +1,81 @@
 """Card Models."""""
 
-from sqlalchemy import Column, Integer, String, Table, ForeignKey, Boolean
-from sqlalchemy.orm import mapped_column, relationship
+from sqlalchemy import Column, Integer, String, Table, ForeignKey, Boolean, event, inspect, select
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import mapped_column, relationship, object_session, Session
+from sqlalchemy.orm.attributes import flag_modified
 from typing import List
 from sqlalchemy.orm import Mapped
 from src.models.db import Base
+from src.cards.catalog import CATALOG_FIELDS, CardCatalog, CatalogEntry, card_catalog, catalog_key
 from src.cards.schemas import CardOut
 
+
+def catalog_field(field: str) -> hybrid_property:
+    """
+    Atributo de la carta que vive en su entrada del catálogo: en Python se lee
+    del cache en memoria y en una query es una subconsulta a card_catalog.
+    Asignarlo (p. ej. Card(name=...)) elige o crea la entrada al hacer flush.
+    """
+
+    def getter(self):
+        pending = self.__dict__.get("_catalog_fields")
+        if pending is not None:
+            return pending.get(field)
+        return getattr(self.catalog_entry, field)
+
+    def setter(self, value):
+        pending = self.__dict__.get("_catalog_fields")
+        if pending is None:
+            pending = self.catalog_entry.fields() if self.catalog_id is not None else {}
+            self._catalog_fields = pending
+        pending[field] = value
+        if inspect(self).persistent:
+            # Para que el flush vea la carta y le asigne la nueva entrada
+            flag_modified(self, "catalog_id")
+
+    def expression(cls):
+        return (
+            select(getattr(CardCatalog, field))
+            .where(CardCatalog.id == cls.catalog_id)
+            .scalar_subquery()
+        )
+
+    return hybrid_property(getter, setter, expr=expression)
+
+
 class Card(Base):
     """
-    Represent a Card
+    Represent a Card of a game; its name, description and image come from the catalog
 
     """
 
     __tablename__ = "cards"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    name = Column(String, nullable=False)
-    description = Column(String, nullable=False)
-    image_url = Column(String, nullable=False)
-    is_murderes_escapes = Column(Boolean, nullable=False)
+    catalog_id: Mapped[int] = mapped_column(Integer, ForeignKey("card_catalog.id"), nullable=False)
+
+    name = catalog_field("name")
+    description = catalog_field("description")
+    image_url = catalog_field("image_url")
+    is_murderes_escapes = catalog_field("is_murderes_escapes")
 
     __mapper_args__ = {
         "polymorphic_identity": "card",
         "polymorphic_on": None,
     }
+
+    @property
+    def catalog_entry(self) -> CatalogEntry:
+        entry = self.__dict__.get("_catalog_entry")
+        if entry is None or entry.id != self.catalog_id:
+            entry = card_catalog.get(object_session(self), self.catalog_id)
+            self._catalog_entry = entry
+        return entry
+
+    @classmethod
+    def catalog_kind(cls) -> str:
+        return cls.__mapper__.polymorphic_identity
     
     def to_schema(self) -> CardOut:
         """Convierte el modelo SQLAlchemy en un schema Pydantic CardOut."""
@@ -83,4 +134,31 @@ class EventCard(Card):
     
     __mapper_args__ = {
         "polymorphic_identity": "event_card",
-    }
\ No newline at end of file
+    }
+
+
+@event.listens_for(Card, "load", propagate=True)
+def _attach_catalog_entry(card, context):
+    # Con el cache es un lookup en memoria; la carta sigue legible fuera de la sesión
+    card._catalog_entry = card_catalog.get(context.session, card.catalog_id)
+
+
+@event.listens_for(Session, "before_flush")
+def _resolve_catalog_entries(session, flush_context, instances):
+    """Asigna a cada carta nueva o modificada la entrada del catálogo de sus campos."""
+    cards = [
+        obj for obj in (*session.new, *session.dirty)
+        if isinstance(obj, Card) and obj.__dict__.get("_catalog_fields") is not None
+    ]
+    if not cards:
+        return
+    keys = {}
+    for card in cards:
+        fields = card.__dict__["_catalog_fields"]
+        keys[card] = catalog_key(card.catalog_kind(), **{field: fields.get(field) for field in CATALOG_FIELDS})
+    entries = card_catalog.resolve_many(session, list(keys.values()))
+    for card, key in keys.items():
+        entry = entries[key]
+        card.catalog_id = entry.id
+        card._catalog_entry = entry
+        del card._catalog_fields
\ No newline at end of file
@@ -49,6 +49,21 @@ class CardOut(BaseModel):
     
     model_config = ConfigDict(from_attributes=True)
     
+class CardCatalogOut(BaseModel):
+    """
+    Schema for representing a card catalog entry, shared by every game
+    """
+
+    id: int
+    kind: str
+    name: str
+    description: str
+    image_url: str
+    is_murderes_escapes: bool
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class SecretCardIn(CardIn):
     is_murderer: bool
     is_accomplice: bool
@@ -1,7 +1,9 @@
 from typing import List, Optional
 
+from src.cards.card_cache import card_cache
 from src.cards.dtos import CardDTO
 from src.cards.models import Card
+from src.cards.schemas import CardOut
 
 from sqlalchemy.orm import Session
 
@@ -27,6 +29,10 @@ class CardService:
     def get_by_id(self, id: int) -> Optional[Card]:
         return self._db.query(Card).filter(Card.id == id).first()
 
+    def get_card_out(self, id: int) -> Optional[CardOut]:
+        """CardOut de la carta desde el cache de metadata; solo va a la base si no está."""
+        return card_cache.card_out(self._db, id)
+
     def create(self, card_dto: CardDTO) -> Card:
         new_card = Card(
             name=card_dto.name,
@@ -36,7 +42,6 @@ class CardService:
         )
         self._db.add(new_card)
         self._db.flush()
-        self._db.commit()
         return new_card
 
     def update(self, id: int, card_dto: CardDTO) -> Card:
@@ -48,7 +53,6 @@ class CardService:
         db_card.image_url = card_dto.image_url
         db_card.is_murderes_escapes = card_dto.is_murderes_escapes
         self._db.flush()
-        self._db.commit()
         return db_card
 
     def delete(self, id: int) -> int:
@@ -57,6 +61,5 @@ class CardService:
             raise ValueError(f"Card with id {id} does not exist")
         self._db.delete(db_card)
         self._db.flush()
-        self._db.commit()
         return id
 
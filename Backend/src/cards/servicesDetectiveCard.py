@@ -60,7 +60,6 @@ class DetectiveCardService(CardService):
         )
         self._db.add(new_card)
         self._db.flush()
-        self._db.commit()
         return new_card
 
     def update(self, id: int, card_dto: DetectiveCardDTO) -> DetectiveCard:
@@ -75,7 +74,6 @@ class DetectiveCardService(CardService):
         db_card.requiredAmount = card_dto.requiredAmount
         
         self._db.flush()
-        self._db.commit()
         return db_card
 
     def delete(self, id: int) -> int:
@@ -84,5 +82,4 @@ class DetectiveCardService(CardService):
             raise ValueError(f"DetectiveCard with id {id} does not exist")
         self._db.delete(db_card)
         self._db.flush()
-        self._db.commit()
         return id
\ No newline at end of file
@@ -6,7 +6,8 @@ from src.cards.schemas import EventCardIn
 from .services import CardService
 from src.detectiveSet.services import DetectiveSetService
 from src.gamePlayer.schemas import WSDiscardMessage, DiscardPayload
-from src.websocket import manager
+from src.models.db import run_db
+from src.websocket import Deferred, manager
 from src.playerCard.models import player_card_table
 from src.player.models import Player
 from src.cards.logicEventCards.lookIntoTheAshes import LookIntoTheAshesService
@@ -42,7 +43,6 @@ class EventCardService(CardService):
         )
         self._db.add(new_card)
         self._db.flush()
-        self._db.commit()
         self._db.refresh(new_card)
         return new_card
 
@@ -58,7 +58,6 @@ class EventCardService(CardService):
         db_card.was_traded = card_dto.was_traded
         db_card.is_cancellable = card_dto.is_cancellable
         self._db.flush()
-        self._db.commit()
         self._db.refresh(db_card)
         return db_card
 
@@ -68,7 +67,6 @@ class EventCardService(CardService):
             raise ValueError(f"EventCard with id {id} does not exist")
         self._db.delete(db_card)
         self._db.flush()
-        self._db.commit()
         return id
 
     def get_by_player(self, player_id: int):
@@ -100,6 +98,12 @@ class EventCardService(CardService):
         return cards
 
     async def play(self, id: int, payload: dict, room_id: str) -> EventCard:
+        deferred = Deferred()
+        db_card = await run_db(self._db, lambda db: self._play(id, payload, room_id, deferred))
+        await deferred.run()
+        return db_card
+
+    def _play(self, id: int, payload: dict, room_id: str, deferred: Deferred) -> EventCard:
         db_card = self.get_by_id(id)
         if not db_card:
             raise ValueError(f"EventCard with id {id} does not exist")
@@ -108,72 +112,82 @@ class EventCardService(CardService):
         match db_card.name:
             case "event_delayescape":
                 delay_service = DelayTheMurderersEscapeService(self._db)
-                await delay_service.execute(
+                delay_service.execute(
                     card_id_played=id, 
-                    payload=payload                    
+                    payload=payload,
+                    deferred=deferred
                 )
             case "event_pointsuspicions":
                 suspicions_service = PointYourSuspicions(self._db)
-                await suspicions_service.execute(
+                suspicions_service.execute(
                     payload=payload,
                     card_played_id=id,
-                    room_id=room_id
+                    room_id=room_id,
+                    deferred=deferred
                 )
             case "event_deadcardfolly":
                 folly_service = DeadCardFollyService(self._db)
-                await folly_service.execute(
+                folly_service.execute(
                         payload=payload,
                         card_id_played=id,
-                        room_id=room_id
+                        room_id=room_id,
+                        deferred=deferred
                     )
             case "event_anothervictim":
                 victim_service = AnotherVictimService(self._db)
-                await victim_service.execute( 
+                victim_service.execute( 
                         payload = payload,
                         card_id_played = id,
-                        room_id = room_id
+                        room_id = room_id,
+                        deferred = deferred
                     )
                 print("Efecto de Another Victim")
             case "event_lookashes":
                 ashes_service = LookIntoTheAshesService(self._db)
-                await ashes_service.execute( 
+                ashes_service.execute( 
                         payload=payload,
                         card_id_played=id,
-                        room_id=room_id
+                        room_id=room_id,
+                        deferred=deferred
                     )
             case "event_cardtrade":
                 cardTradeServices = CardTradeServices(self._db)
-                await cardTradeServices.execute(
+                cardTradeServices.execute(
                     played_card_id=id,
                     payload=payload,
-                    room_id=room_id
+                    room_id=room_id,
+                    deferred=deferred
                 )
             case "event_onemore":                
                 onemore_service = AndThenThereWasOneMoreService(self._db)
-                await onemore_service.execute(
+                onemore_service.execute(
                     payload=payload,
                     card_id_played=id,
-                    room_id=room_id
+                    room_id=room_id,
+                    deferred=deferred
                 )
             case "event_earlytrain":
                 earlytrain_service = EarlyTrainToPaddingtonService(self._db)
-                await earlytrain_service.execute(
+                earlytrain_service.execute(
                     card_id_played=id,
-                    payload=payload
+                    payload=payload,
+                    deferred=deferred
                 )
             case "event_cardsonthetable":
                 cards_off_table_service = CardsOffTheTableService(self._db)
-                await cards_off_table_service.execute(
+                cards_off_table_service.execute(
                     payload=payload,
                     card_id_played=id,
-                    room_id=room_id
+                    room_id=room_id,
+                    deferred=deferred
                 )
             case "Instant_notsofast":
                 notSoFast_service = NotSoFast(self._db)
-                await notSoFast_service.execute(
+                notSoFast_service.execute(
                         payload=payload,
                         card_id_played=id,
-                        room_id=room_id
+                        room_id=room_id,
+                        deferred=deferred
                 )
             case _:
                 print("Evento desconocido")
@@ -182,6 +196,5 @@ class EventCardService(CardService):
             raise ValueError(f"EventCard with id {id} does not exist")
         db_card.was_played = True
         self._db.flush()
-        self._db.commit()
         self._db.refresh(db_card)
         return db_card
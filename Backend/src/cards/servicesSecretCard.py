@@ -52,7 +52,6 @@ class SecretCardService(CardService):
         )
         self._db.add(new_card)
         self._db.flush()
-        self._db.commit()
         return new_card
 
     def update(self, id: int, card_dto: SecretCardDTO) -> SecretCard:
@@ -67,7 +66,6 @@ class SecretCardService(CardService):
         db_card.is_accomplice = card_dto.is_accomplice
         db_card.is_revealed = card_dto.is_revealed
         self._db.flush()
-        self._db.commit()
         return db_card
 
     def delete(self, id: int) -> int:
@@ -76,7 +74,6 @@ class SecretCardService(CardService):
             raise ValueError(f"SecretCard with id {id} does not exist")
         self._db.delete(db_card)
         self._db.flush()
-        self._db.commit()
         return id
 
     def reveal(self, id: int, revealed: bool = True) -> SecretCard:
@@ -85,7 +82,6 @@ class SecretCardService(CardService):
             raise ValueError(f"SecretCard with id {id} does not exist")
         card.is_revealed = revealed
         self._db.flush()
-        self._db.commit()
         stmt_owner = (
             select(Player.name)
             .join(player_card_table, Player.id == player_card_table.c.player_id)
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 created_event_card_id = None
 
@@ -100,7 +100,8 @@ def test_play_event_card_logic(client):
     
     mock_train.assert_called_once_with(
         card_id_played=card_id_train,
-        payload=payload_train
+        payload=payload_train,
+        deferred=ANY
     )
 
     response_create_delay = client.post(
@@ -143,7 +144,8 @@ def test_play_event_card_logic(client):
 
     mock_delay.assert_called_once_with(
         card_id_played=card_id_delay,
-        payload=payload_delay
+        payload=payload_delay,
+        deferred=ANY
     )
 
     response_create_point = client.post(
@@ -188,7 +190,8 @@ def test_play_event_card_logic(client):
     mock_point.assert_called_once_with(
         payload=payload_point,
         card_played_id=card_id_point,
-        room_id="1"
+        room_id="1",
+        deferred=ANY
     )
 
 
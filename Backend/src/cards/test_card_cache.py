@@ -0,0 +1,101 @@
+from sqlalchemy import event, select
+
+from src.cards.card_cache import CardCache, card_cache
+from src.cards.catalog import CatalogEntry
+from src.cards.dtos import CardDTO
+from src.cards.services import CardService
+from src.game.models import Game
+from src.gameCard.models import GameCard
+from src.gameLogic.create_game_perfile import initialize_game_cards
+
+
+def _entry(id, name):
+    return CatalogEntry(id=id, kind="card", name=name, description="d", image_url="i.png", is_murderes_escapes=False)
+
+
+def _dto(name):
+    return CardDTO(name=name, description="Desc", image_url="http://example.com/c.png", is_murderes_escapes=False)
+
+
+def test_new_game_cards_are_served_without_queries(db_session):
+    game = Game(name="Cache")
+    db_session.add(game)
+    db_session.flush()
+    initialize_game_cards(db_session, game.id)
+    db_session.commit()
+    card_ids = db_session.execute(select(GameCard.card_id).where(GameCard.game_id == game.id)).scalars().all()
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+    try:
+        hits = card_cache.hits
+        outs = [CardService(db_session).get_card_out(card_id) for card_id in card_ids]
+    finally:
+        event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+
+    assert statements == []
+    assert card_cache.hits - hits == len(card_ids)
+    assert {out.id for out in outs} == set(card_ids)
+
+
+def test_miss_reads_through_and_is_published_on_commit(db_session):
+    card = CardService(db_session).create(_dto("Leída"))
+    db_session.commit()
+    card_cache.invalidate(db_session.get_bind(), [card.id])
+
+    misses = card_cache.misses
+    assert CardService(db_session).get_card_out(card.id).name == "Leída"
+    assert card_cache.misses - misses == 1
+    db_session.commit()
+
+    hits = card_cache.hits
+    assert CardService(db_session).get_card_out(card.id).name == "Leída"
+    assert card_cache.hits - hits == 1
+    assert CardService(db_session).get_card_out(10_000_000) is None
+
+
+def test_rollback_does_not_publish(db_session):
+    card_cache.remember(db_session, {9_000_000: _entry(1, "Descartada")})
+    db_session.rollback()
+
+    misses = card_cache.misses
+    assert card_cache.card_out(db_session, 9_000_000) is None
+    assert card_cache.misses - misses == 1
+
+
+def test_updated_card_is_evicted(db_session):
+    service = CardService(db_session)
+    card = service.create(_dto("Antes"))
+    db_session.commit()
+    assert service.get_card_out(card.id).name == "Antes"
+    db_session.commit()
+
+    service.update(card.id, _dto("Después"))
+    db_session.commit()
+
+    assert service.get_card_out(card.id).name == "Después"
+
+
+def test_lru_evicts_least_recently_used(db_session):
+    cache = CardCache(max_size=2)
+    bind = db_session.get_bind()
+    # remember() solo guarda dentro de una transacción
+    db_session.connection()
+    for card_id in (1, 2):
+        cache.remember(db_session, {card_id: _entry(card_id, f"Carta {card_id}")})
+        cache.commit(db_session)
+    # Usar la 1 la deja como la más reciente: sale la 2
+    assert cache.get(db_session, 1).name == "Carta 1"
+    cache.remember(db_session, {3: _entry(3, "Carta 3")})
+    cache.commit(db_session)
+
+    assert cache.stats()["evictions"] == 1
+    assert (str(bind.engine.url), 2) not in cache._entries
+    assert cache.get(db_session, 3).name == "Carta 3"
+
+
+def test_card_cache_stats(client):
+    response = client.get("/card/cache")
+    assert response.status_code == 200
+    assert {"size", "max_size", "hits", "misses", "evictions", "hit_ratio"} <= response.json().keys()
@@ -0,0 +1,150 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.orm import Session
+
+from src.cards.catalog import CardCatalog, card_catalog, catalog_key, migrate_legacy_cards
+from src.cards.models import Card
+from src.cards.services import CardService
+from src.cards.dtos import CardDTO
+from src.game.models import Game
+from src.gameCard.models import GameCard
+from src.gameLogic.create_game_perfile import initialize_game_cards
+from src.models.db import Base, migration_lock
+
+
+def _new_game(db_session, name):
+    game = Game(name=name)
+    db_session.add(game)
+    db_session.commit()
+    return game
+
+
+def _catalog_ids(db_session, game_id):
+    return sorted(
+        db_session.execute(
+            select(Card.catalog_id).join(GameCard, GameCard.card_id == Card.id).where(GameCard.game_id == game_id)
+        ).scalars()
+    )
+
+
+def test_games_share_catalog_entries(db_session):
+    first = _new_game(db_session, "Catálogo 1")
+    initialize_game_cards(db_session, first.id)
+    db_session.commit()
+    entries_after_first = db_session.scalar(select(func.count()).select_from(CardCatalog))
+
+    second = _new_game(db_session, "Catálogo 2")
+    initialize_game_cards(db_session, second.id)
+    db_session.commit()
+
+    # La segunda partida crea sus cartas pero ninguna entrada nueva del catálogo
+    assert db_session.scalar(select(func.count()).select_from(CardCatalog)) == entries_after_first
+    assert _catalog_ids(db_session, first.id) == _catalog_ids(db_session, second.id)
+
+
+def test_card_reads_fields_from_catalog(db_session):
+    card = CardService(db_session).create(
+        CardDTO(name="Catálogo", description="Desc", image_url="http://example.com/c.png", is_murderes_escapes=False)
+    )
+    db_session.commit()
+
+    entry = card_catalog.get(db_session, card.catalog_id)
+    assert (entry.kind, entry.name, entry.description) == ("card", "Catálogo", "Desc")
+    assert card.to_schema().name == "Catálogo"
+    # El filtro por nombre es una subconsulta al catálogo
+    assert db_session.query(Card).filter(Card.name == "Catálogo").all() == [card]
+
+
+def test_update_card_does_not_touch_shared_entry(db_session):
+    dto = CardDTO(name="Compartida", description="Desc", image_url="http://example.com/s.png", is_murderes_escapes=False)
+    service = CardService(db_session)
+    card = service.create(dto)
+    other = service.create(dto)
+    db_session.commit()
+    assert card.catalog_id == other.catalog_id
+
+    service.update(card.id, CardDTO(name="Editada", description="Desc", image_url="http://example.com/s.png", is_murderes_escapes=False))
+    db_session.commit()
+
+    assert card.catalog_id != other.catalog_id
+    assert card.name == "Editada"
+    assert other.name == "Compartida"
+
+
+def test_rollback_discards_new_entries(db_session):
+    key = catalog_key("card", "Descartada", "Desc", "http://example.com/d.png", False)
+    card_catalog.resolve_many(db_session, [key])
+    db_session.rollback()
+
+    assert key not in {entry.key for entry in card_catalog.entries(db_session)}
+    assert db_session.scalar(select(func.count()).select_from(CardCatalog).where(CardCatalog.name == "Descartada")) == 0
+
+
+def test_get_card_catalog(client):
+    client.post(
+        "/card",
+        json={"name": "Endpoint", "description": "Desc", "image_url": "http://example.com/e.png", "is_murderes_escapes": False},
+    )
+    response = client.get("/card/catalog")
+    assert response.status_code == 200
+    entry = next(entry for entry in response.json() if entry["name"] == "Endpoint")
+    assert entry["kind"] == "card"
+
+
+def _legacy_db(tmp_path):
+    """DB de antes del catálogo: cada carta con su nombre, descripción e imagen."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE cards (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, description VARCHAR NOT NULL, "
+            "image_url VARCHAR NOT NULL, is_murderes_escapes BOOLEAN NOT NULL)"
+        ))
+        conn.execute(text(
+            "CREATE TABLE secret_cards (id INTEGER PRIMARY KEY REFERENCES cards(id), is_murderer BOOLEAN NOT NULL, "
+            "is_accomplice BOOLEAN NOT NULL, is_revealed BOOLEAN NOT NULL)"
+        ))
+        conn.execute(text(
+            "INSERT INTO cards VALUES (1, 'Hercule', 'D', 'h.png', 0), (2, 'Hercule', 'D', 'h.png', 0), "
+            "(3, 'Asesino', 'S', 's.png', 0)"
+        ))
+        conn.execute(text("INSERT INTO secret_cards VALUES (3, 1, 0, 0)"))
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def test_migrate_legacy_cards(tmp_path):
+    engine = _legacy_db(tmp_path)
+
+    assert migrate_legacy_cards(engine) == 3
+    # Idempotente
+    assert migrate_legacy_cards(engine) == 0
+
+    with Session(engine) as db:
+        entries = {entry.name: entry for entry in card_catalog.entries(db)}
+        assert entries["Asesino"].kind == "secret_card"
+        assert db.get(Card, 1).catalog_id == db.get(Card, 2).catalog_id == entries["Hercule"].id
+        assert db.get(Card, 3).name == "Asesino"
+    card_catalog.clear(engine)
+    engine.dispose()
+
+
+def test_workers_starting_together_migrate_once(tmp_path):
+    engine = _legacy_db(tmp_path)
+    barrier = threading.Barrier(4)
+
+    def worker():
+        barrier.wait()
+        with migration_lock(engine):
+            return migrate_legacy_cards(engine)
+
+    with ThreadPoolExecutor(4) as pool:
+        migrated = sorted(pool.map(lambda _: worker(), range(4)))
+
+    assert migrated == [0, 0, 0, 3]
+    with Session(engine) as db:
+        assert db.scalar(select(func.count()).select_from(Card).where(Card.catalog_id == None)) == 0
+    card_catalog.clear(engine)
+    engine.dispose()
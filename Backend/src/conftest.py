@@ -1,17 +1,31 @@
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from src.models.db import Base, get_db
+from src.models.db import Base, configure_sqlite, database_url, engine_options, get_db, get_async_db, unit_of_work
 from src.main import app
+from src.timer_scheduler import timers
 import os
 
 TEST_DB_FILE = "./test_cards.db"
-TEST_DB_URL = f"sqlite:///{TEST_DB_FILE}"
+# TEST_DATABASE_URL=postgresql://... corre la suite contra PostgreSQL
+TEST_DB_URL = os.environ.get("TEST_DATABASE_URL", f"sqlite:///{TEST_DB_FILE}")
 
-engine = create_engine(TEST_DB_URL, connect_args={"check_same_thread": False})
+engine = create_engine(database_url(TEST_DB_URL), **engine_options(TEST_DB_URL))
+# Mismo perfil de pragmas que en producción
+configure_sqlite(engine)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+@asynccontextmanager
+async def timers_lifespan(app):
+    task = asyncio.create_task(timers.run())
+    yield
+    task.cancel()
+
 # Fixture que crea la DB al inicio del módulo y la destruye al final
 @pytest.fixture(scope="module")
 def test_db():
@@ -25,14 +39,18 @@ def test_db():
 @pytest.fixture(scope="module")
 def client(test_db):
     def override_get_db():
-        db = TestingSessionLocal()
-        try:
+        # Misma transacción por request que get_db: un commit o un rollback al final
+        with unit_of_work(TestingSessionLocal()) as db:
             yield db
-        finally:
-            db.close()
     app.dependency_overrides[get_db] = override_get_db
-    yield TestClient(app)
+    # Los endpoints async también usan el engine sync en los tests
+    app.dependency_overrides[get_async_db] = override_get_db
+    # Un solo loop para requests, websockets y timers, como en producción; del
+    # lifespan de la app solo corre el scheduler (sin migraciones ni tareas sobre la DB real)
+    with patch.object(app.router, "lifespan_context", timers_lifespan), TestClient(app) as test_client:
+        yield test_client
     app.dependency_overrides[get_db] = get_db  # limpiar override al final
+    app.dependency_overrides[get_async_db] = get_async_db
 
 @pytest.fixture
 def db_session(test_db):
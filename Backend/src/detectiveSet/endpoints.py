@@ -16,7 +16,8 @@ from src.detectiveSet.schemas import (
     WSRevealYourMessage,
     WSHideYourMessage
 )
-from src.models.db import get_db
+from src.models.db import get_db, run_db
+from src.game_lock import as_id, game_of_player, locked_db
 from src.cards.schemas import CardOut
 from src.player.schemas import PlayerOut
 from src.websocket import manager
@@ -24,10 +25,22 @@ from src.cards.models import Card
 from src.playerCard.models import player_card_table
 from src.gameCard.models import GameCard
 from src.cards.models import SecretCard
+from src.detectiveSet.models import DetectiveSet
 
 detective_set_router = APIRouter()
 
 
+def set_game(db: Session, params: dict) -> int | None:
+    """Partida del dueño del set (el del path), o la de id_owner al crearlo."""
+    owner_id = params.get("id_owner")
+    if "set_id" in params:
+        owner_id = db.scalar(select(DetectiveSet.id_owner).where(DetectiveSet.id == as_id(params["set_id"])))
+    return game_of_player(db, owner_id)
+
+
+get_set_game_db = locked_db(set_game)
+
+
 @detective_set_router.get("/{set_id}", response_model=DetectiveSetOut)
 def get_detective_set(set_id: int, db: Session = Depends(get_db)):
     """
@@ -72,7 +85,7 @@ def get_sets_by_owner(owner_id: int, db: Session = Depends(get_db)):
 @detective_set_router.post("/", status_code=201, response_model=DetectiveSetOut)
 async def create_detective_set(
     set_in: DetectiveSetIn,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_set_game_db),
     room_id: str = Query("0", description="ID de la sala, por defecto 0"),
 ):
     """
@@ -90,49 +103,51 @@ async def create_detective_set(
     DetectiveSetOut
         Created set
     """
-    service = DetectiveSetService(db)
-    set_, error_msg = service.create_set(
-        id_owner=set_in.id_owner,
-        main_detective=set_in.main_detective,
-        action_secret=set_in.action_secret,
-        is_cancellable=set_in.is_cancellable,
-        wildcard_effects=set_in.wildcard_effects,
-        detective_card_ids=set_in.detective_card_ids,
-    )
+    def create(db: Session):
+        service = DetectiveSetService(db)
+        set_, error_msg = service.create_set(
+            id_owner=set_in.id_owner,
+            main_detective=set_in.main_detective,
+            action_secret=set_in.action_secret,
+            is_cancellable=set_in.is_cancellable,
+            wildcard_effects=set_in.wildcard_effects,
+            detective_card_ids=set_in.detective_card_ids,
+        )
 
-    
-    
-    if error_msg:
-        raise HTTPException(status_code=400, detail=error_msg)
-    
-    set_out = DetectiveSetOut(
-        id=set_.id,
-        main_detective=set_in.main_detective,
-        owner=PlayerOut.model_validate(set_.owner) if set_.owner else None,
-        cards=[CardOut.model_validate(card) for card in set_.cards] if set_.cards else [],
-        action_secret=set_.action_secret,
-        is_cancellable=set_.is_cancellable
+        if error_msg:
+            raise HTTPException(status_code=400, detail=error_msg)
         
-    )
+        set_out = DetectiveSetOut(
+            id=set_.id,
+            main_detective=set_in.main_detective,
+            owner=PlayerOut.model_validate(set_.owner) if set_.owner else None,
+            cards=[CardOut.model_validate(card) for card in set_.cards] if set_.cards else [],
+            action_secret=set_.action_secret,
+            is_cancellable=set_.is_cancellable
+            
+        )
 
-    card_ids = [card.id for card in set_out.cards]
-    (
-        db.query(GameCard)
-        .filter(GameCard.card_id.in_(card_ids))
-        .update({GameCard.card_position: "ON_TABLE"}, synchronize_session=False)
-    )
-    db.commit()
+        card_ids = [card.id for card in set_out.cards]
+        (
+            db.query(GameCard)
+            .filter(GameCard.card_id.in_(card_ids))
+            .update({GameCard.card_position: "ON_TABLE"}, synchronize_session=False)
+        )
+        db.flush()
+        return set_, set_out
+
+    set_, set_out = await run_db(db, create)
     ws_message = WSAddMessage(payload=set_out)
-    await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+    await manager.broadcast(ws_message, room_id=room_id)
     print(set_)
     return set_out
 
 
 @detective_set_router.put("/{set_id}")
-async def update_detective_set(
+def update_detective_set(
     set_id: int,
     set_in: DetectiveSetIn,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_set_game_db),
     room_id: str = Query("0", description="ID de la sala, por defecto 0"),
 ):
     """
@@ -165,14 +180,14 @@ async def update_detective_set(
         raise HTTPException(status_code=404, detail="Set not found")
 
     #ws_message = WSAddMessage(payload=updated_set)
-    #await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+    #await manager.broadcast(ws_message, room_id=room_id)
     return updated_set
 
 
 @detective_set_router.delete("/{set_id}", response_model=dict)
-async def delete_detective_set(
+def delete_detective_set(
     set_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_set_game_db),
     room_id: str = Query("0", description="ID de la sala, por defecto 0"),
 ):
     """
@@ -197,7 +212,7 @@ async def delete_detective_set(
 
     service.delete_set(set_id)
     #ws_message = WSRemoveMessage(payload=set_)
-    #await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+    #await manager.broadcast(ws_message, room_id=room_id)
     return {"message": "Set deleted successfully", "id": set_id}
 
 
@@ -205,7 +220,7 @@ async def delete_detective_set(
 async def add_detective_to_set(
     set_id: int,
     detective_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_set_game_db),
     room_id: str = Query("0", description="ID de la sala, por defecto 0"),
 ):
     """
@@ -225,20 +240,23 @@ async def add_detective_to_set(
     dict
         Confirmation message
     """
-    service = DetectiveSetService(db)
-    updated_set = service.add_detective_to_set(set_id, detective_id)
-    if not updated_set:
-        raise HTTPException(status_code=404, detail="Set or Detective not found")
+    def add(db: Session):
+        service = DetectiveSetService(db)
+        updated_set = service.add_detective_to_set(set_id, detective_id)
+        if not updated_set:
+            raise HTTPException(status_code=404, detail="Set or Detective not found")
+
+        card_ids = [card.id for card in updated_set.cards]
+        (
+            db.query(GameCard)
+            .filter(GameCard.card_id.in_(card_ids))
+            .update({GameCard.card_position: "ON_TABLE"}, synchronize_session=False)
+        )
+        db.flush()
+        return updated_set, WSDetectiveAdd(payload=updated_set)
 
-    card_ids = [card.id for card in updated_set.cards]
-    (
-        db.query(GameCard)
-        .filter(GameCard.card_id.in_(card_ids))
-        .update({GameCard.card_position: "ON_TABLE"}, synchronize_session=False)
-    )
-    db.commit()
-    ws_message = WSDetectiveAdd(payload=updated_set)
-    await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+    updated_set, ws_message = await run_db(db, add)
+    await manager.broadcast(ws_message, room_id=room_id)
     return updated_set
 
 
@@ -268,7 +286,7 @@ def get_cards_of_set(set_id: int, db: Session = Depends(get_db)):
 async def change_detective_set_owner(
     set_id: int,
     owner_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_set_game_db),
     room_id: str = Query("0", description="ID de la sala, por defecto 0"),
 ):
     """
@@ -289,7 +307,7 @@ async def change_detective_set_owner(
         A success or error message.
     """
     service = DetectiveSetService(db)
-    set_ = service.change_owner(set_id, owner_id)
+    set_ = await run_db(db, lambda db: service.change_owner(set_id, owner_id))
 
     if  set_out is None: 
         raise HTTPException(status_code=404)
@@ -302,7 +320,7 @@ async def change_detective_set_owner(
     )
     
     ws_message = WSAddMessage(payload=set_out)
-    await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+    await manager.broadcast(ws_message, room_id=room_id)
     
     return set_out
 
@@ -311,51 +329,54 @@ async def change_detective_set_owner(
 async def play_set(
     set_id: int,
     target_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_set_game_db),
     room_id: str = Query("0", description="ID de la sala, por defecto 0"),
 ):
-    service = DetectiveSetService(db)
-    set_ = service.get_set(set_id)
-    if not set_:
-        raise HTTPException(status_code=404, detail="Set not found")
+    def play(db: Session):
+        service = DetectiveSetService(db)
+        set_ = service.get_set(set_id)
+        if not set_:
+            raise HTTPException(status_code=404, detail="Set not found")
     
-    payload = DetectiveSetPlay(player_id=set_.owner.id, 
-                               target_id=target_id, secret_cards=[], 
-                               is_cancellable=set_.is_cancellable, 
-                               wildcard_effects=set_.wildcard_effects)
+        payload = DetectiveSetPlay(player_id=set_.owner.id, 
+                                   target_id=target_id, secret_cards=[], 
+                                   is_cancellable=set_.is_cancellable, 
+                                   wildcard_effects=set_.wildcard_effects)
     
-    db.commit()
+        db.flush()
             
-    if set_.action_secret in ["reveal_your", "reveal_their"]:
-        stmt = select(player_card_table.c.card_id).where(player_card_table.c.player_id == target_id)
-        result = db.execute(stmt).all()
-        card_ids = [row.card_id for row in result]
-
-        secret_cards = (
-            db.query(SecretCard)
-            .join(player_card_table, SecretCard.id == player_card_table.c.card_id)
-            .filter(player_card_table.c.player_id == target_id)
-            .filter(SecretCard.is_revealed == False)
-            .all()
-        )
-        payload.secret_cards = [CardOut.model_validate(card) for card in secret_cards]
-
-        if set_.action_secret == "reveal_your":
-            ws_message = WSRevealYourMessage(payload=payload)
-        else:
-            ws_message = WSRevealTheirMessage(payload=payload)
-    elif set_.action_secret == "hide":
-        revealed_cards = (
-            db.query(SecretCard)
-            .join(player_card_table, SecretCard.id == player_card_table.c.card_id)
-            .filter(player_card_table.c.player_id == target_id)
-            .filter(SecretCard.is_revealed == True)
-            .all()
-        )
-        payload.secret_cards = [CardOut.model_validate(card) for card in revealed_cards]
-        ws_message = WSHideYourMessage(payload=payload)
- 
-    await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+        if set_.action_secret in ["reveal_your", "reveal_their"]:
+            stmt = select(player_card_table.c.card_id).where(player_card_table.c.player_id == target_id)
+            result = db.execute(stmt).all()
+            card_ids = [row.card_id for row in result]
+
+            secret_cards = (
+                db.query(SecretCard)
+                .join(player_card_table, SecretCard.id == player_card_table.c.card_id)
+                .filter(player_card_table.c.player_id == target_id)
+                .filter(SecretCard.is_revealed == False)
+                .all()
+            )
+            payload.secret_cards = [CardOut.model_validate(card) for card in secret_cards]
+
+            if set_.action_secret == "reveal_your":
+                ws_message = WSRevealYourMessage(payload=payload)
+            else:
+                ws_message = WSRevealTheirMessage(payload=payload)
+        elif set_.action_secret == "hide":
+            revealed_cards = (
+                db.query(SecretCard)
+                .join(player_card_table, SecretCard.id == player_card_table.c.card_id)
+                .filter(player_card_table.c.player_id == target_id)
+                .filter(SecretCard.is_revealed == True)
+                .all()
+            )
+            payload.secret_cards = [CardOut.model_validate(card) for card in revealed_cards]
+            ws_message = WSHideYourMessage(payload=payload)
+        return set_, ws_message
+
+    set_, ws_message = await run_db(db, play)
+    await manager.broadcast(ws_message, room_id=room_id)
     return set_
 
 @detective_set_router.get("/players/with-sets/{game_id}", response_model=List[int])
@@ -8,7 +8,7 @@ class DetectiveSet(Base):
     __tablename__ = "detective_set"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    id_owner: Mapped[int] = mapped_column(Integer, ForeignKey("player.id"))
+    id_owner: Mapped[int] = mapped_column(Integer, ForeignKey("player.id"), index=True)
     main_detective: Mapped[str] = mapped_column(String, nullable=False)
     action_secret: Mapped[str] = mapped_column(Enum("reveal_your", "reveal_their", "hide", name="action_secret_enum"), nullable=False)
     is_cancellable: Mapped[bool] = mapped_column(Boolean, nullable=False)
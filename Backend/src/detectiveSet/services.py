@@ -37,7 +37,7 @@ class DetectiveSetService:
             wildcard_effects=wildcard_effects
         )
         self.db.add(set_)
-        self.db.commit()
+        self.db.flush()
         self.db.refresh(set_)
         error_msg = None
         if detective_card_ids:
@@ -49,7 +49,7 @@ class DetectiveSetService:
                     
             for card in cards:
                 card.detective_set_id = set_.id
-            self.db.commit()
+            self.db.flush()
             self.db.refresh(set_)
         return set_, error_msg
 
@@ -59,7 +59,7 @@ class DetectiveSetService:
             return None
         for key, value in kwargs.items():
             setattr(set_, key, value)
-        self.db.commit()
+        self.db.flush()
         self.db.refresh(set_)
         return set_
 
@@ -67,7 +67,7 @@ class DetectiveSetService:
         set_ = self.get_set(set_id)
         if set_:
             self.db.delete(set_)
-            self.db.commit()
+            self.db.flush()
 
     def add_detective_to_set(self, set_id: int, detective_id: int) -> DetectiveSet | None:
         set_ = self.get_set(set_id)
@@ -88,7 +88,7 @@ class DetectiveSetService:
             (only_tuppence and detective.name == "detective_tommyberesford")) :
             set_.is_cancellable = False
         
-        self.db.commit()
+        self.db.flush()
         self.db.refresh(set_)
         return set_
 
@@ -109,7 +109,7 @@ class DetectiveSetService:
             return {"error": f"Jugador con id {new_owner_id} no encontrado."}
 
         detective_set.id_owner = new_owner_id
-        self.db.commit()
+        self.db.flush()
         self.db.refresh(detective_set)
         self.db.expire(detective_set, ["owner"])
         self.db.refresh(detective_set)
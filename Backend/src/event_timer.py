@@ -1,9 +1,12 @@
 from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Body, Depends
 from sqlalchemy.orm import Session
-import asyncio
+import time
+from functools import partial
 from src.models.db import get_db
 from pydantic import BaseModel
+from src.settings import settings
 from src.websocket import manager
+from src.timer_scheduler import timers
 from src.cards.logicEventCards.notSoFast import event_state_service
 from src.player.models import Player
 from src.cards.schemas import CardOut
@@ -16,6 +19,10 @@ class EventPayload(BaseModel):
     event_by_player: int
     player_name: str
     card: CardOut | None
+    # Fin de la ventana y hora del servidor, en epoch ms: el cliente arma la
+    # cuenta regresiva con Date.now() + (deadline - server_time)
+    deadline: int | None = None
+    server_time: int | None = None
 
 class EventEndPayload(BaseModel):
     game_id: int
@@ -25,35 +32,69 @@ class EventTickPayload(BaseModel):
     game_id: int
     time: int
 
-if not hasattr(manager, "active_timers"):
-    manager.active_timers = {} 
+class EventSyncPayload(BaseModel):
+    game_id: int
+    deadline: int
+    server_time: int
+
+# Duración (en segundos) de la ventana de "Not so fast"
+COUNTDOWN_SECONDS = 10
+
+# Fin (time.monotonic()) de cada ventana en curso, por (game_id, room_id);
+# es lo que se guarda en el checkpoint para retomarlas tras un reinicio
+event_deadlines: dict[tuple[int, str], float] = {}
 
-async def countdown(game_id: int, player_id: int, room_id: str):
-    try:
-        for i in range(10, -1, -1):
-            ws_tickMessage = CountdownTickMessage(payload=EventTickPayload(
-                game_id=game_id, time=i))
+def wall_clock(deadline: float) -> dict:
+    """Deadline de time.monotonic() pasado a epoch ms, junto con la hora actual del servidor."""
+    server_time = int(time.time() * 1000)
+    return {"deadline": server_time + round((deadline - time.monotonic()) * 1000), "server_time": server_time}
+
+async def countdown(game_id: int, room_id: str, deadline: float) -> float | None:
+    """
+    Un tick de la cuenta regresiva que termina en `deadline` (time.monotonic()).
+    El COUNTDOWN_TICK solo les llega a los sockets con ?ticks=true; el resto
+    recibe un COUNTDOWN_SYNC cada WS_COUNTDOWN_SYNC_INTERVAL segundos.
+    Retorna cuándo corresponde el próximo tick, o None si el evento terminó.
+    """
+    remaining = max(0, round(deadline - time.monotonic()))
+    ws_tickMessage = CountdownTickMessage(payload=EventTickPayload(
+        game_id=game_id, time=remaining))
+    await manager.broadcast(
+        ws_tickMessage,
+        room_id=room_id)
+    if remaining > 0:
+        interval = settings.WS_COUNTDOWN_SYNC_INTERVAL
+        if interval and remaining < COUNTDOWN_SECONDS and remaining % interval == 0:
+            ws_syncMessage = CountdownSyncMessage(payload=EventSyncPayload(
+                game_id=game_id, **wall_clock(deadline)))
             await manager.broadcast(
-                ws_tickMessage.model_dump_json(),
+                ws_syncMessage,
                 room_id=room_id)
-            if i == 0:
-                
-                final_state = await event_state_service.finalize(game_id)
-                ws_endMessage = CountdownEndMessage(payload=EventEndPayload(game_id=game_id,
-                                    final_state=final_state))
-                await manager.broadcast(
-                    ws_endMessage.model_dump_json(),
-                    room_id=room_id)
-                manager.active_timers.pop((game_id, room_id), None)
-
-            await asyncio.sleep(1)
-
-    except asyncio.CancelledError:
-        ws_cancelMessage = CountdownCancelledMessage(payload=game_id)
-        await manager.broadcast(
-            ws_cancelMessage.model_dump_json(),
-            room_id=room_id)
-        raise
+        return deadline - (remaining - 1)
+
+    event_deadlines.pop((game_id, room_id), None)
+    final_state = await event_state_service.finalize(game_id)
+    ws_endMessage = CountdownEndMessage(payload=EventEndPayload(game_id=game_id,
+                        final_state=final_state))
+    await manager.broadcast(
+        ws_endMessage,
+        room_id=room_id)
+    return None
+
+async def resume_event(game_id: int, room_id: str, remaining: float) -> None:
+    """
+    Retoma una ventana restaurada del checkpoint con el tiempo que le quedaba.
+    El COUNTDOWN_SYNC le pasa el nuevo deadline a los clientes que reconectan.
+    """
+    key = (game_id, room_id)
+    deadline = time.monotonic() + max(0.0, remaining)
+    event_deadlines[key] = deadline
+    ws_syncMessage = CountdownSyncMessage(payload=EventSyncPayload(
+        game_id=game_id, **wall_clock(deadline)))
+    await manager.broadcast(
+        ws_syncMessage,
+        room_id=room_id)
+    timers.schedule(key, deadline - int(remaining), partial(countdown, game_id, room_id, deadline))
 
 @event_timer.post("/{game_id}/event/start")
 async def start_event(
@@ -81,17 +122,23 @@ async def start_event(
         raise HTTPException(404, "Jugador no encontrado")
     
     key = (game_id, room_id)
-    if key in manager.active_timers:
+    if key in timers:
         raise HTTPException(400, "Ya hay un evento activo en esta sala")
 
-    task = asyncio.create_task(countdown(game_id, player_id, room_id))
-    manager.active_timers[key] = task
+    # Los ticks corren en el scheduler central, con deadlines fijos desde el inicio
+    deadline = time.monotonic() + COUNTDOWN_SECONDS
+    tick = partial(countdown, game_id, room_id, deadline)
+    event_deadlines[key] = deadline
+    timers.schedule(key, deadline - COUNTDOWN_SECONDS + 1, tick)
 
     ws_message = EventStartedMessage(payload=EventPayload(game_id=game_id,
-                                    event_by_player=player_id, player_name=player.name, card=card))
+                                    event_by_player=player_id, player_name=player.name, card=card,
+                                    **wall_clock(deadline)))
     await manager.broadcast(
-        ws_message.model_dump_json(),
+        ws_message,
         room_id=room_id)
+    # El primer tick sale con la respuesta, después de EVENT_STARTED
+    await tick()
 
     return {"message": "Evento iniciado", "room_id": room_id, "started_by": player_id}
 
@@ -115,16 +162,19 @@ async def cancel_event(
         raise HTTPException(404, "Jugador no encontrado")
     
     key = (game_id, room_id)
-    if key not in manager.active_timers:
+    if not timers.cancel(key):
         raise HTTPException(400, "No hay evento activo para cancelar")
+    event_deadlines.pop(key, None)
+
+    ws_cancelMessage = CountdownCancelledMessage(payload=game_id)
+    await manager.broadcast(
+        ws_cancelMessage,
+        room_id=room_id)
 
-    task = manager.active_timers.pop(key)
-    task.cancel()
-    
     ws_message = EventCancelledMessage(payload=EventPayload(game_id=game_id,
                                     event_by_player=player_id, player_name=player.name, card=None))
     await manager.broadcast(
-        ws_message.model_dump_json(),
+        ws_message,
         room_id=room_id)
 
     return {"message": "Evento cancelado", "room_id": room_id, "cancelled_by": player_id}
@@ -138,6 +188,10 @@ class CountdownTickMessage(BaseModel):
     type: str = "COUNTDOWN_TICK"
     payload: EventTickPayload
 
+class CountdownSyncMessage(BaseModel):
+    type: str = "COUNTDOWN_SYNC"
+    payload: EventSyncPayload
+
 class CountdownEndMessage(BaseModel):
     type: str = "COUNTDOWN_END"
     payload: EventEndPayload
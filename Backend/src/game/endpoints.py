@@ -18,10 +18,14 @@ from src.game.schemas import (
 from src.game.utils import db_game_2_game_out
 from src.websocket import manager
 from src.game.services import GameService
-from src.models.db import get_db
+from src.game_lock import game_param, locked_db
+from src.models.db import get_db, run_db
 
 game_router = APIRouter()
 
+# Borrar, editar o empezar una partida espera a las acciones que estén en curso sobre ella
+get_id_game_db = locked_db(game_param("id"))
+
 @game_router.get(path="/")
 async def retrieve_games(
 	db=Depends(get_db),
@@ -117,7 +121,7 @@ async def create_game(
 		400 -> When there is a error creating the game
 	"""
 	try:
-		created_game = GameService(db).create(game_dto=game_info.to_dto())
+		created_game = await run_db(db, lambda db: GameService(db).create(game_dto=game_info.to_dto()))
 	except Exception as e:
 		raise HTTPException(
 			status_code=status.HTTP_400_BAD_REQUEST,
@@ -127,13 +131,13 @@ async def create_game(
 	ws_message = WSAddMessage(
 		payload=db_game_2_game_out(db_game=created_game)
 	)
-	await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+	await manager.broadcast(ws_message, room_id=room_id)
 	return GameResponse(id=created_game.id, message="El juego fue creado correctamente")
 	
 
 @game_router.delete("/{id}")
 async def delete_game(id: int, 
-		db=Depends(get_db), 
+		db=Depends(get_id_game_db), 
 		room_id: str = Query("0", description="ID de la sala, por defecto 0")) -> GameResponse:
     """
     Delete a game with id
@@ -154,7 +158,7 @@ async def delete_game(id: int,
         404 -> When game with id is not found
         409 -> When game with id is started
     """
-    game = GameService(db).get_by_id(id=id)
+    game = await run_db(db, lambda db: GameService(db).get_by_id(id=id))
     if not game:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -167,20 +171,20 @@ async def delete_game(id: int,
             detail=f"Game with id {id} is already started"
         )
 
-    deleted_game = GameService(db).delete(id=id)
+    deleted_game = await run_db(db, lambda db: GameService(db).delete(id=id))
     if not deleted_game:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Game with id {id} could not be deleted"
         )
     ws_message = WSRemoveMessage(payload=deleted_game)
-    await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+    await manager.broadcast(ws_message, room_id=room_id)
     return GameResponse(id=deleted_game, message="La partida se elimino correctamente")
     
 
 @game_router.put("/{id}", response_model=GameOut)
 async def game_update(
-	id: int, game_info:GameIn, db=Depends(get_db),
+	id: int, game_info:GameIn, db=Depends(get_id_game_db),
  	room_id: str = Query("0", description="ID de la sala, por defecto 0")
 ) -> GameOut:
 	"""
@@ -206,7 +210,7 @@ async def game_update(
 		404 -> When the game is not found
 	"""
 	try:
-		updated_game = GameService(db).update(id=id, game_dto=game_info.to_dto())
+		updated_game = await run_db(db, lambda db: GameService(db).update(id=id, game_dto=game_info.to_dto()))
 	except ValueError as e:
 		raise HTTPException(
 			status_code=status.HTTP_404_NOT_FOUND,
@@ -218,33 +222,33 @@ async def game_update(
 			detail=str(e),
 		)
 	ws_message = WSUpdateMessage(payload=db_game_2_game_out(db_game=updated_game))
-	await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+	await manager.broadcast(ws_message, room_id=room_id)
 	return updated_game  
 
 @game_router.put("/start/{id}")
 async def start_game_endpoint(
     id: int,
     game_info:GameIn,
-    db=Depends(get_db),
+    db=Depends(get_id_game_db),
     room_id: str = Query("0", description="ID de la sala, por defecto 0"),
 ):
 
     # Validar que la partida exista
-    game = GameService(db).get_by_id(id=id)
+    game = await run_db(db, lambda db: GameService(db).get_by_id(id=id))
     if not game:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Game {id} not exists")
     try:
-        first_player_id = start_game(db, id)
+        first_player_id = await run_db(db, start_game, id)
         print(first_player_id)
     except Exception as e:
         # error inesperado
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
     # Broadcast opcional: intentar notificar la partida actualizada (no debe bloquear la respuesta)
-    updated_game = GameService(db).get_by_id(id=id)
+    updated_game = await run_db(db, lambda db: GameService(db).get_by_id(id=id))
     
     ws_message = WSUpdateStartMessage(payload=first_player_id)
     print(updated_game)
-    await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+    await manager.broadcast(ws_message, room_id=room_id)
 
     return first_player_id
\ No newline at end of file
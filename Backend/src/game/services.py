@@ -1,5 +1,7 @@
 from typing import List, Optional
 
+from sqlalchemy import update
+
 from src.game.dtos import GameDTO
 from src.game.models import Game
 
@@ -76,7 +78,6 @@ class GameService:
 		)
 		self._db.add(new_game)
 		self._db.flush()
-		self._db.commit()
 		return new_game
 
 
@@ -97,14 +98,26 @@ class GameService:
 		db_game.draw_top = game_dto.draw_top
 		db_game.discard_top = game_dto.discard_top
 		self._db.flush()
-		self._db.commit()
 		return db_game
 
+	def bump_counter(self, id: int, column: str, delta: int, expected: Optional[int] = None) -> Optional[int]:
+		"""
+		Suma `delta` a un contador de la partida (draw_top o discard_top) en un único
+		UPDATE ... RETURNING, sin leerlo antes en Python: dos requests concurrentes
+		nunca obtienen el mismo valor. Con `expected` solo lo cambia si todavía vale
+		eso. Retorna el valor nuevo, o None si la partida no existe (o ya no valía
+		`expected`).
+		"""
+		counter = getattr(Game, column)
+		stmt = update(Game).where(Game.id == id)
+		if expected is not None:
+			stmt = stmt.where(counter == expected)
+		return self._db.execute(stmt.values({counter: counter + delta}).returning(counter)).scalar()
+
 	def delete(self, id: int) -> int:
 		db_game = self.get_by_id(id)
 		if not db_game:
 			raise ValueError(f"Game with id {id} does not exist")
 		self._db.delete(db_game)
 		self._db.flush()
-		self._db.commit()
 		return id
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Enum
+from sqlalchemy import Column, Integer, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from src.models.db import Base
 import enum
@@ -11,9 +11,15 @@ class CardPosition(str, enum.Enum):
 
 class GameCard(Base):
     __tablename__ = "game_card"
+    __table_args__ = (
+        # Tope del mazo (card_order == draw_top) y top-N del descarte; con
+        # card_id al final la búsqueda no necesita ir a la tabla
+        Index("ix_game_card_position_order", "game_id", "card_position", "card_order", "card_id"),
+    )
     game_id = Column(Integer, ForeignKey("Game.id"), primary_key=True)
     card_id = Column(Integer, ForeignKey("cards.id"), primary_key=True)
-    card_position = Column(Enum(CardPosition), nullable=True)  # puede ser null
+    # native_enum=False: VARCHAR también en PostgreSQL, igual que en SQLite
+    card_position = Column(Enum(CardPosition, native_enum=False), nullable=True)  # puede ser null
     card_order = Column(Integer, default = 0)
 
     game = relationship("Game", back_populates="game_cards")
@@ -1,7 +1,8 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, select
 from src.gameCard.models import GameCard, CardPosition
 from src.game.models import Game
+from src.game.services import GameService
 from src.cards.models import Card
 from typing import List
 
@@ -22,7 +23,7 @@ class GameCardService:
     def assign_card_to_game(self, game_id: int, card_id: int, position=None, card_order=0):
         gc = GameCard(game_id=game_id, card_id=card_id, card_position=position, card_order=card_order)
         self.db.add(gc)
-        self.db.commit()
+        self.db.flush()
         return True
 
     def update_card_position(self, game_id: int, card_id: int, new_position, new_card_order):
@@ -35,7 +36,7 @@ class GameCardService:
             return False
         gc.card_position = new_position
         gc.card_order = new_card_order
-        self.db.commit()
+        self.db.flush()
         return True
 
     def remove_card_from_game(self, game_id: int, card_id: int):
@@ -47,9 +48,37 @@ class GameCardService:
         if not gc:
             return False
         self.db.delete(gc)
-        self.db.commit()
+        self.db.flush()
         return True
 
+    def take_top_of_draw(self, game_id: int) -> GameCard | None:
+        """
+        Carta robable del tope del mazo de robo, bajando draw_top para quien la
+        toma. Si no hay (escapa el asesino) el contador no se toca. El tope se
+        baja solo si sigue siendo el de la carta encontrada: si otra request lo
+        tomó antes se busca el nuevo.
+        """
+        game_service = GameService(self.db)
+        while True:
+            draw_top = self.db.scalar(select(Game.draw_top).where(Game.id == game_id))
+            if draw_top is None:
+                raise ValueError(f"Game with id {game_id} does not exist")
+            card = (
+                self.db.query(GameCard)
+                .join(Card)
+                .filter(
+                    GameCard.game_id == game_id,
+                    GameCard.card_position == CardPosition.MAZO_ROBO.value,
+                    GameCard.card_order == draw_top,
+                    Card.is_murderes_escapes == False
+                )
+                .first()
+            )
+            if not card:
+                return None
+            if game_service.bump_counter(game_id, "draw_top", -1, expected=draw_top) is not None:
+                return card
+
     def get_cards_by_deck(self, game_id: int, deck: str):
         return (
             self.db.query(GameCard)
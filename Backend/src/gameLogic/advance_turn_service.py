@@ -1,11 +1,16 @@
 from sqlalchemy.orm import Session
 from src.game.models import Game
 from src.gamePlayer.models import PlayerGame
+from src.gameLogic.game_state import GameState, game_states
 
 def advance_turn(db: Session, game_id: int) -> int:
     """
     Avanza el turno del juego circularmente y devuelve el player_id del siguiente turno.
     """
+    state = game_states.get(db, game_id)
+    if state is not None:
+        return advance_turn_in_memory(db, state)
+
     game = db.query(Game).filter(Game.id == game_id).first()
     if not game:
         raise ValueError(f"Game {game_id} not found")
@@ -20,6 +25,17 @@ def advance_turn(db: Session, game_id: int) -> int:
     next_index = 0 if current_index is None else (current_index + 1) % len(players)
     
     game.turn_id_player = players[next_index].player_id
-    db.commit()
+    db.flush()
+
+    return game.turn_id_player
+
 
-    return game.turn_id_player
\ No newline at end of file
+def advance_turn_in_memory(db: Session, state: GameState) -> int:
+    """advance_turn sobre la ronda de turnos en memoria."""
+    if not state.turn_ring:
+        raise ValueError(f"No players found for game {state.game_id}")
+    ring = state.turn_ring
+    current_index = ring.index(state.turn_id_player) if state.turn_id_player in ring else None
+    next_index = 0 if current_index is None else (current_index + 1) % len(ring)
+    game_states.update_game(db, state, turn_id_player=ring[next_index])
+    return state.turn_id_player
@@ -1,7 +1,6 @@
 import random
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import insert
-from datetime import date
 
 from src.game.models import Game
 from src.gamePlayer.models import PlayerGame
@@ -19,9 +18,9 @@ def assign_cards(db: Session, game_id: int) -> None:
     - Cada jugador recibe 5 cartas normales + 1 carta "Instant_notsofast".
     - Ordena jugadores por player_id.
     - Mezcla mazos antes de repartir.
-    - Inserta filas en player_card_table.
+    - Inserta todas las manos en player_card_table con un solo INSERT.
     - Marca GameCard.card_position = None para cartas repartidas.
-    - Hace commit.
+    - Hace flush (el commit es de la request).
     """
 
     # Validar existencia de la partida
@@ -44,9 +43,11 @@ def assign_cards(db: Session, game_id: int) -> None:
     # Obtener cartas de GameCard
     gamecard_rows = (
         db.query(GameCard)
+        .options(joinedload(GameCard.card))
         .filter(GameCard.game_id == game_id)
         .all()
     )
+    gamecard_by_card = {gc.card_id: gc for gc in gamecard_rows}
 
     # Filtrar cartas que no sean "Instant_notsofast" y que no sean secretos
     deck_card_ids = [
@@ -76,6 +77,7 @@ def assign_cards(db: Session, game_id: int) -> None:
     random.shuffle(deck_card_ids)
 
     card_index = 0
+    dealt = []
 
     for idx, pid in enumerate(player_ids):
         # Tomar 5 cartas normales
@@ -85,20 +87,11 @@ def assign_cards(db: Session, game_id: int) -> None:
         # Agregar 1 carta NotSoFast
         hand.append(notsofast_cards[idx])
 
-        # Insertar cartas y actualizar GameCard
-        for cid in hand:
-            stmt = insert(player_card_table).values(
-                player_id=pid,
-                card_id=cid,
-            )
-            db.execute(stmt)
-
-            gc = (
-                db.query(GameCard)
-                .filter(GameCard.game_id == game_id, GameCard.card_id == cid)
-                .first()
-            )
-            if gc:
-                gc.card_position = None
-
-    db.commit()
+        dealt.extend({"player_id": pid, "card_id": cid} for cid in hand)
+
+    # Insertar las manos de todos y actualizar GameCard
+    db.execute(insert(player_card_table), dealt)
+    for row in dealt:
+        gamecard_by_card[row["card_id"]].card_position = None
+
+    db.flush()
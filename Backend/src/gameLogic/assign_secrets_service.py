@@ -1,5 +1,5 @@
 import random
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import insert
 
 from src.game.models import Game
@@ -40,7 +40,13 @@ def assign_secrets(db: Session, game_id: int) -> None:
     player_ids = [pg.player_id for pg in player_games]
 
     # Obtener cartas secretas
-    gamecard_rows = db.query(GameCard).filter(GameCard.game_id == game_id).all()
+    gamecard_rows = (
+        db.query(GameCard)
+        .options(joinedload(GameCard.card))
+        .filter(GameCard.game_id == game_id)
+        .all()
+    )
+    gamecard_by_card = {gc.card_id: gc for gc in gamecard_rows}
 
     murderer_cards = [gc.card_id for gc in gamecard_rows if gc.card.name == "secret_murderer"]
     accomplice_cards = [gc.card_id for gc in gamecard_rows if gc.card.name == "secret_accomplice"]
@@ -72,6 +78,7 @@ def assign_secrets(db: Session, game_id: int) -> None:
         db.query(Player).filter(Player.id == accomplice_player).update({"rol": RolEnum.accomplice})
 
     # Repartir cartas
+    dealt = []
     for pid in player_ids:
         hand = []
         if pid == murderer_player:
@@ -83,17 +90,11 @@ def assign_secrets(db: Session, game_id: int) -> None:
         else:
             hand.extend([back_cards.pop() for _ in range(3)])
 
-        # Insertar en player_card_table y actualizar GameCard
-        for cid in hand:
-            stmt = insert(player_card_table).values(player_id=pid, card_id=cid)
-            db.execute(stmt)
+        dealt.extend({"player_id": pid, "card_id": cid} for cid in hand)
 
-            gc = (
-                db.query(GameCard)
-                .filter(GameCard.game_id == game_id, GameCard.card_id == cid)
-                .first()
-            )
-            if gc:
-                gc.card_position = None
+    # Insertar todos los secretos en player_card_table y actualizar GameCard
+    db.execute(insert(player_card_table), dealt)
+    for row in dealt:
+        gamecard_by_card[row["card_id"]].card_position = None
 
-    db.commit()
+    db.flush()
@@ -47,7 +47,7 @@ def assign_turns(db: Session, game_id: int):
         player.is_Your_Turn = (pos == 1)
 
     game.turn_id_player = first_pg.player_id
-    db.commit()
+    db.flush()
 
     # devolver solo IDs en orden
     return [pg.player_id for pg, _ in ordered]
@@ -1,5 +1,5 @@
 import random
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from src.game.models import Game
 from src.gameCard.models import GameCard
 from typing import Optional
@@ -21,6 +21,7 @@ def create_draw_deck(db: Session, game_id: int) -> None:
     # Obtener cartas que no estén en manos de jugadores
     gamecards = (
         db.query(GameCard)
+        .options(joinedload(GameCard.card))
         .filter(GameCard.game_id == game_id, GameCard.card_position != None)
         .all()
     )
@@ -54,7 +55,7 @@ def create_draw_deck(db: Session, game_id: int) -> None:
     # Actualizar draw_top
     game.draw_top = len(draw_deck) - 1
 
-    db.commit()
+    db.flush()
 
 
 def create_draft_deck(db: Session, game_id: int) -> None:
@@ -83,6 +84,6 @@ def create_draft_deck(db: Session, game_id: int) -> None:
 
     game.draw_top = game.draw_top - 3
 
-    db.commit()
+    db.flush()
 
     db.refresh(game)
@@ -1,18 +1,15 @@
-import random
-from sqlalchemy.orm import Session
+import logging
 
-from src.cards.services import CardService
+from sqlalchemy import insert
+
+from src.cards.card_cache import card_cache
+from src.cards.catalog import card_catalog, catalog_key
+from src.cards.models import Card, SecretCard, DetectiveCard, EventCard
 from src.gameCard.services import GameCardService
-from src.cards.dtos import CardDTO, SecretCardDTO, DetectiveCardDTO, EventCardDTO
-from src.cards.servicesSecretCard import SecretCardService
-from src.cards.servicesDetectiveCard import DetectiveCardService
-from src.cards.servicesEventCard import EventCardService
 from src.gameLogic.cards_data import expanded_cards
-from src.gameCard.models import CardPosition
-
-
-
+from src.gameCard.models import GameCard, CardPosition
 
+logger = logging.getLogger(__name__)
 
 cantidades = {
     "detective_quin": 0,
@@ -27,71 +24,83 @@ cantidades = {
 }
 
 def initialize_game_cards(db, game_id: int):
-    card_service = CardService(db)
-    secret_card_service = SecretCardService(db)
+    """
+    Crea las cartas de la partida y las asigna a `game_id` con unos pocos
+    INSERT de varias filas: uno en `cards`, uno por tabla de tipo de carta y
+    uno para todas las filas de game_card, en la transacción de la request.
+    Nombre, descripción e imagen no se copian: cada carta apunta a su entrada
+    del catálogo compartido (que se crea solo la primera vez).
+    """
     game_card_service = GameCardService(db)
-    detective_card_service = DetectiveCardService(db)
-    event_card_service = EventCardService(db)
 
     existing_cards = game_card_service.get_game_cards(game_id)
     if existing_cards and len(existing_cards) > 0:
-        print(f"El juego {game_id} ya tiene {len(existing_cards)} cartas asignadas. No se inicializa nuevamente.")
+        logger.info("El juego %s ya tiene %d cartas asignadas. No se inicializa nuevamente.", game_id, len(existing_cards))
         return
-    
+
+    # Entrada del catálogo de cada carta del mazo y las columnas de su tipo,
+    # que dependen solo del nombre de la carta
+    deck_keys = []
+    typed_rows = {}
     for card in expanded_cards:
-        
         if "is_murderer" in card  or "is_accomplice" in card:
-
-            new_card = secret_card_service.create(
-                card_dto=SecretCardDTO(
-                    name=card["name"],
-                    description=card["description"],
-                    image_url=card["image_url"],
-                    is_murderes_escapes=card["is_murderes_escapes"],
-                    is_murderer=card.get("is_murderer", False),
-                    is_accomplice=card.get("is_accomplice", False),
-                    is_revealed=False
-                )
-            )
-            game_card_service.assign_card_to_game(game_id, new_card.id)
+            model, row = SecretCard, {
+                "is_murderer": card.get("is_murderer", False),
+                "is_accomplice": card.get("is_accomplice", False),
+                "is_revealed": False,
+            }
 
         elif card["name"].startswith("detective_"):
-            new_card = detective_card_service.create(
-                card_dto=DetectiveCardDTO(
-                    name=card["name"],
-                    description=card["description"],
-                    image_url=card["image_url"],
-                    is_murderes_escapes=card.get("is_murderes_escapes", False),
-                    requiredAmount=cantidades.get(card["name"])
-                )
-            )
-            game_card_service.assign_card_to_game(game_id, new_card.id, CardPosition.MAZO_ROBO.value)
+            model, row = DetectiveCard, {"requiredAmount": cantidades.get(card["name"])}
 
         elif card["name"].startswith("event_") or card["name"].startswith("devious_") or card["name"].startswith("Instant"):
             is_cancellable = not (
                 card["name"].startswith("devious_") or card["name"] == "event_cardsonthetable"
             )
-            new_card = event_card_service.create(
-                card_dto=EventCardDTO(
-                    name=card["name"],
-                    description=card["description"],
-                    image_url=card["image_url"],
-                    is_murderes_escapes=card.get("is_murderes_escapes", False),
-                    was_played = False,
-                    was_traded = False,
-                    is_cancellable = is_cancellable
-                )
-            )
-            game_card_service.assign_card_to_game(game_id, new_card.id, CardPosition.MAZO_ROBO.value)
+            model, row = EventCard, {
+                "was_played": False,
+                "was_traded": False,
+                "is_cancellable": is_cancellable,
+            }
 
         else:
+            model, row = Card, {}
 
-            new_card = card_service.create(
-                card_dto= CardDTO(
-                    name=card["name"],
-                    description=card["description"],
-                    image_url=card["image_url"],
-                    is_murderes_escapes=card["is_murderes_escapes"]
-                )
-            )
-            game_card_service.assign_card_to_game(game_id, new_card.id, CardPosition.MAZO_ROBO.value)
+        key = catalog_key(
+            model.catalog_kind(),
+            name=card["name"],
+            description=card["description"],
+            image_url=card["image_url"],
+            is_murderes_escapes=card.get("is_murderes_escapes", False),
+        )
+        deck_keys.append(key)
+        typed_rows[key] = (model, row)
+
+    catalog = card_catalog.resolve_many(db, deck_keys)
+    typed_rows = {catalog[key].id: typed for key, typed in typed_rows.items()}
+
+    # Un solo INSERT de varias filas; SQLite no garantiza el orden del
+    # RETURNING, por eso cada id vuelve con su entrada del catálogo
+    created = db.execute(
+        insert(Card.__table__).returning(Card.__table__.c.id, Card.__table__.c.catalog_id),
+        [{"catalog_id": catalog[key].id} for key in deck_keys],
+    ).all()
+
+    rows_by_type = {SecretCard: [], DetectiveCard: [], EventCard: []}
+    game_card_rows = []
+    for card_id, catalog_id in created:
+        model, row = typed_rows[catalog_id]
+        if model is not Card:
+            rows_by_type[model].append({"id": card_id, **row})
+        # Los secretos empiezan sin posición: se reparten todos
+        position = None if model is SecretCard else CardPosition.MAZO_ROBO.value
+        game_card_rows.append({"game_id": game_id, "card_id": card_id, "card_position": position, "card_order": 0})
+
+    for model, rows in rows_by_type.items():
+        if rows:
+            db.execute(insert(model.__table__), rows)
+    db.execute(insert(GameCard.__table__), game_card_rows)
+
+    # Los restock de la partida arman el CardOut desde el cache, sin queries
+    entries = {entry.id: entry for entry in catalog.values()}
+    card_cache.remember(db, {card_id: entries[catalog_id] for card_id, catalog_id in created})
@@ -2,18 +2,21 @@ import random
 from sqlalchemy.orm import Session
 from src.gameCard.models import GameCard, CardPosition
 from src.cards.models import Card
-from src.game.models import Game
+from src.game.services import GameService
 from src.playerCard.models import player_card_table
 from src.player.models import Player
+from src.gameLogic.game_state import GameState, game_states
 
 def discard_card(db: Session, game_id: int, player_id: int, card_id: int):
-    game = db.query(Game).filter(Game.id == game_id).first()
-    if not game:
+    state = game_states.get(db, game_id)
+    if state is not None and player_id in state.hands:
+        return discard_card_in_memory(db, state, player_id, card_id)
+
+    # El tope del descarte se incrementa en la base: cada descarte obtiene su propio orden
+    updated_top = GameService(db).bump_counter(game_id, "discard_top", 1)
+    if updated_top is None:
         raise ValueError("Game not found")
     
-    updated_top = game.discard_top + 1
-    db.query(Game).filter(Game.id == game_id).update({"discard_top": updated_top})
-    
     gamecard = db.query(GameCard).filter(GameCard.game_id == game_id, GameCard.card_id == card_id).first()
     if not gamecard:
         raise ValueError("Relation between game and card doesn't exist")
@@ -35,7 +38,7 @@ def discard_card(db: Session, game_id: int, player_id: int, card_id: int):
 
     # Eliminar la relación (descarte)
     player.cards.remove(card_to_discard)
-    db.commit()
+    db.flush()
     
     return{
         "player_id":player_id,
@@ -44,7 +47,36 @@ def discard_card(db: Session, game_id: int, player_id: int, card_id: int):
     }
     
     
+def discard_card_in_memory(db: Session, state: GameState, player_id: int, card_id: int) -> dict:
+    """discard_card sobre la partida en memoria: solo la carta descartada sale de la base."""
+    if card_id not in state.positions:
+        raise ValueError("Relation between game and card doesn't exist")
+    if card_id not in state.hands[player_id]:
+        raise ValueError("Carta no encontrada en la mano del jugador")
+    if card_id in state.secrets:
+        raise Exception("Cannot discard a secret card")
+
+    updated_top = game_states.bump_counter(db, state, "discard_top", 1)
+    if updated_top is None:
+        raise ValueError("Game not found")
+    game_states.move_card(db, state, card_id, CardPosition.MAZO_DESCARTE, updated_top)
+    game_states.take_card(db, state, player_id, card_id)
+
+    return {
+        "player_id": player_id,
+        "card_id": card_id,
+        "card_discard": db.get(Card, card_id),
+    }
+
+
 def discard_random_card(db: Session, player_id: int, game_id: int) -> int:
+    state = game_states.get(db, game_id)
+    if state is not None and player_id in state.hands:
+        discardable_ids = [card_id for card_id in state.hands[player_id] if card_id not in state.secrets]
+        if not discardable_ids:
+            raise ValueError("No discardable cards in player's hand")
+        return discard_card(db, game_id, player_id, random.choice(discardable_ids))
+
     player = db.query(Player).filter(Player.id == player_id).first()
     if not player:
         raise ValueError("Player not found")
@@ -0,0 +1,628 @@
+"""
+Estado en memoria de cada partida: mazos, manos, secretos y la ronda de
+turnos. Robar, descartar, reponer y pasar el turno se resuelven acá sin ir a
+la base; sus cambios se escriben después, en tandas, antes del commit.
+"""
+
+import threading
+import weakref
+from dataclasses import dataclass, field
+
+from sqlalchemy import Engine, bindparam, delete, event, insert, inspect, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy.sql import visitors
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter, TextClause
+from sqlalchemy.sql.util import find_tables
+
+from src.settings import RoomBusEnum, settings
+from src.cards.card_cache import card_cache
+from src.cards.catalog import card_catalog
+from src.cards.models import Card
+from src.game.models import Game
+from src.gameCard.models import CardPosition, GameCard
+from src.gamePlayer.models import PlayerGame
+from src.player.models import Player
+from src.playerCard.models import player_card_table
+
+WORKING_KEY = "game_state_working"
+PENDING_KEY = "game_state_pending"
+STALE_KEY = "game_state_stale"
+OWNED_KEY = "game_state_owned"
+
+# Tablas que reflejan las partidas en memoria, y las que el motor escribe
+MIRRORED_TABLES = {"Game", "game_card", "player_card", "player_game", "cards"}
+WRITTEN_TABLES = {"Game", "game_card", "player_card"}
+# Columna "id" de una tabla = id de partida, jugador o carta
+ID_COLUMNS = {"Game": "game_id", "player": "player_id", "cards": "card_id"}
+
+_MISSING = object()
+
+
+def _url(bind) -> str:
+    return str(bind.engine.url)
+
+
+def shared_games_reason() -> str | None:
+    """
+    Por qué la configuración dice que otro proceso atiende las mismas partidas,
+    o None. Cada proceso tendría su propia copia en memoria y pisaría lo que el
+    otro escribió, así que aunque se pida (GAME_STATE_ENGINE) el motor no se
+    prende. Cuántos workers levanta el servidor no se puede saber desde acá:
+    por eso el motor viene apagado y prenderlo es decir que hay un solo proceso.
+    """
+    if settings.WS_BUS_BACKEND != RoomBusEnum.local:
+        return f"WS_BUS_BACKEND={settings.WS_BUS_BACKEND.value}"
+    if not settings.DB_FILENAME.startswith("sqlite"):
+        return "la base no es SQLite"
+    return None
+
+
+@dataclass(eq=False)
+class GameState:
+    """
+    In-memory copy of a started game, as card and player ids.
+
+    `positions` and `orders` mirror game_card, `hands` mirrors player_card
+    for the players of `turn_ring` (in turn order). The card flags come from
+    the catalog and do not change during a game.
+    """
+
+    game_id: int
+    draw_top: int
+    discard_top: int
+    turn_id_player: int | None
+    turn_ring: list[int]
+    positions: dict[int, CardPosition | None]
+    orders: dict[int, int]
+    hands: dict[int, list[int]]
+    # "secret_...": no se pueden descartar
+    secrets: frozenset[int] = frozenset()
+    # Secretos y "murder escapes": no cuentan entre las 6 cartas de la mano
+    uncounted: frozenset[int] = frozenset()
+    # Nunca se roba: si es el tope del mazo, escapa el asesino
+    murderer_escapes: frozenset[int] = frozenset()
+
+    def copy(self) -> "GameState":
+        return GameState(
+            self.game_id, self.draw_top, self.discard_top, self.turn_id_player, list(self.turn_ring),
+            dict(self.positions), dict(self.orders), {player_id: list(hand) for player_id, hand in self.hands.items()},
+            self.secrets, self.uncounted, self.murderer_escapes,
+        )
+
+    def deck(self, position: CardPosition) -> list[int]:
+        """Cartas de un mazo en el orden del índice: card_order y después card_id."""
+        return sorted(
+            (card_id for card_id, card_position in self.positions.items() if card_position == position),
+            key=lambda card_id: (self.orders[card_id], card_id),
+        )
+
+    def top_of_draw(self) -> int | None:
+        """Carta robable en draw_top, o None si no hay (escapa el asesino)."""
+        return min(
+            (
+                card_id for card_id, position in self.positions.items()
+                if position == CardPosition.MAZO_ROBO and self.orders[card_id] == self.draw_top
+                and card_id not in self.murderer_escapes
+            ),
+            default=None,
+        )
+
+    def hand_size(self, player_id: int) -> int:
+        """Cartas de la mano que cuentan para reponer hasta 6."""
+        return sum(
+            1 for card_id in self.hands[player_id]
+            if self.positions.get(card_id, _MISSING) is None and card_id not in self.uncounted
+        )
+
+
+@dataclass
+class PendingWrites:
+    """Cambios de las partidas de una sesión que todavía no están en la base."""
+
+    # (game_id, card_id) -> (card_position, card_order)
+    cards: dict[tuple[int, int], tuple[CardPosition | None, int]] = field(default_factory=dict)
+    # (player_id, card_id) -> True si entra a la mano, False si sale
+    hands: dict[tuple[int, int], bool] = field(default_factory=dict)
+    # game_id -> columnas de Game
+    games: dict[int, dict[str, int | None]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.cards or self.hands or self.games)
+
+
+_update_cards = (
+    update(GameCard.__table__)
+    .where(GameCard.__table__.c.game_id == bindparam("b_game_id"),
+           GameCard.__table__.c.card_id == bindparam("b_card_id"))
+    .values(card_position=bindparam("b_position", type_=GameCard.__table__.c.card_position.type),
+            card_order=bindparam("b_order"))
+)
+_delete_hands = delete(player_card_table).where(
+    player_card_table.c.player_id == bindparam("b_player_id"),
+    player_card_table.c.card_id == bindparam("b_card_id"),
+)
+
+
+class GameStateEngine:
+    """
+    Authoritative in-memory state of the games in play, one per database.
+
+    The first action on a game loads it with four queries; after that the
+    draw, discard, restock and pass-turn paths read and change only memory.
+    Their writes are kept per session and persisted write-behind: a few
+    executemany statements before the commit, or earlier if the session is
+    about to read or write the same tables or open a savepoint.
+
+    Each session works on its own copy, published when it commits and
+    dropped on rollback. Any other write to a mirrored table (ORM flush or
+    DML statement) invalidates the games it touches, which are loaded again
+    from the database on their next action. The database stays the durable
+    copy; several workers must not serve the same game, so the engine is
+    off unless GAME_STATE_ENGINE opts a single process in.
+
+    Only the app's engine (`listen`) hooks SQLAlchemy, and only while it is
+    on: every session is watched for writes that invalidate games, and the
+    write-behind and publish hooks go on the sessions the engine owns.
+    """
+
+    def __init__(self, enabled: bool | None = None, listen: bool = False):
+        if enabled is None:
+            enabled = settings.GAME_STATE_ENGINE
+            reason = shared_games_reason() if enabled else None
+            if reason:
+                print(f"Motor de partidas en memoria apagado ({reason}): GAME_STATE_ENGINE es para un solo proceso")
+                enabled = False
+        self._listen = listen
+        self._lock = threading.Lock()
+        self._states: dict[tuple[str, int], GameState] = {}
+        self._versions: dict[tuple[str, int], int] = {}
+        # Conexión -> sesión con escrituras pendientes, para el evento "savepoint"
+        self._writers: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self.loads = 0
+        self.hits = 0
+        self.flushes = 0
+        self.invalidations = 0
+        self.enabled = enabled
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, enabled: bool) -> None:
+        self._enabled = enabled
+        if self._listen:
+            _listen(enabled)
+        if not enabled:
+            # Apagado ya no ve lo que se escribe: al prenderlo se carga todo de nuevo
+            self.clear()
+
+    def _own(self, session: Session) -> None:
+        """Engancha a la sesión el write-behind y la publicación (una vez por sesión)."""
+        if OWNED_KEY not in session.info:
+            session.info[OWNED_KEY] = True
+            for name, listener in OWNED_SESSION_HOOKS:
+                event.listen(session, name, listener)
+
+    # --- Lectura -----------------------------------------------------------
+
+    def get(self, session: Session, game_id: int) -> GameState | None:
+        """
+        Estado de la partida para esta sesión, o None si no existe (o el motor
+        está apagado): en ese caso los servicios siguen por la base.
+        """
+        if not self.enabled:
+            return None
+        working = session.info.get(WORKING_KEY)
+        if working is not None and game_id in working:
+            return working[game_id][0]
+        # Con la transacción abierta su commit o rollback siempre publica o descarta la copia
+        session.connection()
+        key = (_url(session.get_bind()), game_id)
+        with self._lock:
+            committed = self._states.get(key)
+            version = self._versions.get(key, 0)
+        if committed is not None:
+            self.hits += 1
+            state = committed.copy()
+        else:
+            state = self._load(session, game_id)
+            if state is None:
+                return None
+            self.loads += 1
+        # [copia, versión de la que salió, si hay que publicarla]
+        self._own(session)
+        session.info.setdefault(WORKING_KEY, {})[game_id] = [state, version, committed is None]
+        return state
+
+    def _load(self, session: Session, game_id: int) -> GameState | None:
+        game = session.execute(
+            select(Game.draw_top, Game.discard_top, Game.turn_id_player).where(Game.id == game_id)
+        ).first()
+        if game is None or game.draw_top is None or game.discard_top is None:
+            return None
+        ring = list(session.execute(
+            select(PlayerGame.player_id).where(PlayerGame.game_id == game_id)
+            .order_by(PlayerGame.position_id_player, PlayerGame.player_id)
+        ).scalars())
+        positions, orders, catalog_ids = {}, {}, {}
+        for card_id, position, order, catalog_id in session.execute(
+            select(GameCard.card_id, GameCard.card_position, GameCard.card_order, Card.catalog_id)
+            .join(Card, Card.id == GameCard.card_id)
+            .where(GameCard.game_id == game_id)
+        ):
+            positions[card_id] = position
+            orders[card_id] = order
+            catalog_ids[card_id] = catalog_id
+        hands = {player_id: [] for player_id in ring}
+        if ring:
+            table = player_card_table
+            for player_id, card_id, catalog_id in session.execute(
+                select(table.c.player_id, table.c.card_id, Card.catalog_id)
+                .join(Card, Card.id == table.c.card_id)
+                .where(table.c.player_id.in_(ring))
+            ):
+                hands[player_id].append(card_id)
+                catalog_ids[card_id] = catalog_id
+
+        entries = {card_id: card_catalog.get(session, catalog_id) for card_id, catalog_id in catalog_ids.items()}
+        # Los CardOut de robar y reponer salen de acá sin otra query
+        card_cache.remember(session, entries)
+        return GameState(
+            game_id=game_id,
+            draw_top=game.draw_top,
+            discard_top=game.discard_top,
+            turn_id_player=game.turn_id_player,
+            turn_ring=ring,
+            positions=positions,
+            orders=orders,
+            hands=hands,
+            secrets=frozenset(card_id for card_id, entry in entries.items() if entry.name.startswith("secret_")),
+            uncounted=frozenset(
+                card_id for card_id, entry in entries.items()
+                if "secret" in entry.name.lower() or entry.is_murderes_escapes
+            ),
+            murderer_escapes=frozenset(card_id for card_id, entry in entries.items() if entry.is_murderes_escapes),
+        )
+
+    # --- Cambios -------------------------------------------------------------
+
+    def _pending(self, session: Session, state: GameState) -> PendingWrites:
+        # Dentro de begin_nested() el SAVEPOINT sale recién acá, y antes se
+        # escribe lo pendiente: lo que se anota después queda dentro del savepoint
+        connection = session.connection()
+        session.info[WORKING_KEY][state.game_id][2] = True
+        pending = session.info.get(PENDING_KEY)
+        if pending is None:
+            pending = session.info[PENDING_KEY] = PendingWrites()
+            with self._lock:
+                self._writers[connection] = session
+        return pending
+
+    def _forget_writer(self, session: Session) -> None:
+        with self._lock:
+            for connection in [c for c, writer in self._writers.items() if writer is session]:
+                del self._writers[connection]
+
+    def move_card(self, session: Session, state: GameState, card_id: int,
+                  position: CardPosition | None, order: int) -> None:
+        """Cambia el mazo (None: en una mano) y el orden de una carta de la partida."""
+        state.positions[card_id] = position
+        state.orders[card_id] = order
+        self._pending(session, state).cards[(state.game_id, card_id)] = (position, order)
+        game_card = session.identity_map.get(identity_key(GameCard, (state.game_id, card_id)))
+        if game_card is not None:
+            set_committed_value(game_card, "card_position", position)
+            set_committed_value(game_card, "card_order", order)
+
+    def give_card(self, session: Session, state: GameState, player_id: int, card_id: int) -> None:
+        if card_id not in state.hands[player_id]:
+            state.hands[player_id].append(card_id)
+            self._change_hand(session, state, player_id, card_id, True)
+
+    def take_card(self, session: Session, state: GameState, player_id: int, card_id: int) -> None:
+        state.hands[player_id].remove(card_id)
+        self._change_hand(session, state, player_id, card_id, False)
+
+    def _change_hand(self, session: Session, state: GameState, player_id: int, card_id: int, added: bool) -> None:
+        hands = self._pending(session, state).hands
+        key = (player_id, card_id)
+        if hands.get(key, added) != added:
+            # Entró y salió (o al revés) en la misma transacción: la fila queda como estaba
+            del hands[key]
+        else:
+            hands[key] = added
+        # Las colecciones ya cargadas se vuelven a leer (después del flush de esto)
+        for model, attribute, id in ((Player, "cards", player_id), (Card, "players", card_id)):
+            instance = session.identity_map.get(identity_key(model, id))
+            if instance is not None and attribute in instance.__dict__:
+                session.expire(instance, [attribute])
+
+    def update_game(self, session: Session, state: GameState, **values) -> None:
+        """Cambia turn_id_player de la partida (los topes de los mazos van con bump_counter)."""
+        for column, value in values.items():
+            setattr(state, column, value)
+        self._pending(session, state).games.setdefault(state.game_id, {}).update(values)
+        game = session.identity_map.get(identity_key(Game, state.game_id))
+        if game is not None:
+            for column, value in values.items():
+                set_committed_value(game, column, value)
+
+    def bump_counter(self, session: Session, state: GameState, column: str, delta: int) -> int | None:
+        """
+        Suma `delta` a draw_top o discard_top con un UPDATE ... RETURNING, como
+        GameService.bump_counter, en vez de anotar el valor absoluto de la copia:
+        dos acciones nunca obtienen el mismo tope. La copia toma el valor de la
+        base; si no era el esperado otro proceso cambió la partida: esta acción
+        termina sobre la copia y la partida se vuelve a cargar en la próxima.
+        Retorna None si la partida ya no está en la base.
+        """
+        self._pending(session, state)
+        counter = Game.__table__.c[column]
+        # Por la conexión y no por la sesión: no es un cambio de otro código que invalide la partida
+        value = session.connection().execute(
+            update(Game.__table__).where(Game.__table__.c.id == state.game_id)
+            .values({counter: counter + delta}).returning(counter)
+        ).scalar()
+        expected = getattr(state, column) + delta
+        if value is not None:
+            setattr(state, column, value)
+            game = session.identity_map.get(identity_key(Game, state.game_id))
+            if game is not None:
+                set_committed_value(game, column, value)
+        if value != expected:
+            with self._lock:
+                self._drop(_url(session.get_bind()), {state.game_id})
+            session.info.setdefault(STALE_KEY, set()).add(state.game_id)
+        return value
+
+    def flush(self, session: Session, connection=None) -> int:
+        """Escribe los cambios pendientes de la sesión. Retorna cuántas filas mandó."""
+        pending = session.info.pop(PENDING_KEY, None)
+        if not pending:
+            return 0
+        self._forget_writer(session)
+        connection = connection if connection is not None else session.connection()
+        if pending.cards:
+            connection.execute(_update_cards, [
+                {"b_game_id": game_id, "b_card_id": card_id, "b_position": position, "b_order": order}
+                for (game_id, card_id), (position, order) in pending.cards.items()
+            ])
+        added = [{"player_id": p, "card_id": c} for (p, c), was_added in pending.hands.items() if was_added]
+        removed = [{"b_player_id": p, "b_card_id": c} for (p, c), was_added in pending.hands.items() if not was_added]
+        if removed:
+            connection.execute(_delete_hands, removed)
+        if added:
+            connection.execute(insert(player_card_table), added)
+        by_columns: dict[tuple[str, ...], list[dict]] = {}
+        for game_id, values in pending.games.items():
+            by_columns.setdefault(tuple(sorted(values)), []).append(
+                {"b_id": game_id, **{f"b_{column}": value for column, value in values.items()}}
+            )
+        for columns, rows in by_columns.items():
+            statement = update(Game.__table__).where(Game.__table__.c.id == bindparam("b_id")).values(
+                {column: bindparam(f"b_{column}") for column in columns}
+            )
+            connection.execute(statement, rows)
+        self.flushes += 1
+        return len(pending.cards) + len(pending.hands) + len(pending.games)
+
+    # --- Transacciones -------------------------------------------------------
+
+    def commit(self, session: Session) -> None:
+        """Publica las copias de la sesión, salvo las de partidas que otro cambio invalidó."""
+        working = session.info.pop(WORKING_KEY, None) or {}
+        stale = session.info.pop(STALE_KEY, None)
+        url = _url(session.get_bind())
+        with self._lock:
+            if stale:
+                self._drop(url, stale)
+            for game_id, (state, version, publish) in working.items():
+                key = (url, game_id)
+                if not publish or stale and (None in stale or game_id in stale):
+                    continue
+                if self._versions.get(key, 0) != version:
+                    # Otra sesión la cambió mientras tanto: se vuelve a cargar
+                    self._drop(url, {game_id})
+                    continue
+                self._states[key] = state
+                self._versions[key] = version + 1
+
+    def discard(self, session: Session, nested: bool = False) -> None:
+        """
+        Rollback: descarta las copias y lo pendiente. En un savepoint además se
+        marcan sus partidas, porque lo de antes del savepoint ya está en la base.
+        """
+        if session.info.pop(PENDING_KEY, None) is not None:
+            self._forget_writer(session)
+        working = session.info.pop(WORKING_KEY, None)
+        if nested and working:
+            session.info.setdefault(STALE_KEY, set()).update(working)
+
+    def _drop(self, url: str, game_ids) -> None:
+        # Con el lock tomado. None en game_ids: todas las partidas de esa base
+        keys = [key for key in self._states if key[0] == url] if None in game_ids else [
+            (url, game_id) for game_id in game_ids if game_id is not None
+        ]
+        for key in keys:
+            self._states.pop(key, None)
+            self._versions[key] = self._versions.get(key, 0) + 1
+        self.invalidations += len(keys)
+
+    def invalidate(self, session: Session, game_ids: set | None) -> None:
+        """Partidas que cambió otro código (None: no se sabe cuáles): se recargan."""
+        game_ids = {None} if game_ids is None else set(game_ids)
+        if not game_ids:
+            return
+        with self._lock:
+            self._drop(_url(session.get_bind()), game_ids)
+        # También al terminar: otra sesión pudo cargarlas antes de este commit
+        self._own(session)
+        session.info.setdefault(STALE_KEY, set()).update(game_ids)
+        working = session.info.get(WORKING_KEY)
+        if working:
+            for game_id in list(working) if None in game_ids else game_ids:
+                working.pop(game_id, None)
+
+    def games_for(self, session: Session, ids: dict[str, set]) -> set | None:
+        """Partidas (en memoria) de estos ids de partida, jugador o carta; None si no hay ids."""
+        if not any(ids.values()):
+            return None
+        url = _url(session.get_bind())
+        with self._lock:
+            states = [state for (state_url, _), state in self._states.items() if state_url == url]
+        states += [state for state, _, _ in session.info.get(WORKING_KEY, {}).values()]
+        games = set(ids["game_id"])
+        for state in states:
+            if ids["player_id"].intersection(state.turn_ring) or any(
+                card_id in state.positions or any(card_id in hand for hand in state.hands.values())
+                for card_id in ids["card_id"]
+            ):
+                games.add(state.game_id)
+        return games
+
+    def clear(self, bind=None) -> None:
+        with self._lock:
+            if bind is None:
+                self._states.clear()
+            else:
+                self._drop(_url(bind), {None})
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"games": len(self._states), "loads": self.loads, "hits": self.hits,
+                    "flushes": self.flushes, "invalidations": self.invalidations}
+
+
+
+def _statement_ids(statement, parameters) -> dict[str, set]:
+    """Ids de partida, jugador y carta que una sentencia DML nombra en sus parámetros o su WHERE."""
+    ids = {"game_id": set(), "player_id": set(), "card_id": set()}
+    rows = parameters if isinstance(parameters, list) else [parameters or {}]
+    for row in rows:
+        for name, values in ids.items():
+            if name in row:
+                values.add(row[name])
+    where = getattr(statement, "whereclause", None)
+    if where is None:
+        return ids
+    for element in visitors.iterate(where):
+        if not (isinstance(element, BinaryExpression) and isinstance(element.right, BindParameter)):
+            continue
+        column = element.left
+        name = getattr(column, "name", None)
+        if name == "id":
+            name = ID_COLUMNS.get(getattr(getattr(column, "table", None), "name", None))
+        if name in ids:
+            value = element.right.effective_value
+            ids[name].update(value if isinstance(value, (list, tuple, set)) else [value])
+    return ids
+
+
+def _statement_tables(statement) -> set[str] | None:
+    """Tablas de una sentencia; None si es texto y no se sabe."""
+    if isinstance(statement, TextClause):
+        return None
+    return {getattr(table, "name", None) for table in find_tables(
+        statement, check_columns=True, include_joins=True, include_crud=True
+    )}
+
+
+def _before_statement(orm_execute_state):
+    statement = orm_execute_state.statement
+    session = orm_execute_state.session
+    is_text = isinstance(statement, TextClause)
+    writes = orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete or (
+        is_text and not str(statement).lstrip().upper().startswith("SELECT")
+    )
+    if not writes and not session.info.get(PENDING_KEY):
+        return
+    tables = _statement_tables(statement)
+    if tables is None or tables & WRITTEN_TABLES:
+        # Lo pendiente va primero: la sentencia tiene que ver la base al día
+        game_states.flush(session)
+    if not writes:
+        return
+    if not is_text:
+        target = statement.table.name
+        # Crear partidas o cartas nuevas (o copiar filas a otra tabla) no cambia las que están en memoria
+        if target not in MIRRORED_TABLES or orm_execute_state.is_insert and target in ("Game", "cards"):
+            return
+    ids = None if is_text else _statement_ids(statement, orm_execute_state.parameters)
+    game_states.invalidate(session, None if ids is None else game_states.games_for(session, ids))
+
+
+def _before_orm_flush(session, flush_context, instances):
+    game_states.flush(session)
+
+
+def _after_orm_flush(session, flush_context):
+    ids = {"game_id": set(), "player_id": set(), "card_id": set()}
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, GameCard):
+            ids["game_id"].add(instance.game_id)
+        elif isinstance(instance, PlayerGame):
+            ids["game_id"].add(instance.game_id)
+            ids["player_id"].add(instance.player_id)
+        elif isinstance(instance, Game) and instance not in session.new:
+            ids["game_id"].add(instance.id)
+        elif isinstance(instance, Player) and (
+            instance in session.deleted or inspect(instance).attrs.cards.history.has_changes()
+        ):
+            ids["player_id"].add(instance.id)
+        elif isinstance(instance, Card) and (
+            instance in session.deleted or inspect(instance).attrs.players.history.has_changes()
+        ):
+            ids["card_id"].add(instance.id)
+    if any(ids.values()):
+        game_states.invalidate(session, game_states.games_for(session, ids))
+
+
+def _flush_before_savepoint(conn, name):
+    # Lo de antes del savepoint no se tiene que perder si el savepoint hace rollback
+    with game_states._lock:
+        session = game_states._writers.get(conn)
+    if session is not None:
+        game_states.flush(session, conn)
+
+
+def _flush_before_commit(session):
+    if not session.in_nested_transaction():
+        game_states.flush(session)
+
+
+def _publish_game_states(session):
+    # RELEASE SAVEPOINT también dispara after_commit: se publica con el commit real
+    if not session.in_nested_transaction():
+        game_states.commit(session)
+
+
+def _discard_game_states(session, previous_transaction):
+    game_states.discard(session, nested=previous_transaction.nested)
+
+
+# Cualquier sesión puede cambiar una partida en memoria; con el motor prendido se miran todas
+SESSION_HOOKS = ((Session, "do_orm_execute", _before_statement), (Session, "after_flush", _after_orm_flush),
+                 (Engine, "savepoint", _flush_before_savepoint))
+# Solo en las sesiones que cargaron, escribieron o invalidaron partidas (GameStateEngine._own)
+OWNED_SESSION_HOOKS = (("before_flush", _before_orm_flush), ("before_commit", _flush_before_commit),
+                       ("after_commit", _publish_game_states), ("after_soft_rollback", _discard_game_states))
+
+
+def _listen(enabled: bool) -> None:
+    for target, name, listener in SESSION_HOOKS:
+        if enabled and not event.contains(target, name, listener):
+            event.listen(target, name, listener)
+        elif not enabled and event.contains(target, name, listener):
+            event.remove(target, name, listener)
+
+
+@event.listens_for(GameCard.__table__, "after_create")
+@event.listens_for(GameCard.__table__, "after_drop")
+def _reset_game_states(target, connection, **kw):
+    game_states.clear(connection)
+
+
+game_states = GameStateEngine(listen=True)
@@ -3,6 +3,7 @@ from src.game.models import Game
 from src.player.models import Player
 from src.gamePlayer.models import PlayerGame
 from src.gameCard.models import GameCard
+from src.game_collector import retire_game
 
 def murderer_escapes_service(db: Session, game_id: int):
     """
@@ -37,9 +38,11 @@ def murderer_escapes_service(db: Session, game_id: int):
         "accomplice": accomplice if accomplice else None,
     }
 
+    # Sus cartas y jugadores los borra después el recolector, de a tandas
+    retire_game(db, game_id)
     db.query(GameCard).filter(GameCard.game_id == game_id).delete()
     db.query(PlayerGame).filter(PlayerGame.game_id == game_id).delete()
     db.delete(game)
-    db.commit()
+    db.flush()
 
     return result
\ No newline at end of file
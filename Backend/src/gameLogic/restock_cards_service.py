@@ -7,15 +7,18 @@ from src.gameCard.models import GameCard
 from src.gameCard.services import GameCardService
 from src.playerCard.services import PlayerCardService
 from src.gameCard.models import CardPosition
-from src.game.services import GameService
 from src.cards.services import CardService
-from src.cards.schemas import CardOut
 from src.cards.models import Card
 from src.gameLogic.murderer_escapes_service import murderer_escapes_service
+from src.gameLogic.game_state import GameState, game_states
 
 
 def restock_card(db: Session, game_id: int, player_id: int, cards_id: list[int], robo: int) -> dict:
 
+    state = game_states.get(db, game_id)
+    if state is not None and player_id in state.hands:
+        return restock_card_in_memory(db, state, player_id, cards_id, robo)
+
     game: Optional[Game] = db.query(Game).filter(Game.id == game_id).first()
     if not game:
         raise ValueError("Game not found")
@@ -44,7 +47,7 @@ def restock_card(db: Session, game_id: int, player_id: int, cards_id: list[int],
         draw_cards_result = restock_from_draw(db, game, player_id, robo, player_card_service, game_card_service, card_service)
 
         if isinstance(draw_cards_result, dict) and draw_cards_result.get("type") == "murderer_escapes":
-            db.rollback()
+            # La partida ya se borró en esta transacción: se confirma con la request
             return draw_cards_result
 
         pass_turn = False
@@ -52,7 +55,7 @@ def restock_card(db: Session, game_id: int, player_id: int, cards_id: list[int],
         if turn == amount_restock:
         	pass_turn = True
 
-        db.commit()
+        db.flush()
 
         return {
             "cards_from_draft": draft_cards,
@@ -67,12 +70,8 @@ def restock_card(db: Session, game_id: int, player_id: int, cards_id: list[int],
 def restock_from_draw(db: Session, game: Game, player_id: int, robo: int, player_card_service, game_card_service, card_service) -> list | dict:
     cards_receive = []
     for _ in range(robo):
-        card = db.query(GameCard).join(Card).filter(
-            GameCard.game_id == game.id,
-            GameCard.card_position == CardPosition.MAZO_ROBO.value,
-            GameCard.card_order == game.draw_top,
-            Card.is_murderes_escapes == False
-        ).first()
+        # draw_top solo baja si hay una carta para robar
+        card = game_card_service.take_top_of_draw(game.id)
 
         if not card:
             result = murderer_escapes_service(db, game.id)
@@ -81,15 +80,8 @@ def restock_from_draw(db: Session, game: Game, player_id: int, robo: int, player
         
         player_card_service.assign_card_to_player(player_id, card.card_id)
         game_card_service.update_card_position(game.id, card.card_id, None, card.card_order)
-        card_object = card_service.get_by_id(card.card_id)
-        cards_receive.append(CardOut(
-			id=card_object.id,
-			name=card_object.name,
-			description=getattr(card_object, "description", ""),
-			image_url=card_object.image_url,
-			is_murderes_escapes=card_object.is_murderes_escapes
-		))
-        game.draw_top -= 1
+        # Nombre, descripción e imagen salen del cache de metadata de cartas
+        cards_receive.append(card_service.get_card_out(card.card_id))
         
     return cards_receive
 
@@ -112,13 +104,48 @@ def restock_from_draft(db: Session, game: Game, player_id: int, cards_id: list[i
             
         player_card_service.assign_card_to_player(player_id, card.card_id)
         game_card_service.update_card_position(game.id, card.card_id, None, card.card_order)
-        card_object = card_service.get_by_id(card.card_id)
-        cards_receive.append(CardOut(
-			id=card_object.id,
-			name=card_object.name,
-			description=getattr(card_object, "description", ""),
-			image_url=card_object.image_url,
-			is_murderes_escapes=card_object.is_murderes_escapes
-		))
+        # Nombre, descripción e imagen salen del cache de metadata de cartas
+        cards_receive.append(card_service.get_card_out(card.card_id))
         
-    return cards_receive
\ No newline at end of file
+    return cards_receive
+
+
+def restock_card_in_memory(db: Session, state: GameState, player_id: int, cards_id: list[int], robo: int) -> dict:
+    """restock_card sobre la partida en memoria: mano, draft y mazo de robo sin queries."""
+    amount_restock = 6 - state.hand_size(player_id)
+    if amount_restock <= 0:
+        raise Exception("Player have 6 cards in his hand")
+    if (len(cards_id) + robo) > amount_restock:
+        raise Exception("The requested amount exceeds the allowed amount")
+
+    card_service = CardService(db)
+    try:
+        draft_cards = []
+        for card_id in cards_id:
+            if state.positions.get(card_id) != CardPosition.MAZO_DRAFT or card_id in state.murderer_escapes:
+                raise ValueError(f"Card with id {card_id} not found in draft")
+            game_states.give_card(db, state, player_id, card_id)
+            game_states.move_card(db, state, card_id, None, state.orders[card_id])
+            draft_cards.append(card_service.get_card_out(card_id))
+
+        draw_cards = []
+        for _ in range(robo):
+            card_id = state.top_of_draw()
+            if card_id is None:
+                result = murderer_escapes_service(db, state.game_id)
+                result["type"] = "murderer_escapes"
+                return result
+            if game_states.bump_counter(db, state, "draw_top", -1) is None:
+                raise ValueError("Game not found")
+            game_states.give_card(db, state, player_id, card_id)
+            game_states.move_card(db, state, card_id, None, state.orders[card_id])
+            draw_cards.append(card_service.get_card_out(card_id))
+
+        return {
+            "cards_from_draft": draft_cards,
+            "cards_from_draw": draw_cards,
+            "pass_turn": len(draft_cards) + len(draw_cards) == amount_restock
+        }
+    except Exception as e:
+        db.rollback()
+        raise e
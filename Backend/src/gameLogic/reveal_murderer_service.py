@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from src.gameCard.models import GameCard
+from src.game_collector import retire_game
 from src.game.models import Game
 from src.gamePlayer.models import PlayerGame
 from src.player.models import Player
@@ -54,9 +55,11 @@ def reveal_murderer(db: Session, secret_id: int) -> dict:
 
 	game = db.query(Game).filter(Game.id == game_id).first()
 
+	# Sus cartas y jugadores los borra después el recolector, de a tandas
+	retire_game(db, game_id)
 	db.query(GameCard).filter(GameCard.game_id == game_id).delete()
 	db.query(PlayerGame).filter(PlayerGame.game_id == game_id).delete()
 	db.delete(game)
-	db.commit()
+	db.flush()
 
 	return result
@@ -61,7 +61,7 @@ def start_game(db: Session, game_id: int) -> int:
         game = db.query(Game).filter(Game.id == game_id).first()
         if not getattr(game, "is_started", False):
             setattr(game, "is_started", True)
-            db.commit()
+            db.flush()
     except Exception as e:
         raise StartGameError(f"Error marking game as started: {e}")
 
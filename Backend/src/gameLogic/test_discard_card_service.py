@@ -121,6 +121,8 @@ def test_discard_card_success(db_session: Session, setup_game_with_cards_and_pla
 
     assign_cards(db_session, game.id)
     assign_secrets(db_session, game.id)
+    # Los servicios solo hacen flush: el reparto se confirma acá, como en un endpoint
+    db_session.commit()
     
     player = players[0]
     db_session.refresh(player)
@@ -157,6 +159,8 @@ def test_discard_secret_card(db_session: Session, setup_game_with_cards_and_play
 
     assign_cards(db_session, game.id)
     assign_secrets(db_session, game.id)
+    # Los servicios solo hacen flush: el reparto se confirma acá, como en un endpoint
+    db_session.commit()
     
     player = players[0]
     db_session.refresh(player)
@@ -91,3 +91,31 @@ def test_initialize_creates_all_card_types_correctly(db_session, game_name):
 
 
 
+
+
+def test_initialize_game_cards_uses_bulk_inserts(db_session):
+    """Las ~90 cartas se crean con un INSERT por tabla, no uno (y un commit) por carta."""
+    from sqlalchemy import event
+
+    first, game = Game(name="Juego Bulk 1"), Game(name="Juego Bulk 2")
+    db_session.add_all([first, game])
+    db_session.commit()
+    # La primera partida crea las entradas del catálogo que falten
+    initialize_game_cards(db_session, first.id)
+
+    inserts = []
+
+    def count_inserts(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT"):
+            inserts.append(statement.split("(")[0].split()[-1])
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", count_inserts)
+    try:
+        initialize_game_cards(db_session, game.id)
+    finally:
+        event.remove(engine, "before_cursor_execute", count_inserts)
+
+    # Sin card_catalog: la segunda partida reutiliza las mismas entradas
+    assert sorted(inserts) == sorted(["cards", "secret_cards", "detective_cards", "event_cards", "game_card"])
+    assert db_session.query(GameCard).filter(GameCard.game_id == game.id).count() == len(expanded_cards)
@@ -48,10 +48,11 @@ def test_reveal_murderer_success(monkeypatch):
     assert result["murderer"].rol == "murderer"
     assert result["accomplice"].rol == "accomplice"
 
-    # Validar eliminaciones y commit
+    # Validar eliminaciones; el commit lo hace la request
     assert db.query.return_value.filter.return_value.delete.call_count == 2
     db.delete.assert_called_once_with(game)
-    db.commit.assert_called_once()
+    db.flush.assert_called_once()
+    db.commit.assert_not_called()
 
 
 def test_reveal_murderer_no_game_found():
@@ -85,7 +86,8 @@ def test_reveal_murderer_no_players_found(monkeypatch):
     assert result["game_id"] == 5
     assert result["murderer"] is None
     assert result["accomplice"] is None
-    db.commit.assert_called_once()
+    db.flush.assert_called_once()
+    db.commit.assert_not_called()
 
 def test_reveal_murderer_missing_game_object():
     db = MagicMock()
@@ -102,4 +104,5 @@ def test_reveal_murderer_missing_game_object():
     result = reveal_murderer(db, secret_id=999)
 
     assert result["murderer"].rol == "murderer"
-    db.commit.assert_called_once()
+    db.flush.assert_called_once()
+    db.commit.assert_not_called()
@@ -9,6 +9,7 @@ from src.gamePlayer.services import GamePlayerService
 from src.player.models import Player
 from src.player.services import PlayerService
 from src.player.enums import RolEnum
+from src.models.db import run_db
 from src.websocket import manager
 
 
@@ -19,6 +20,12 @@ class WinBySocialDisgrace:
         self.game_id = game_id
     
     async def check_win_by_social_disgrace(self):
+        message = await run_db(self.db, lambda db: self.murderer_escapes_message())
+        if message is not None:
+            await manager.broadcast(message, room_id=self.game_id)
+
+    def murderer_escapes_message(self) -> WSMurdererEscapes | None:
+        # Las queries corren en un thread (run_db); el broadcast, en el loop
         try:
             gamePlayerService = GamePlayerService(self.db)
             gamePlayers = gamePlayerService.get_players_in_game(game_id=self.game_id)
@@ -95,9 +102,10 @@ class WinBySocialDisgrace:
                     accomplice=playerAccomplice.to_schema() if playerAccomplice else None
                 )
                 
-                message = WSMurdererEscapes(payload=payloadMurderer)
-                await manager.broadcast(message.model_dump_json(), room_id=self.game_id)
-                    
+                return WSMurdererEscapes(payload=payloadMurderer)
+
+            return None
+
         except HTTPException:
             # Deja pasar los errores HTTP originales (404, 400, etc.)
             raise
@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session, aliased
 from typing import List, Optional, Dict
 from pydantic import BaseModel
 
-from src.models.db import get_db
+from src.models.db import AnySession, commit_db, get_db, run_db
 from src.gamePlayer.services import GamePlayerService 
 from src.gamePlayer.schemas import (
     GamePlayerOut, 
@@ -31,14 +31,19 @@ from src.gameLogic.discard_card_service import discard_card as discard_card_serv
 from src.gameLogic.discard_card_service import discard_random_card
 from src.gameLogic.advance_turn_service import advance_turn
 from src.gameLogic.restock_draft_deck import restock_draft_deck
+from src.gameLogic.game_state import game_states
+from src.game_lock import game_param, get_game_db, locked_db
 from src.player.models import Player, RolEnum
 from src.game.models import Game
 from src.playerCard.services import PlayerCardService
-from src.websocket import manager  
+from src.websocket import Deferred, manager  
 from src.cards.logicEventCards.point_suspicions_service import register_receiving_votes, start_votation
 
 player_game_router = APIRouter()
 
+# Las acciones de la partida con la sesión sync de get_db (las de get_game_db usan get_async_db)
+get_game_sync_db = locked_db(game_param())
+
 
 # Helper para convertir modelo DB a schema
 def db_gameplayer_to_out(pg) -> GamePlayerOut:
@@ -54,7 +59,7 @@ async def join_game(
     game_id: int,
     player_id: int,
     data: JoinGameIn,  # <-- recibimos position_id_player
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_game_sync_db),
     room_id: str = Query("0", description="ID de la sala, por defecto 0")
 ):
     """
@@ -83,12 +88,12 @@ async def join_game(
             player_id=player_id,
             position_id_player=data.position_id_player  # opcional
         )
-        player_game = service.join_game(dto)
+        player_game = await run_db(db, lambda db: service.join_game(dto))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     ws_message = WSAddMessage(payload=db_gameplayer_to_out(player_game))
-    await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+    await manager.broadcast(ws_message, room_id=room_id)
 
     return {
         "id": player_game.id,
@@ -132,7 +137,7 @@ async def get_players(
 async def delete_game_player(
     game_id: int,
     player_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_game_sync_db),
     room_id: str = Query("0", description="ID de la sala, por defecto 0")
 ):
 
@@ -151,14 +156,14 @@ async def delete_game_player(
 
     service = GamePlayerService(db)
     try:
-        player_remove = service.delete_game_player(game_id, player_id)
+        player_remove = await run_db(db, lambda db: service.delete_game_player(game_id, player_id))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))    
 
     ws_message = WSDeleteMessage(player_id=player_remove)
-    await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+    await manager.broadcast(ws_message, room_id=room_id)
     
     return player_remove
 
@@ -220,7 +225,7 @@ async def discard_card(
     game_id: int,
     player_id: int,
     card_id: int,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_game_db),
     room_id: str = Query("0", description="ID de la sala, por defecto 0")
 ):
 
@@ -245,26 +250,33 @@ async def discard_card(
     """
 
     try:
-        result = discard_card_service(db, game_id, player_id, card_id)
+        result, card_discard = await run_db(db, discard_with_schema, game_id, player_id, card_id)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    await commit_db(db)
 
     ws_message = WSDiscardMessage(payload=DiscardPayload(
         player_id=result["player_id"],
         card_id=result["card_id"],
-        card_discard=result["card_discard"].to_schema()))
-    await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+        card_discard=card_discard))
+    await manager.broadcast(ws_message, room_id=room_id)
     return result
 
+
+def discard_with_schema(db: Session, game_id: int, player_id: int, card_id: int):
+    """Descarta y arma el schema de la carta antes del commit."""
+    result = discard_card_service(db, game_id, player_id, card_id)
+    return result, result["card_discard"].to_schema()
+
 @player_game_router.post("/{game_id}/{player_id}/restock")
 async def restock_cards(
     game_id: int,
     player_id: int,
     cards: CardsDraftInfo,
     cantidad_robo: int = 0,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_game_db),
     room_id: str = Query("0", description="ID de la sala, por defecto 0")
 ):
     """
@@ -290,33 +302,28 @@ async def restock_cards(
     new_cards_draft = []
     cards_result = []
     try:
-        result = restock_card(db, game_id, player_id, cards.cards_id, cantidad_robo)
+        result = await run_db(db, restock_card, game_id, player_id, cards.cards_id, cantidad_robo)
 
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    
+    turn = await run_db(db, finish_restock, game_id, result)
+    await commit_db(db)
+
     if "murderer" in result:
-        accomplice = result.get("accomplice")
-        ws_message = WSMurdererEscapes(payload=MurdererEscapesPayload(
-            murderer=result["murderer"].to_schema(),
-            accomplice=accomplice.to_schema() if accomplice else None))
-        await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+        ws_message = WSMurdererEscapes(payload=turn["murderer"])
+        await manager.broadcast(ws_message, room_id=room_id)
     else:
         cards_result = result["cards_from_draft"] + result["cards_from_draw"]
         if result["pass_turn"]:
-            next_player_id = advance_turn(db, game_id)
-            ws_nextTurn = WSNextTurnMessage(payload=next_player_id)
-            await manager.broadcast(ws_nextTurn.model_dump_json(), room_id=room_id)
+            ws_nextTurn = WSNextTurnMessage(payload=turn["next_player_id"])
+            await manager.broadcast(ws_nextTurn, room_id=room_id)
 
-        cards_draft = restock_draft_deck(db, game_id)
+        cards_draft = turn["cards_draft"]
         if "murderer" in cards_draft:
-            accomplice = cards_draft.get("accomplice")
-            ws_message = WSMurdererEscapes(payload=MurdererEscapesPayload(
-                murderer=cards_draft["murderer"].to_schema(),
-                accomplice=accomplice.to_schema() if accomplice else None))
-            await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+            ws_message = WSMurdererEscapes(payload=turn["murderer"])
+            await manager.broadcast(ws_message, room_id=room_id)
             return cards_draft
         try:
             if cards_draft != "The draft deck have 3 cards":
@@ -329,7 +336,7 @@ async def restock_cards(
             cards=[card.model_dump() for card in cards_result],
             draft_cards=[card.model_dump() for card in new_cards_draft]
         ))
-        await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+        await manager.broadcast(ws_message, room_id=room_id)
 
     return {
         "player_id": player_id,
@@ -339,11 +346,93 @@ async def restock_cards(
     }
 
 
+def finish_restock(db: Session, game_id: int, result: dict) -> dict:
+    """
+    Resto de la parte de base de datos de reponer: si la mano quedó completa
+    pasa el turno, y repone el draft. Los payloads del asesino también se arman
+    acá, así todo está listo antes del commit y de los broadcasts.
+    """
+    if "murderer" in result:
+        return {"murderer": murderer_escapes_payload(db, result)}
+    turn = {"next_player_id": advance_turn(db, game_id) if result["pass_turn"] else None}
+    turn["cards_draft"] = cards_draft = restock_draft_deck(db, game_id)
+    if "murderer" in cards_draft:
+        turn["murderer"] = murderer_escapes_payload(db, cards_draft)
+    return turn
+
+
+def murderer_escapes_payload(db: Session, result: dict) -> MurdererEscapesPayload:
+    """Payload de WSMurdererEscapes con el asesino y el cómplice de `result`."""
+    accomplice = result.get("accomplice")
+    return MurdererEscapesPayload(
+        murderer=result["murderer"].to_schema(),
+        accomplice=accomplice.to_schema() if accomplice else None)
+
+
+def discard_and_restock(db: Session, game_id: int, player_id: int) -> tuple[dict, dict]:
+    """
+    Parte de base de datos de pasar el turno: descarta una carta al azar y
+    repone la mano desde el mazo de robo.
+    """
+    state = game_states.get(db, game_id)
+    if state is not None:
+        if player_id not in state.hands:
+            raise ValueError("Player not in game")
+        if state.turn_id_player != player_id:
+            raise ValueError("It's not the player's turn")
+        discarded_card = discard_random_card(db, player_id, game_id)
+        restock_result = restock_card(db, game_id, player_id, [], 6 - state.hand_size(player_id))
+        return discarded_card, restock_result
+
+    game = db.query(Game).filter(Game.id == game_id).first()
+    if not game:
+        raise ValueError("Game not found")
+
+    player_game = db.query(PlayerGame).filter_by(game_id=game_id, player_id=player_id).first()
+    if not player_game:
+        raise ValueError("Player not in game")
+
+
+    if game.turn_id_player != player_id:
+        raise ValueError("It's not the player's turn")
+
+
+    discarded_card = discard_random_card(db, player_id, game_id)
+
+    player_card_service = PlayerCardService(db)
+
+    cards_player = player_card_service.get_player_cards(player_id)
+    cards_player_id = [
+        card.id for card in cards_player
+        if "secret" not in getattr(card, "name", "").lower() and not getattr(card, "is_murderes_escapes", False)
+    ]
+    amount_restock = 6 - len(cards_player_id)
+
+    restock_result = restock_card(db, game_id, player_id, [], amount_restock)
+    return discarded_card, restock_result
+
+
+def pass_turn(db: Session, game_id: int, player_id: int) -> dict:
+    """
+    Toda la parte de base de datos de pasar el turno, con los payloads ya
+    armados para hacer el commit antes de los broadcasts.
+    """
+    discarded_card, restock_result = discard_and_restock(db, game_id, player_id)
+    if "murderer" in restock_result:
+        return {"restock": restock_result, "murderer": murderer_escapes_payload(db, restock_result)}
+    return {
+        "discarded_card": discarded_card,
+        "card_discard": discarded_card["card_discard"].to_schema(),
+        "restock": restock_result,
+        "next_player_id": advance_turn(db, game_id),
+    }
+
+
 @player_game_router.post("/{game_id}/{player_id}/pass")
 async def pass_turn_endpoint(
     game_id: int,
     player_id: int,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_game_db),
     room_id: str = Query("0", description="ID de la sala, por defecto 0")
 ):
     """
@@ -371,55 +460,26 @@ async def pass_turn_endpoint(
             - drawn_cards: lista de cartas repuestas
     """
     try:
-        game = db.query(Game).filter(Game.id == game_id).first()
-        if not game:
-            raise ValueError("Game not found")
-        
-        player_game = db.query(PlayerGame).filter_by(game_id=game_id, player_id=player_id).first()
-        if not player_game:
-            raise ValueError("Player not in game")
-
-
-        if game.turn_id_player != player_id:
-            raise ValueError("It's not the player's turn")
-        
-
-        discarded_card = discard_random_card(db, player_id, game_id)
-
-        player_card_service = PlayerCardService(db)
-
-        cards_player = player_card_service.get_player_cards(player_id)
-        cards_player_id = [
-            card.id for card in cards_player
-            if "secret" not in getattr(card, "name", "").lower() and not getattr(card, "is_murderes_escapes", False)
-        ]
-        amount_restock = 6 - len(cards_player_id)
-        
-        restock_result = restock_card(db, game_id, player_id, [], amount_restock)
-
-        if "murderer" in restock_result:
-            accomplice = restock_result.get("accomplice")
-            ws_message = WSMurdererEscapes(payload=MurdererEscapesPayload(
-                murderer=restock_result["murderer"].to_schema(),
-                accomplice=accomplice.to_schema() if accomplice else None))
-            await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
-            return restock_result
-
-        cards_result = restock_result["cards_from_draw"]
-
-        next_player_id = advance_turn(db, game_id)
-
-        result = {
-            "player_id": player_id,
-            "discarded_card": discarded_card,
-            "restock_cards": cards_result,
-            "next_player_id": next_player_id
-        }
-
+        turn = await run_db(db, pass_turn, game_id, player_id)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    await commit_db(db)
+
+    if "murderer" in turn:
+        ws_message = WSMurdererEscapes(payload=turn["murderer"])
+        await manager.broadcast(ws_message, room_id=room_id)
+        return turn["restock"]
+
+    discarded_card = turn["discarded_card"]
+    cards_result = turn["restock"]["cards_from_draw"]
+    result = {
+        "player_id": player_id,
+        "discarded_card": discarded_card,
+        "restock_cards": cards_result,
+        "next_player_id": turn["next_player_id"]
+    }
 
     # Notificar a la sala vía WebSocket
 
@@ -429,16 +489,16 @@ async def pass_turn_endpoint(
         cards=[card.model_dump() for card in cards_result],
         draft_cards=[]
     ))
-    await manager.broadcast(ws_restock.model_dump_json(), room_id=room_id)
+    await manager.broadcast(ws_restock, room_id=room_id)
 
     ws_discard = WSDiscardMessage(payload=DiscardPayload(
         player_id=result["player_id"],
         card_id=discarded_card["card_id"],
-        card_discard=discarded_card["card_discard"].to_schema()))
-    await manager.broadcast(ws_discard.model_dump_json(), room_id=room_id)
+        card_discard=turn["card_discard"]))
+    await manager.broadcast(ws_discard, room_id=room_id)
     
     ws_nextTurn = WSNextTurnMessage(payload=result["next_player_id"])
-    await manager.broadcast(ws_nextTurn.model_dump_json(), room_id=room_id)
+    await manager.broadcast(ws_nextTurn, room_id=room_id)
     
     return result
 
@@ -447,7 +507,7 @@ async def register_votes_endpoint(
     game_id: int,
     player_id: int,
     vote: VotePlayerInfo,
-    db: Session=Depends(get_db),
+    db: Session = Depends(get_game_sync_db),
     room_id: str = Query("0", description="ID de la sala, por defecto 0")
 ):
 
@@ -476,18 +536,20 @@ async def register_votes_endpoint(
         400: Si el jugador que emite el voto ya lo hizo
     """
 
+    deferred = Deferred()
     try:
-        result = await register_receiving_votes(db, game_id, vote.vote, room_id)
+        result = await run_db(db, register_receiving_votes, game_id, vote.vote, room_id, deferred)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    await deferred.run()
 
     ws_message = WSRegisteVotes(payload=RegisterVotesPayload(
         end_votation=result,
     ))
 
-    await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+    await manager.broadcast(ws_message, room_id=room_id)
 
     return result
 
@@ -496,7 +558,7 @@ async def start_votation_endpoint(
     game_id: int,
     player_id: int,
     card_id: int,
-    db: Session=Depends(get_db),
+    db: Session = Depends(get_game_sync_db),
     room_id: str = Query("0", description="ID de la sala, por defecto 0")
 ):
     """
@@ -519,7 +581,7 @@ async def start_votation_endpoint(
         404 -> Si la partida no ha sido encontrada
     """
     try:
-        result = start_votation(db, game_id, player_id, card_id, room_id)
+        result = await run_db(db, start_votation, game_id, player_id, card_id, room_id)
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
@@ -532,6 +594,6 @@ async def start_votation_endpoint(
         players=[player.to_schema() for player in players]
     ))
 
-    await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+    await manager.broadcast(ws_message, room_id=room_id)
 
     return result
@@ -1,5 +1,5 @@
 
-from sqlalchemy import Column, Integer, ForeignKey, Table
+from sqlalchemy import Column, Integer, ForeignKey, Index, Table
 from sqlalchemy.orm import relationship
 from src.models.db import Base
 from src.player.models import Player
@@ -7,6 +7,8 @@ from src.game.models import Game
 
 class PlayerGame(Base):
     __tablename__ = "player_game"
+    # Jugadores de una partida en orden de turno
+    __table_args__ = (Index("ix_player_game_game_position", "game_id", "position_id_player", "player_id"),)
     Base.metadata
     id = Column(Integer, primary_key=True)
     player_id = Column(Integer, ForeignKey("player.id"), unique=True)  # un jugador solo en un juego
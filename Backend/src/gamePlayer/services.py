@@ -34,7 +34,7 @@ class GamePlayerService:
         position_id_player=dto.position_id_player  # puede ser None
         )
         self._db.add(player_game)
-        self._db.commit()
+        self._db.flush()
         self._db.refresh(player_game)
 
         return player_game
@@ -61,7 +61,7 @@ class GamePlayerService:
             raise ValueError("Player Not Found")
 
         self._db.delete(player_game)
-        self._db.commit()
+        self._db.flush()
 
         return player_id
 
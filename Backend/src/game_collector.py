@@ -0,0 +1,219 @@
+"""Recolector de lo que dejan las partidas terminadas: cartas, manos y sets."""
+
+import asyncio
+from dataclasses import dataclass, field
+
+from sqlalchemy import Column, Integer, Table, delete, insert, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from src.models.db import Base, migration_lock, session, unit_of_work
+from src.settings import settings
+from src.cards.card_cache import card_cache
+from src.cards.models import Card, DetectiveCard, EventCard, SecretCard
+from src.detectiveSet.models import DetectiveSet
+from src.gameCard.models import GameCard
+from src.gamePlayer.models import PlayerGame
+from src.player.enums import RolEnum
+from src.player.models import Player
+from src.playerCard.models import player_card_table
+
+# Cartas y jugadores de partidas ya borradas, pendientes de recolectar. Sin FK:
+# la partida (y su game_card/player_game) ya no existe cuando se procesan
+retired_card_table = Table(
+    "retired_card",
+    Base.metadata,
+    Column("card_id", Integer, primary_key=True),
+)
+retired_player_table = Table(
+    "retired_player",
+    Base.metadata,
+    Column("player_id", Integer, primary_key=True),
+)
+
+CARD_TABLES = (SecretCard.__table__, DetectiveCard.__table__, EventCard.__table__, Card.__table__)
+
+
+def retire_game(db: Session, game_id: int) -> None:
+    """
+    Encola las cartas y los jugadores de la partida para el recolector. Se llama
+    al terminarla, antes de borrar sus game_card y player_game.
+    """
+    db.execute(insert(retired_card_table).from_select(
+        ["card_id"], select(GameCard.card_id).where(GameCard.game_id == game_id)
+    ))
+    db.execute(insert(retired_player_table).from_select(
+        ["player_id"], select(PlayerGame.player_id).where(PlayerGame.game_id == game_id)
+    ))
+
+
+@dataclass
+class CollectReport:
+    """Filas borradas por tabla y bytes que el archivo de la DB devolvió en una corrida."""
+
+    rows: dict[str, int] = field(default_factory=dict)
+    bytes_reclaimed: int = 0
+
+    @property
+    def total_rows(self) -> int:
+        return sum(self.rows.values())
+
+    def add(self, table: str, count: int) -> None:
+        if count > 0:
+            self.rows[table] = self.rows.get(table, 0) + count
+
+    def __str__(self) -> str:
+        detail = ", ".join(f"{table}={count}" for table, count in sorted(self.rows.items()))
+        return f"{self.total_rows} filas ({detail or '-'}), {self.bytes_reclaimed} bytes liberados"
+
+
+def _collect_cards(db: Session, report: CollectReport, batch_size: int) -> int:
+    card_ids = db.execute(
+        select(retired_card_table.c.card_id).order_by(retired_card_table.c.card_id).limit(batch_size)
+    ).scalars().all()
+    if not card_ids:
+        return 0
+    report.add("player_card", db.execute(
+        delete(player_card_table).where(player_card_table.c.card_id.in_(card_ids))
+    ).rowcount)
+    # Subtipos antes que `cards`, por la FK de su id
+    for table in CARD_TABLES:
+        report.add(table.name, db.execute(delete(table).where(table.c.id.in_(card_ids))).rowcount)
+    db.execute(delete(retired_card_table).where(retired_card_table.c.card_id.in_(card_ids)))
+    # SQLite puede reusar esos ids para cartas nuevas
+    card_cache.invalidate(db.get_bind(), card_ids)
+    return len(card_ids)
+
+
+def _collect_players(db: Session, report: CollectReport, batch_size: int) -> int:
+    player_ids = db.execute(
+        select(retired_player_table.c.player_id).order_by(retired_player_table.c.player_id).limit(batch_size)
+    ).scalars().all()
+    if not player_ids:
+        return 0
+    # Los que ya se unieron a otra partida siguen en uso
+    in_game = set(db.execute(select(PlayerGame.player_id).where(PlayerGame.player_id.in_(player_ids))).scalars())
+    free_ids = [player_id for player_id in player_ids if player_id not in in_game]
+    if free_ids:
+        sets = select(DetectiveSet.id).where(DetectiveSet.id_owner.in_(free_ids))
+        db.execute(
+            update(DetectiveCard.__table__)
+            .where(DetectiveCard.__table__.c.detective_set_id.in_(sets))
+            .values(detective_set_id=None)
+        )
+        report.add("detective_set", db.execute(
+            delete(DetectiveSet.__table__).where(DetectiveSet.__table__.c.id_owner.in_(free_ids))
+        ).rowcount)
+        report.add("player_card", db.execute(
+            delete(player_card_table).where(player_card_table.c.player_id.in_(free_ids))
+        ).rowcount)
+        # El jugador sigue existiendo: solo vuelve a como estaba antes de la partida
+        db.execute(
+            update(Player.__table__)
+            .where(Player.__table__.c.id.in_(free_ids))
+            .values(rol=RolEnum.innocent, is_Social_Disgrace=False, is_Your_Turn=False, is_Owner=False)
+        )
+    db.execute(delete(retired_player_table).where(retired_player_table.c.player_id.in_(player_ids)))
+    return len(player_ids)
+
+
+def incremental_vacuum(bind, max_pages: int = 0) -> int:
+    """
+    Devuelve al sistema hasta `max_pages` páginas libres de SQLite (0: todas).
+    Retorna los bytes liberados; 0 en otros motores o sin auto_vacuum=INCREMENTAL.
+    """
+    if bind.dialect.name != "sqlite":
+        return 0
+    with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        page_size = conn.exec_driver_sql("PRAGMA page_size").scalar()
+        before = conn.exec_driver_sql("PRAGMA page_count").scalar()
+        # Libera una página por paso y execute() de pysqlite da un solo paso;
+        # executescript() la corre hasta el final
+        conn.connection.driver_connection.executescript(f"PRAGMA incremental_vacuum({max_pages});")
+        after = conn.exec_driver_sql("PRAGMA page_count").scalar()
+    return (before - after) * page_size
+
+
+def enable_incremental_vacuum(bind, vacuum: bool = True) -> bool:
+    """
+    Pasa la DB de SQLite a auto_vacuum=INCREMENTAL. En una DB nueva alcanza con
+    el pragma; una con tablas necesita un VACUUM completo, una sola vez, que
+    solo se hace con `vacuum`. Retorna True si quedó activado.
+    """
+    if bind.dialect.name != "sqlite":
+        return False
+    with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.exec_driver_sql("PRAGMA auto_vacuum=INCREMENTAL")
+        if vacuum and conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() != 2:
+            conn.exec_driver_sql("VACUUM")
+        return conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() == 2
+
+
+def migrate_incremental_vacuum(bind) -> bool:
+    """
+    Migración de una sola vez de una DB existente a auto_vacuum=INCREMENTAL (el
+    VACUUM completo). Con varios workers la hace uno solo, el que toma el lock
+    de archivo junto a la DB; los demás arrancan sin esperarlo. Si la base está
+    ocupada se avisa y se reintenta en el próximo arranque. Bloqueante.
+    """
+    with migration_lock(bind, wait=False) as locked:
+        if not locked:
+            return False
+        try:
+            return enable_incremental_vacuum(bind)
+        except OperationalError as e:
+            print(f"No se pudo pasar la DB a auto_vacuum=INCREMENTAL: {e}")
+            return False
+
+
+class GameCollector:
+    """
+    Delete what finished games leave behind, in small batches.
+
+    `retire_game` queues the cards and players of a game when it ends; each
+    run goes through them GC_BATCH_SIZE at a time, one short transaction per
+    batch, so the write lock is released between batches and requests are
+    never blocked for long. Players are never deleted: those that did not
+    join another game lose their hand and sets and get their role reset.
+    Afterwards an incremental vacuum returns the freed pages.
+    """
+
+    def __init__(self, session_factory=None, batch_size: int | None = None):
+        self._session_factory = session_factory or session
+        self.batch_size = batch_size or settings.GC_BATCH_SIZE
+        self.last_report: CollectReport | None = None
+
+    def collect(self) -> CollectReport:
+        """Una corrida completa: todas las partidas encoladas y el vacuum. Bloqueante."""
+        report = CollectReport()
+        # Cartas primero: los sets y las manos de los jugadores las referencian
+        for step in (_collect_cards, _collect_players):
+            while True:
+                batch = CollectReport()
+                with unit_of_work(self._session_factory()) as db:
+                    done = step(db, batch, self.batch_size)
+                    bind = db.get_bind()
+                # Solo cuenta lo que llegó a hacer commit
+                for table, count in batch.rows.items():
+                    report.add(table, count)
+                if done < self.batch_size:
+                    break
+        if report.total_rows:
+            report.bytes_reclaimed = incremental_vacuum(bind, settings.GC_VACUUM_PAGES)
+        self.last_report = report
+        return report
+
+    async def run(self) -> None:
+        """Recolecta cada GC_INTERVAL segundos hasta que se cancela, en un thread aparte."""
+        while True:
+            await asyncio.sleep(settings.GC_INTERVAL)
+            try:
+                report = await asyncio.to_thread(self.collect)
+            except Exception as e:
+                print(f"El recolector de partidas falló: {e}")
+                continue
+            if report.total_rows:
+                print(f"Recolector de partidas: {report}")
+
+
+game_collector = GameCollector()
@@ -0,0 +1,134 @@
+"""Serialización de las acciones de juego: una a la vez por partida, partidas distintas en paralelo."""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, Request
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.gameCard.models import GameCard
+from src.gamePlayer.models import PlayerGame
+from src.models.db import AnySession, commit_db, get_async_db, get_db, run_db
+
+
+class GameLocks:
+    """
+    One asyncio.Lock per game, created on first use and dropped once nobody
+    holds or waits for it, so finished games leave nothing behind. Only the
+    requests of the same game queue up; other games never wait.
+    """
+
+    def __init__(self):
+        self._locks: dict[int, asyncio.Lock] = {}
+        self._users: dict[int, int] = {}
+        self.acquired = 0
+        self.contended = 0
+
+    @asynccontextmanager
+    async def hold(self, game_id: int):
+        # Todo corre en el event loop: no hace falta un threading.Lock para el diccionario
+        lock = self._locks.get(game_id)
+        if lock is None:
+            lock = self._locks[game_id] = asyncio.Lock()
+        self._users[game_id] = self._users.get(game_id, 0) + 1
+        if lock.locked():
+            self.contended += 1
+        try:
+            async with lock:
+                self.acquired += 1
+                yield
+        finally:
+            self._users[game_id] -= 1
+            if not self._users[game_id]:
+                del self._users[game_id]
+                del self._locks[game_id]
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    def stats(self) -> dict:
+        return {"games": len(self._locks), "acquired": self.acquired, "contended": self.contended}
+
+
+game_locks = GameLocks()
+
+
+async def hold_game(game_id: int):
+    async with game_locks.hold(game_id):
+        yield
+
+
+async def get_game_db(_: None = Depends(hold_game), db: AnySession = Depends(get_async_db)) -> AnySession:
+    """
+    Sesión de get_async_db para las acciones sobre una partida (path param game_id).
+    FastAPI cierra las dependencias en orden inverso: el commit (o rollback) de la
+    request termina antes de soltar el lock, así que la próxima acción de la misma
+    partida lee lo que esta escribió.
+    """
+    return db
+
+
+@asynccontextmanager
+async def game_session(db: AnySession, game_id: int | None):
+    """
+    Lock de la partida alrededor de una sesión que no sale de get_game_db. El
+    commit (o el rollback) se hace acá, antes de soltar el lock: la dependencia
+    de la sesión cierra después, con la transacción ya terminada. Sin partida
+    (None) no hay nada que serializar y el endpoint responde el error.
+    """
+    if game_id is None:
+        yield db
+        return
+    async with game_locks.hold(game_id):
+        try:
+            yield db
+        except Exception:
+            await run_db(db, lambda session: session.rollback())
+            raise
+        await commit_db(db)
+
+
+def locked_db(resolve, get_session=get_db):
+    """
+    Dependencia de sesión para las acciones cuya partida no es el path param
+    game_id. `resolve(db, params)` la busca a partir de los path params y del
+    body JSON de la request; se corre antes de tomar el lock, solo lee.
+    """
+    async def get_locked_db(request: Request, db: AnySession = Depends(get_session)):
+        try:
+            body = await request.json()
+        except ValueError:
+            body = None
+        params = {**body, **request.path_params} if isinstance(body, dict) else dict(request.path_params)
+        game_id = await run_db(db, resolve, params)
+        async with game_session(db, game_id):
+            yield db
+    return get_locked_db
+
+
+def as_id(value) -> int | None:
+    """Id de un parámetro de la request, o None: la validación de verdad la hace el endpoint."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def game_param(key: str = "game_id"):
+    """Resolver de locked_db para las acciones que reciben el id de la partida (`key`)."""
+    return lambda db, params: as_id(params.get(key))
+
+
+def game_of_player(db: Session, player_id) -> int | None:
+    player_id = as_id(player_id)
+    if player_id is None:
+        return None
+    return db.scalar(select(PlayerGame.game_id).where(PlayerGame.player_id == player_id).limit(1))
+
+
+def game_of_card(db: Session, card_id) -> int | None:
+    card_id = as_id(card_id)
+    if card_id is None:
+        return None
+    return db.scalar(select(GameCard.game_id).where(GameCard.card_id == card_id).limit(1))
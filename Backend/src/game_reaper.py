@@ -0,0 +1,234 @@
+"""Reaper de partidas abandonadas: empezadas, sin sockets y sin actividad HTTP."""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import delete, select
+from starlette.datastructures import QueryParams
+
+from src.models.db import session, unit_of_work
+from src.settings import settings
+from src import event_timer
+from src.cards.logicEventCards import point_suspicions_service as votes
+from src.cards.logicEventCards.notSoFast import event_state_service
+from src.game.models import Game
+from src.game.schemas import WSRemoveMessage
+from src.gameCard.models import GameCard
+from src.gamePlayer.models import PlayerGame
+from src.game_collector import retire_game
+from src.game_lock import game_locks
+from src.lobby_digest import LOBBY_ROOM
+from src.timer_scheduler import timers
+from src.websocket import manager
+
+VOTE_STATE = (votes.Votes_received, votes.End_votation, votes.Order_vote, votes.Current_voter_index)
+
+
+def game_room(game_id: int) -> str:
+    """Room de WebSocket de una partida: su id como string."""
+    return str(game_id)
+
+
+class GameActivity:
+    """Última actividad (time.monotonic()) de cada partida, por HTTP o por sus sockets."""
+
+    def __init__(self):
+        self._last: dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def touch(self, game_id: int, now: float | None = None) -> None:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if now > self._last.get(game_id, 0.0):
+                self._last[game_id] = now
+
+    def last(self, game_id: int) -> float | None:
+        return self._last.get(game_id)
+
+    def first_seen(self, game_id: int, now: float) -> float:
+        """Última actividad; si la partida no tenía (p. ej. tras un reinicio), cuenta desde `now`."""
+        with self._lock:
+            return self._last.setdefault(game_id, now)
+
+    def forget(self, game_id: int) -> None:
+        with self._lock:
+            self._last.pop(game_id, None)
+
+    def retain(self, game_ids: set[int]) -> None:
+        """Descarta las partidas que ya no están en juego (terminadas, o del lobby)."""
+        with self._lock:
+            for game_id in [game_id for game_id in self._last if game_id not in game_ids]:
+                del self._last[game_id]
+
+    def __len__(self) -> int:
+        return len(self._last)
+
+
+game_activity = GameActivity()
+
+
+def request_game_id(scope) -> int | None:
+    """
+    Partida de una request ya ruteada: el path param game_id (o id en las rutas
+    /game/{id}) o, si no, el room_id del query cuando es la room de una partida.
+    """
+    # Los path params quedan como string: FastAPI los convierte solo para el endpoint
+    path_params = scope.get("path_params") or {}
+    game_id = path_params.get("game_id")
+    if game_id is None and getattr(scope.get("route"), "path", "").startswith("/game/"):
+        game_id = path_params.get("id")
+    if game_id is None:
+        room_id = QueryParams(scope.get("query_string", b"")).get("room_id")
+        if room_id != LOBBY_ROOM:
+            game_id = room_id
+    return int(game_id) if game_id is not None and str(game_id).isdigit() else None
+
+
+class GameActivityMiddleware:
+    """
+    ASGI middleware that records every HTTP request aimed at a game as
+    activity of that game, once the router resolved its path params.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            game_id = request_game_id(scope)
+            if game_id is not None:
+                game_activity.touch(game_id)
+
+
+@dataclass
+class ReapReport:
+    """Partidas terminadas y estado en memoria liberado en una corrida."""
+
+    games: int = 0
+    timers: int = 0
+    votes: int = 0
+    event_states: int = 0
+    room_logs: int = 0
+    # Después de la corrida: cuánto sigue en memoria
+    tracked_games: int = 0
+    active_timers: int = 0
+    room_logs_total: int = 0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.games} partidas terminadas (timers={self.timers}, votaciones={self.votes}, "
+            f"eventos={self.event_states}, logs={self.room_logs}); en memoria: "
+            f"{self.tracked_games} partidas, {self.active_timers} timers, {self.room_logs_total} logs"
+        )
+
+
+def release_game_state(game_id: int, report: ReapReport) -> None:
+    """Cancela los timers de la partida y suelta sus votaciones, eventos y log de la room."""
+    for key in [key for key in event_timer.event_deadlines.copy() if key[0] == game_id]:
+        timers.cancel(key)
+        event_timer.event_deadlines.pop(key, None)
+        report.timers += 1
+    released = [state.pop(game_id, None) for state in VOTE_STATE]
+    if any(value is not None for value in released):
+        report.votes += 1
+    # event_states usa el game_id como string
+    if event_state_service.event_states.pop(str(game_id), None) is not None:
+        report.event_states += 1
+    if manager.drop_room_log(game_room(game_id)):
+        report.room_logs += 1
+    game_activity.forget(game_id)
+
+
+class GameReaper:
+    """
+    End started games nobody is playing any more.
+
+    A game is alive while its room has sockets or it receives HTTP
+    requests (see GameActivityMiddleware). Once GAME_IDLE_GRACE seconds
+    pass without either, the game is deleted like a finished one (its
+    cards and players go to the GameCollector) and its timers, votes,
+    event state and room log are released. Every run returns counts of
+    what was freed and what is still held in memory.
+
+    Activity and sockets are only known per process, so the reaper stays
+    off when the room bus is shared: another worker may be serving the game.
+    """
+
+    def __init__(self, session_factory=None, grace: float | None = None):
+        self._session_factory = session_factory or session
+        self.grace = settings.GAME_IDLE_GRACE if grace is None else grace
+        self.reaped_games = 0
+        self.last_report: ReapReport | None = None
+
+    def _started_games(self) -> set[int]:
+        with unit_of_work(self._session_factory()) as db:
+            return set(db.execute(select(Game.id).where(Game.is_started == True)).scalars())
+
+    def _end_game(self, game_id: int) -> bool:
+        with unit_of_work(self._session_factory()) as db:
+            game = db.get(Game, game_id)
+            if game is None or not game.is_started:
+                return False
+            retire_game(db, game_id)
+            db.execute(delete(GameCard).where(GameCard.game_id == game_id))
+            db.execute(delete(PlayerGame).where(PlayerGame.game_id == game_id))
+            db.delete(game)
+        return True
+
+    def _active(self, game_id: int, now: float) -> bool:
+        """Si la partida tuvo actividad mientras se esperaba su lock."""
+        if manager.connections(game_room(game_id)):
+            return True
+        return now - game_activity.first_seen(game_id, now) <= self.grace
+
+    async def reap(self, now: float | None = None) -> ReapReport:
+        """Una corrida: termina las partidas inactivas hace más de `grace` segundos."""
+        now = time.monotonic() if now is None else now
+        report = ReapReport()
+        started = await asyncio.to_thread(self._started_games)
+        game_activity.retain(started)
+        for game_id in sorted(started):
+            if manager.connections(game_room(game_id)):
+                game_activity.touch(game_id, now)
+                continue
+            if now - game_activity.first_seen(game_id, now) <= self.grace:
+                continue
+            # Como una acción de la partida: la que estaba en curso termina antes
+            async with game_locks.hold(game_id):
+                if self._active(game_id, now):
+                    continue
+                if not await asyncio.to_thread(self._end_game, game_id):
+                    continue
+            release_game_state(game_id, report)
+            report.games += 1
+            await manager.broadcast(WSRemoveMessage(payload=game_id), room_id=LOBBY_ROOM)
+        self.reaped_games += report.games
+        report.tracked_games = len(game_activity)
+        report.active_timers = timers.active()
+        report.room_logs_total = len(manager.logs)
+        self.last_report = report
+        return report
+
+    async def run(self) -> None:
+        """Corre cada GAME_REAPER_INTERVAL segundos hasta que se cancela."""
+        if manager.bus.shared:
+            print("Reaper de partidas apagado: con el bus compartido otros procesos atienden las partidas")
+            return
+        while True:
+            await asyncio.sleep(settings.GAME_REAPER_INTERVAL)
+            try:
+                report = await self.reap()
+            except Exception as e:
+                print(f"El reaper de partidas falló: {e}")
+                continue
+            print(f"Reaper de partidas: {report}")
+
+
+game_reaper = GameReaper()
@@ -0,0 +1,128 @@
+"""Digest del lobby: agrupa los cambios de partidas y jugadores de la room "0"."""
+
+import asyncio
+import threading
+from enum import Enum
+
+from pydantic import BaseModel
+
+from src.settings import settings
+
+LOBBY_ROOM = "0"
+
+GAME_UPSERTS = {"gameAdd", "gameUpdate"}
+GAME_REMOVES = {"gameRemove"}
+PLAYER_UPSERTS = {"playerAdd", "playerUpdate"}
+PLAYER_REMOVES = {"playerDelete"}
+LOBBY_EVENTS = GAME_UPSERTS | GAME_REMOVES | PLAYER_UPSERTS | PLAYER_REMOVES
+
+
+class LobbyFilterEnum(str, Enum):
+    all = "all"
+    # Solo partidas sin empezar y con lugares libres
+    open = "open"
+
+
+class DigestSection(BaseModel):
+    upsert: list[dict] = []
+    remove: list[int] = []
+
+
+class LobbyDigestPayload(BaseModel):
+    games: DigestSection
+    players: DigestSection
+
+
+class WSLobbyDigest(BaseModel):
+    type: str = "lobbyDigest"
+    payload: LobbyDigestPayload
+
+
+def game_matches(game: dict, lobby_filter: LobbyFilterEnum) -> bool:
+    if lobby_filter == LobbyFilterEnum.open:
+        return not game["is_started"] and game["current_players"] < game["max_players"]
+    return True
+
+
+def _section(pending: dict[int, dict | None], keep=lambda item: True) -> DigestSection:
+    section = DigestSection()
+    for item_id, item in pending.items():
+        if item is not None and keep(item):
+            section.upsert.append(item)
+        else:
+            section.remove.append(item_id)
+    return section
+
+
+class LobbyDigest:
+    """
+    Coalesce lobby changes for the sockets subscribed with `?digest=`.
+
+    Lobby events are folded into the latest state per game and per player
+    (an update after an add is still one upsert, a remove wins over both)
+    and sent every `WS_LOBBY_DIGEST_WINDOW` seconds as a single
+    `lobbyDigest` frame, serialized once per filter. Under the `open`
+    filter, a game that stops matching is sent as a removal.
+
+    `wrap` turns the digest model into the frame type the connections
+    queue (websocket.OutboundMessage).
+    """
+
+    def __init__(self, wrap):
+        self._wrap = wrap
+        self.subscribers: dict = {}
+        self._games: dict[int, dict | None] = {}
+        self._players: dict[int, dict | None] = {}
+        # Próximo envío programado en el loop de la app (None si no hay ninguno)
+        self._flush_handle = None
+        self._lock = threading.Lock()
+
+    def subscribe(self, connection) -> None:
+        with self._lock:
+            self.subscribers[connection.id] = connection
+
+    def unsubscribe(self, connection) -> None:
+        with self._lock:
+            self.subscribers.pop(connection.id, None)
+
+    def record(self, message_type: str | None, data) -> None:
+        """Suma un evento del lobby al digest pendiente y arma el envío."""
+        if not isinstance(data, dict):
+            return
+        payload = data.get("payload")
+        with self._lock:
+            if not self.subscribers:
+                return
+            if message_type in GAME_UPSERTS:
+                self._games[payload["id"]] = payload
+            elif message_type in GAME_REMOVES:
+                self._games[payload] = None
+            elif message_type in PLAYER_UPSERTS:
+                self._players[payload["id"]] = payload
+            elif message_type in PLAYER_REMOVES:
+                self._players[payload] = None
+            else:
+                return
+            if self._flush_handle is not None:
+                return
+            self._flush_handle = asyncio.get_running_loop().call_later(settings.WS_LOBBY_DIGEST_WINDOW, self.flush)
+
+    def flush(self) -> None:
+        """Envía el digest pendiente a cada suscriptor, serializado una vez por filtro."""
+        with self._lock:
+            games, players = self._games, self._players
+            self._games, self._players = {}, {}
+            self._flush_handle = None
+            subscribers = list(self.subscribers.values())
+        if not games and not players:
+            return
+        players_section = _section(players)
+        digests = {}
+        for connection in subscribers:
+            lobby_filter = connection.digest
+            if lobby_filter not in digests:
+                digests[lobby_filter] = self._wrap(WSLobbyDigest(payload=LobbyDigestPayload(
+                    games=_section(games, lambda game: game_matches(game, lobby_filter)),
+                    players=players_section,
+                )))
+            connection.enqueue(digests[lobby_filter])
@@ -1,16 +1,55 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends
 from sqlalchemy.orm import Session
 from fastapi.responses import HTMLResponse
 from fastapi.middleware.cors import CORSMiddleware
-from src.models.db import engine, Base, get_db
+from src.models.db import engine, Base, create_missing_indexes, get_db, migration_lock
 from src.api import api_router
-from src.websocket import websocket_router
+from src.cards.catalog import migrate_legacy_cards
+from src.websocket import websocket_router, BroadcastBatchMiddleware
 from src.constants import WS_TEST_HTML
+from src.state_checkpoint import state_checkpoint
+from src.game_collector import enable_incremental_vacuum, game_collector, migrate_incremental_vacuum
+from src.game_reaper import GameActivityMiddleware, game_reaper
+from src.timer_scheduler import timers
 from fastapi.staticfiles import StaticFiles
 
 from src.settings import settings
 
-app = FastAPI()
+def migrate_schema() -> None:
+    """Migraciones de las DBs de antes, de a un worker por vez. Bloqueante."""
+    with migration_lock(engine):
+        # DBs de antes del catálogo: nombre/descripción/imagen pasan a card_catalog
+        migrate_legacy_cards(engine)
+        # DBs creadas antes de que los modelos declararan sus índices
+        create_missing_indexes(engine)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await asyncio.to_thread(migrate_schema)
+    if settings.DB_SQLITE_INCREMENTAL_VACUUM:
+        # DB existente: el VACUUM que la pasa a auto_vacuum=INCREMENTAL, una vez y en un solo worker
+        await asyncio.to_thread(migrate_incremental_vacuum, engine)
+    # Ventanas de evento y cuentas regresivas, en este mismo loop
+    timers_task = asyncio.create_task(timers.run())
+    # Retoma timers y votaciones de antes del reinicio y los sigue guardando
+    await state_checkpoint.load()
+    checkpoint_task = asyncio.create_task(state_checkpoint.run())
+    # Borra en segundo plano lo que dejan las partidas terminadas
+    collector_task = asyncio.create_task(game_collector.run())
+    # Termina las partidas empezadas que todos abandonaron
+    reaper_task = asyncio.create_task(game_reaper.run())
+    yield
+    for task in (checkpoint_task, collector_task, reaper_task, timers_task):
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+app = FastAPI(lifespan=lifespan)
 
 origins = ["*"]
 app.add_middleware(
@@ -20,11 +59,15 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(BroadcastBatchMiddleware)
+app.add_middleware(GameActivityMiddleware)
 app.include_router(api_router)
 app.include_router(websocket_router)
 
 app.mount("/static", StaticFiles(directory="src/statics"), name="static")
 
+# Antes de crear las tablas: en una DB nueva alcanza con el pragma, sin VACUUM
+enable_incremental_vacuum(engine, vacuum=False)
 Base.metadata.create_all(bind=engine)
 
 @app.get("/ws_test")
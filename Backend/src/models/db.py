@@ -1,14 +1,94 @@
 """Database file"""
 
-from sqlalchemy import create_engine
+import asyncio
+from contextlib import contextmanager
+from fastapi.concurrency import contextmanager_in_threadpool
+from sqlalchemy import create_engine, event, inspect
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # Call the configuration of project
-from src.settings import settings 
+from src.settings import settings, DbEngineEnum
 
-# Create a motor for SQLite
-engine = create_engine(settings.DB_FILENAME, connect_args={"check_same_thread": False})
+def sqlite_pragmas() -> list[str]:
+	"""Pragmas del perfil de conexión de SQLite configurado en Settings."""
+	return [
+		f"PRAGMA journal_mode={settings.DB_SQLITE_JOURNAL_MODE.value}",
+		f"PRAGMA synchronous={settings.DB_SQLITE_SYNCHRONOUS.value}",
+		f"PRAGMA cache_size={settings.DB_SQLITE_CACHE_SIZE}",
+		f"PRAGMA mmap_size={settings.DB_SQLITE_MMAP_SIZE}",
+		f"PRAGMA temp_store={'MEMORY' if settings.DB_SQLITE_TEMP_STORE_MEMORY else 'DEFAULT'}",
+		f"PRAGMA busy_timeout={settings.DB_SQLITE_BUSY_TIMEOUT}",
+		f"PRAGMA foreign_keys={'ON' if settings.DB_SQLITE_FOREIGN_KEYS else 'OFF'}",
+	]
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+	cursor = dbapi_connection.cursor()
+	for pragma in sqlite_pragmas():
+		cursor.execute(pragma)
+	cursor.close()
+
+
+def begin_before_savepoint(conn, name):
+	"""
+	pysqlite (y aiosqlite) no abren la transacción hasta el primer INSERT/UPDATE.
+	Un SAVEPOINT sin BEGIN previo abriría él mismo la transacción y su RELEASE
+	haría commit de todo, así que el rollback de la request ya no lo desharía.
+	"""
+	dbapi_connection = conn.connection.dbapi_connection
+	# El adaptador de aiosqlite no expone in_transaction; su conexión de aiosqlite sí
+	raw = getattr(dbapi_connection, "_connection", dbapi_connection)
+	if not raw.in_transaction:
+		conn.exec_driver_sql("BEGIN")
+
+
+def configure_sqlite(engine) -> None:
+	"""
+	Aplica el perfil de pragmas a cada conexión nueva de `engine` (para uno async,
+	su sync_engine) y hace que los savepoints queden dentro de la transacción.
+	"""
+	if engine.dialect.name == "sqlite":
+		event.listen(engine, "connect", apply_sqlite_pragmas)
+		event.listen(engine, "savepoint", begin_before_savepoint)
+
+
+def database_url(url: str) -> str:
+	"""URL con el driver del proyecto: PostgreSQL va con psycopg 3 (postgresql:// -> postgresql+psycopg://)."""
+	for prefix in ("postgresql://", "postgres://"):
+		if url.startswith(prefix):
+			return "postgresql+psycopg://" + url[len(prefix):]
+	return url
+
+
+def pool_options(url: str) -> dict:
+	"""Opciones del pool; SQLite en memoria usa un pool propio sin estos parámetros."""
+	if url.startswith("sqlite") and (":memory:" in url or url.rstrip("/").endswith(":")):
+		return {}
+	options = {"pool_size": settings.DB_POOL_SIZE, "max_overflow": settings.DB_MAX_OVERFLOW,
+			   "pool_timeout": settings.DB_POOL_TIMEOUT}
+	if not url.startswith("sqlite"):
+		# Con un servidor las conexiones pueden cortarse del otro lado
+		options.update(pool_pre_ping=settings.DB_POOL_PRE_PING, pool_recycle=settings.DB_POOL_RECYCLE)
+	return options
+
+
+def engine_options(url: str) -> dict:
+	"""Argumentos de create_engine (y create_async_engine) según el backend de `url`."""
+	if url.startswith("sqlite"):
+		connect_args = {"check_same_thread": False}
+	else:
+		connect_args = {}
+		if settings.DB_STATEMENT_TIMEOUT:
+			connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT}"
+	return {"connect_args": connect_args, **pool_options(url)}
+
+
+# Create a motor for SQLite (or PostgreSQL)
+engine = create_engine(database_url(settings.DB_FILENAME), **engine_options(settings.DB_FILENAME))
+configure_sqlite(engine)
 
 # Create a sessionmaker
 session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -16,11 +96,141 @@ session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Create a declarative database
 Base = declarative_base()
 
-# Method for 
-def get_db():
-	db = session()
+
+def create_missing_indexes(bind) -> list[str]:
+	"""
+	Crea los índices declarados en los modelos que todavía no existen en la DB.
+	create_all solo los crea junto con tablas nuevas, así que una DB de antes
+	los recibe acá al arrancar. Idempotente; retorna los nombres creados.
+	"""
+	created = []
+	inspector = inspect(bind)
+	for table in Base.metadata.sorted_tables:
+		if not inspector.has_table(table.name):
+			continue
+		existing = {index["name"] for index in inspector.get_indexes(table.name)}
+		for index in table.indexes:
+			if index.name not in existing:
+				index.create(bind)
+				created.append(index.name)
+	return created
+
+
+@contextmanager
+def migration_lock(bind, wait: bool = True):
+	"""
+	Lock de archivo junto a la DB de SQLite para las migraciones del arranque:
+	con varios workers las corre uno por vez. Entrega False si otro worker lo
+	tiene y no se quiere esperar (`wait=False`). Sin archivo (en memoria, o
+	PostgreSQL) no hay nada que coordinar acá: entrega True.
+	"""
+	path = bind.url.database
+	if bind.dialect.name != "sqlite" or not path or path == ":memory:":
+		yield True
+		return
+	import fcntl  # solo Unix, como el bus de rooms de varios workers
+
+	with open(f"{path}.migrate-lock", "w") as lock_file:
+		try:
+			fcntl.flock(lock_file, fcntl.LOCK_EX if wait else fcntl.LOCK_EX | fcntl.LOCK_NB)
+		except BlockingIOError:
+			yield False
+			return
+		yield True
+
+
+@contextmanager
+def unit_of_work(db: Session):
+	"""
+	Transacción de una request: los servicios solo hacen flush y acá se hace
+	un único commit al terminar el endpoint, o un único rollback si falló
+	(también con HTTPException). El progreso parcial que sí se quiere conservar
+	va dentro de un savepoint (db.begin_nested()).
+	"""
 	try:
 		yield db # Acá básicamente lo que hacemos es dejar a la base de datos para que un endpoint pueda usarla
+		db.commit()
+	except Exception:
+		db.rollback()
+		raise
 	finally:
 		db.close()
 
+# Method for 
+def get_db():
+	with unit_of_work(session()) as db:
+		yield db
+
+
+def async_url(url: str) -> str:
+	"""
+	URL con el driver async: sqlite:///x.db -> sqlite+aiosqlite:///x.db.
+	psycopg 3 es sync y async a la vez, así que PostgreSQL usa la misma URL.
+	"""
+	if url.startswith("sqlite://"):
+		return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+	return database_url(url)
+
+
+# Engine async (aiosqlite o psycopg), solo si DB_ENGINE=async. expire_on_commit=False:
+# los objetos devueltos se leen después fuera de la sesión sin volver a la DB
+async_engine = None
+async_session = None
+if settings.DB_ENGINE == DbEngineEnum.async_:
+	from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # requiere aiosqlite (o psycopg)
+
+	async_engine = create_async_engine(async_url(settings.DB_FILENAME), **engine_options(settings.DB_FILENAME))
+	configure_sqlite(async_engine.sync_engine)
+	async_session = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+# Lo que recibe un endpoint que depende de get_async_db
+AnySession = Session | AsyncSession
+
+
+async def get_async_db():
+	"""
+	Sesión para los endpoints async de juego: AsyncSession si DB_ENGINE=async,
+	o la sesión sync de siempre (la que usan los tests). Usar con run_db.
+	Igual que get_db, hace un único commit (o rollback) al final de la request.
+	"""
+	if async_session is None:
+		# El commit de la sesión sync también va en el threadpool, fuera del loop
+		async with contextmanager_in_threadpool(unit_of_work(session())) as db:
+			yield db
+		return
+	async with async_session() as db:
+		try:
+			yield db
+			await db.commit()
+		except Exception:
+			await db.rollback()
+			raise
+
+
+async def run_db(db, fn, *args, **kwargs):
+	"""
+	Corre `fn(session, *args, **kwargs)`, código ORM sync de los servicios.
+	Con una AsyncSession va por `run_sync`: las queries se hacen con aiosqlite
+	y el event loop sigue atendiendo WebSockets y timers mientras tanto. Con
+	la sesión sync corre en un thread, así que esperar el lock de escritura de
+	SQLite (busy_timeout) tampoco frena el loop.
+	"""
+	if isinstance(db, Session):
+		return await asyncio.to_thread(fn, db, *args, **kwargs)
+	return await db.run_sync(fn, *args, **kwargs)
+
+
+async def commit_db(db: AnySession) -> None:
+	"""
+	Commit de la unit of work apenas termina el trabajo de base de la request,
+	antes de los broadcasts y demás awaits: así el lock de escritura de SQLite
+	no queda tomado mientras tanto y el commit del final de la request queda
+	vacío. Los objetos ya cargados no se expiran: se usan para la respuesta.
+	"""
+	if isinstance(db, Session):
+		db.expire_on_commit = False
+		await asyncio.to_thread(db.commit)
+	else:
+		await db.commit()
+
@@ -4,7 +4,8 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from src.player.models import Player
 from src.player.services import PlayerService
-from src.models.db import get_db
+from src.game_lock import game_of_player, locked_db
+from src.models.db import get_db, run_db
 from src.player.models import RolEnum
 from src.player.schemas import (
     PlayerIn, PlayerOut, PlayerResponse,
@@ -21,6 +22,9 @@ from src.playerCard.models import player_card_table
 
 player_router = APIRouter()
 
+# Los cambios a un jugador son parte de su partida, si ya está en una
+get_player_game_db = locked_db(lambda db, params: game_of_player(db, params.get("id")))
+
 
 @player_router.get(path="/")
 async def retrieve_players(
@@ -112,7 +116,7 @@ async def create_player(
         404 -> When there is an error creating the player
     """
     try:
-        created_player = PlayerService(db).create(player_info.to_dto())
+        created_player = await run_db(db, lambda db: PlayerService(db).create(player_info.to_dto()))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -122,7 +126,7 @@ async def create_player(
     ws_message = WSAddMessage(
         payload=db_player_2_player_out(db_player=created_player)
     )
-    await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+    await manager.broadcast(ws_message, room_id=room_id)
 
     return PlayerResponse(id=created_player.id,
                           message="El jugador se creó correctamente.")
@@ -131,7 +135,7 @@ async def create_player(
 @player_router.delete(path="/{id}")
 async def delete_player(
     id: int, 
-    db=Depends(get_db),
+    db=Depends(get_player_game_db),
     room_id: str = Query("0", description="ID de la sala, por defecto 0")) -> PlayerResponse:
     """
     Delete player with id.
@@ -152,7 +156,7 @@ async def delete_player(
         404 -> When player with id is not found
     """
     try:
-        deleted_id = PlayerService(db).delete(id=id)
+        deleted_id = await run_db(db, lambda db: PlayerService(db).delete(id=id))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -160,7 +164,7 @@ async def delete_player(
         )
 
     ws_message = WSRemoveMessage(payload=deleted_id)
-    await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+    await manager.broadcast(ws_message, room_id=room_id)
 
     return PlayerResponse(id=deleted_id, message="El jugador se eliminó correctamente.")
 
@@ -168,7 +172,7 @@ async def delete_player(
 async def update_player(
     id: int, 
     player_info: PlayerIn, 
-    db=Depends(get_db),
+    db=Depends(get_player_game_db),
     room_id: str = Query("0", description="ID de la sala, por defecto 0")) -> PlayerOut:
     """
     Update an existing player
@@ -192,7 +196,7 @@ async def update_player(
         400 -> When there is an error updating the player
     """
     try:
-        updated_player = PlayerService(db).update(id=id, player_dto=player_info.to_dto())
+        updated_player = await run_db(db, lambda db: PlayerService(db).update(id=id, player_dto=player_info.to_dto()))
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -205,7 +209,7 @@ async def update_player(
         )
 
     ws_message = WSUpdateMessage(payload=db_player_2_player_out(db_player=updated_player))
-    await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+    await manager.broadcast(ws_message, room_id=room_id)
 
     return updated_player
 
@@ -25,7 +25,7 @@ class Player(Base):
     is_Social_Disgrace = Column(Boolean, nullable=False)
     is_Your_Turn = Column(Boolean, nullable=False)
     is_Owner = Column(Boolean, nullable=False)
-    rol = Column(SqlEnum(RolEnum), nullable=False, default=RolEnum.innocent)
+    rol = Column(SqlEnum(RolEnum, native_enum=False), nullable=False, default=RolEnum.innocent)
     
     sets_detective: Mapped[list["DetectiveSet"]] = relationship("DetectiveSet", back_populates="owner")
     
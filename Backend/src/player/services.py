@@ -52,7 +52,6 @@ class PlayerService:
         )
         self._db.add(new_player)
         self._db.flush()
-        self._db.commit()
         return new_player
 
     def update(self, id: int, player_dto: PlayerDTO) -> Player:
@@ -67,7 +66,6 @@ class PlayerService:
         db_player.is_Owner = player_dto.is_Owner
         db_player.rol = player_dto.rol    
         self._db.flush()
-        self._db.commit()
         return db_player
 
     def delete(self, id: int) -> int:
@@ -76,7 +74,6 @@ class PlayerService:
             raise ValueError(f"Player with id {id} does not exist")
         self._db.delete(db_player)
         self._db.flush()
-        self._db.commit()
         return id
 
     def get_players_by_game(self, game_id: int) -> List[Player]:
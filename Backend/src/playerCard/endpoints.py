@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
 from typing import List
 
-from src.models.db import get_db
+from src.game_lock import game_of_player, locked_db
+from src.models.db import AnySession, get_async_db, run_db
 from src.playerCard.services import PlayerCardService
 from src.playerCard.schemas import CardDTO, PlayerDTO, PlayerCardTransferredDTO, WSAddMessage, WSRemoveMessage, WSUpdateMessage
 from src.player.models import Player
@@ -11,11 +11,16 @@ from src.websocket import manager
 
 playerCard_router = APIRouter()
 
+# Las cartas se mueven entre manos de la misma partida: la del jugador del path
+get_player_game_db = locked_db(
+    lambda db, params: game_of_player(db, params.get("player_id", params.get("old_player_id"))),
+    get_session=get_async_db,
+)
+
 
 @playerCard_router.get("/{player_id}/cards", response_model=List[CardDTO])
-def get_player_cards(player_id: int, db: Session = Depends(get_db)):
-    service = PlayerCardService(db)
-    cards = service.get_player_cards(player_id)
+async def get_player_cards(player_id: int, db: AnySession = Depends(get_async_db)):
+    cards = await run_db(db, lambda db: PlayerCardService(db).get_player_cards(player_id))
     if cards is None:
         raise HTTPException(status_code=404, detail="Player not found")
     return cards
@@ -25,17 +30,17 @@ def get_player_cards(player_id: int, db: Session = Depends(get_db)):
 async def assign_card(
     player_id: int,
     card_id: int,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_player_game_db),
     room_id: str = Query("0", description="ID de la sala, por defecto 0"),
 ):
-    service = PlayerCardService(db)
-    success = service.assign_card_to_player(player_id, card_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Player or Card not found")
+    def assign(db):
+        if not PlayerCardService(db).assign_card_to_player(player_id, card_id):
+            raise HTTPException(status_code=404, detail="Player or Card not found")
+        card = db.query(Card).filter(Card.id == card_id).first()
+        return CardDTO.model_validate(card)
 
-    card = db.query(Card).filter(Card.id == card_id).first()
-    ws_message = WSAddMessage(payload=CardDTO.model_validate(card))
-    await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+    ws_message = WSAddMessage(payload=await run_db(db, assign))
+    await manager.broadcast(ws_message, room_id=room_id)
 
     return {"message": "Card assigned successfully"}
 
@@ -44,47 +49,44 @@ async def transfer_card(
     old_player_id: int,
     card_id: int,
     new_player_id: int,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_player_game_db),
     room_id: str = Query("0", description="ID de la sala, por defecto 0"),
 ):
-    service = PlayerCardService(db)
-
-    if not service.is_card_assigned_to_player(old_player_id, card_id):
-        raise HTTPException(
-            status_code=400,
-            detail=f"La carta {card_id} no pertenece al jugador {old_player_id}"
-        )
+    def transfer(db):
+        service = PlayerCardService(db)
 
-    removed = service.remove_card_from_player(old_player_id, card_id)
-    if not removed:
-        raise HTTPException(status_code=404, detail="Error al remover la carta del jugador anterior")
+        if not service.is_card_assigned_to_player(old_player_id, card_id):
+            raise HTTPException(
+                status_code=400,
+                detail=f"La carta {card_id} no pertenece al jugador {old_player_id}"
+            )
 
-    assigned = service.assign_card_to_player(new_player_id, card_id)
-    if not assigned:
-        raise HTTPException(status_code=404, detail="Error al asignar la carta al nuevo jugador")
+        removed = service.remove_card_from_player(old_player_id, card_id)
+        if not removed:
+            raise HTTPException(status_code=404, detail="Error al remover la carta del jugador anterior")
 
-    card = db.query(Card).filter(Card.id == card_id).first()
-    if not card:
-        raise HTTPException(status_code=404, detail="Carta no encontrada")
+        assigned = service.assign_card_to_player(new_player_id, card_id)
+        if not assigned:
+            raise HTTPException(status_code=404, detail="Error al asignar la carta al nuevo jugador")
 
-    old_player = db.query(Player).filter(Player.id == old_player_id).first()
-    new_player = db.query(Player).filter(Player.id == new_player_id).first()
+        card = db.query(Card).filter(Card.id == card_id).first()
+        if not card:
+            raise HTTPException(status_code=404, detail="Carta no encontrada")
 
-    if not old_player or not new_player:
-        raise HTTPException(status_code=404, detail="Jugador no encontrado")
+        old_player = db.query(Player).filter(Player.id == old_player_id).first()
+        new_player = db.query(Player).filter(Player.id == new_player_id).first()
 
-    card_dto = CardDTO.model_validate(card)
-    old_player_dto = PlayerDTO.model_validate(old_player)
-    new_player_dto = PlayerDTO.model_validate(new_player)
+        if not old_player or not new_player:
+            raise HTTPException(status_code=404, detail="Jugador no encontrado")
 
-    ws_message = WSUpdateMessage(
-        payload=PlayerCardTransferredDTO(
-            card=card_dto,
-            old_player=old_player_dto,
-            new_player=new_player_dto,
+        return PlayerCardTransferredDTO(
+            card=CardDTO.model_validate(card),
+            old_player=PlayerDTO.model_validate(old_player),
+            new_player=PlayerDTO.model_validate(new_player),
         )
-    )
-    await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+
+    ws_message = WSUpdateMessage(payload=await run_db(db, transfer))
+    await manager.broadcast(ws_message, room_id=room_id)
 
     return {"message": f"Card {card_id} transferred from {old_player_id} to {new_player_id}"}
 
@@ -93,16 +95,16 @@ async def transfer_card(
 async def remove_card(
     player_id: int,
     card_id: int,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_player_game_db),
     room_id: str = Query("0", description="ID de la sala, por defecto 0"),
 ):
-    service = PlayerCardService(db)
-    success = service.remove_card_from_player(player_id, card_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="Player or Card not found")
-
-    card = db.query(Card).filter(Card.id == card_id).first()
-    ws_message = WSRemoveMessage(payload=CardDTO.model_validate(card))
-    await manager.broadcast(ws_message.model_dump_json(), room_id=room_id)
+    def remove(db):
+        if not PlayerCardService(db).remove_card_from_player(player_id, card_id):
+            raise HTTPException(status_code=404, detail="Player or Card not found")
+        card = db.query(Card).filter(Card.id == card_id).first()
+        return CardDTO.model_validate(card)
+
+    ws_message = WSRemoveMessage(payload=await run_db(db, remove))
+    await manager.broadcast(ws_message, room_id=room_id)
 
     return {"message": "Card removed successfully"}
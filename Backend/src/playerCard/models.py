@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Table
+from sqlalchemy import Column, Integer, ForeignKey, Index, Table
 from sqlalchemy.orm import relationship
 from src.models.db import Base
 from src.player.models import Player
@@ -8,7 +8,9 @@ player_card_table = Table(
     "player_card",
     Base.metadata,
     Column("player_id", Integer, ForeignKey("player.id"), primary_key=True),
-    Column("card_id", Integer, ForeignKey("cards.id"), primary_key=True)
+    Column("card_id", Integer, ForeignKey("cards.id"), primary_key=True),
+    # Dueño de una carta: la PK (player_id, card_id) no sirve para buscar por card_id
+    Index("ix_player_card_card_id", "card_id", "player_id"),
 )
 
 Player.cards = relationship("Card", secondary=player_card_table, back_populates="players")
@@ -32,7 +32,7 @@ class PlayerCardService:
             return False
         if card not in player.cards:
             player.cards.append(card)
-            self.db.commit()
+            self.db.flush()
         return True
 
     def remove_card_from_player(self, player_id: int, card_id: int):
@@ -42,7 +42,7 @@ class PlayerCardService:
             return False
         if card in player.cards:
             player.cards.remove(card)
-            self.db.commit()
+            self.db.flush()
         return True
     
     def is_card_assigned_to_player(self, player_id: int, card_id: int) -> bool:
@@ -0,0 +1,169 @@
+"""Room bus: reparte los broadcasts de una room entre procesos."""
+
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from typing import Callable
+
+from src.settings import settings, RoomBusEnum
+
+# Tiempo durante el cual se reutiliza la lista de peers antes de volver a escanear
+PEER_REFRESH_SECONDS = 1.0
+
+
+class LocalRoomBus:
+    """
+    In-process bus: a publish is delivered straight to this worker's sockets.
+    """
+
+    shared = False
+    dropped = 0
+
+    def __init__(self):
+        self._deliver: Callable | None = None
+
+    def bind(self, deliver: Callable) -> None:
+        self._deliver = deliver
+
+    def ensure_started(self) -> None:
+        pass
+
+    def publish(self, room_id: str, message, player_id: int | None = None) -> None:
+        self._deliver(room_id, message, player_id)
+
+    def close(self) -> None:
+        pass
+
+
+class UnixSocketRoomBus:
+    """
+    Multi-process bus over Unix-domain datagram sockets, with no broker.
+
+    Every worker binds its own socket inside `path`. A publish is delivered
+    locally and sent as one datagram to every other socket in the directory;
+    each receiving worker then fans it out to its own connections. Sockets
+    left behind by dead workers are removed the first time a send to them
+    is refused. A batch larger than WS_BUS_MAX_DATAGRAM is sent message by
+    message; whatever still cannot be sent is counted in `dropped`.
+    """
+
+    shared = True
+
+    def __init__(self, path: str | None = None):
+        self.path = path or settings.WS_BUS_PATH or os.path.join(tempfile.gettempdir(), "dotc-room-bus")
+        self._deliver: Callable | None = None
+        self._sock: socket.socket | None = None
+        self._address: str | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._peers: list[str] = []
+        self._peers_scanned_at = 0.0
+        self._setup_lock = threading.Lock()
+        self.dropped = 0
+
+    def bind(self, deliver: Callable) -> None:
+        self._deliver = deliver
+
+    def ensure_started(self) -> None:
+        """Crea el socket propio y lo registra en el event loop actual."""
+        with self._setup_lock:
+            if self._sock is not None:
+                return
+            os.makedirs(self.path, exist_ok=True)
+            self._address = os.path.join(self.path, f"{os.getpid()}-{uuid.uuid4().hex[:8]}.sock")
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self._sock.setblocking(False)
+            self._sock.bind(self._address)
+            self._loop = asyncio.get_running_loop()
+            self._loop.add_reader(self._sock.fileno(), self._on_readable)
+
+    def publish(self, room_id: str, message, player_id: int | None = None) -> None:
+        self.ensure_started()
+        self._deliver(room_id, message, player_id)
+        header = {"room": room_id} if player_id is None else {"room": room_id, "player": player_id}
+        datagrams = self._datagrams(json.dumps(header).encode() + b"\0", message)
+        # Copia: _forget saca peers de la lista mientras se recorre
+        for peer in list(self._live_peers()):
+            for datagram in datagrams:
+                if datagram is None:
+                    self.dropped += 1
+                    continue
+                try:
+                    self._sock.sendto(datagram, peer)
+                except (ConnectionRefusedError, FileNotFoundError):
+                    # Worker muerto: su socket quedó huérfano
+                    self._forget(peer)
+                    break
+                except OSError:
+                    # Buffer lleno (BlockingIOError) u otro error del socket
+                    self.dropped += 1
+
+    def _datagrams(self, header: bytes, message) -> list[bytes | None]:
+        """
+        Datagramas que llevan `message`. Un batch que no entra en
+        WS_BUS_MAX_DATAGRAM se parte en sus mensajes; un mensaje suelto que
+        tampoco entra queda como None (se cuenta como descartado).
+        """
+        datagram = header + message.text().encode()
+        if len(datagram) <= settings.WS_BUS_MAX_DATAGRAM:
+            return [datagram]
+        parts = getattr(message, "messages", None)
+        if not parts:
+            return [None]
+        return [datagram for part in parts for datagram in self._datagrams(header, part)]
+
+    def _live_peers(self) -> list[str]:
+        now = time.monotonic()
+        if now - self._peers_scanned_at > PEER_REFRESH_SECONDS:
+            self._peers = [
+                os.path.join(self.path, name)
+                for name in os.listdir(self.path)
+                if name.endswith(".sock") and os.path.join(self.path, name) != self._address
+            ]
+            self._peers_scanned_at = now
+        return self._peers
+
+    def _forget(self, peer: str) -> None:
+        try:
+            os.unlink(peer)
+        except OSError:
+            pass
+        if peer in self._peers:
+            self._peers.remove(peer)
+
+    def _on_readable(self) -> None:
+        while True:
+            try:
+                datagram = self._sock.recv(settings.WS_BUS_MAX_DATAGRAM)
+            except (BlockingIOError, InterruptedError):
+                return
+            header, _, body = datagram.partition(b"\0")
+            try:
+                header = json.loads(header)
+                room_id = header["room"]
+            except (ValueError, KeyError):
+                continue
+            self._deliver(room_id, body.decode(), header.get("player"))
+
+    def close(self) -> None:
+        if self._sock is None:
+            return
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.remove_reader(self._sock.fileno())
+        self._sock.close()
+        self._sock = None
+        self._loop = None
+        self._forget(self._address)
+
+
+def create_room_bus(backend: str | None = None):
+    backend = backend or settings.WS_BUS_BACKEND
+    if backend == RoomBusEnum.local:
+        return LocalRoomBus()
+    if backend == RoomBusEnum.unix:
+        return UnixSocketRoomBus()
+    raise ValueError(f"Room bus desconocido: {backend}")
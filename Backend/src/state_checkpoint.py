@@ -0,0 +1,121 @@
+"""Checkpoint del estado en memoria de las partidas, para sobrevivir reinicios."""
+
+import asyncio
+import json
+import os
+import time
+
+from src.settings import settings
+from src import event_timer
+from src.cards.logicEventCards import point_suspicions_service as votes
+from src.cards.logicEventCards.notSoFast import event_state_service
+
+CHECKPOINT_VERSION = 1
+
+
+def snapshot() -> dict:
+    """
+    Estado efímero actual: ventanas de "Not so fast" con su deadline (epoch),
+    estados de los eventos y votaciones de "Point your suspicions" en curso.
+    """
+    # time.monotonic() arranca de nuevo con el proceso: se guarda la hora de pared
+    offset = time.time() - time.monotonic()
+    return {
+        "version": CHECKPOINT_VERSION,
+        "events": [
+            {"game_id": game_id, "room_id": room_id, "deadline": round(deadline + offset, 3)}
+            for (game_id, room_id), deadline in event_timer.event_deadlines.copy().items()
+        ],
+        "event_states": event_state_service.event_states.copy(),
+        "votes": {
+            "received": votes.Votes_received.copy(),
+            "ended": votes.End_votation.copy(),
+            "order": votes.Order_vote.copy(),
+            "current_index": votes.Current_voter_index.copy(),
+        },
+    }
+
+
+def _int_keys(data: dict) -> dict:
+    # JSON guarda las claves como string; las votaciones usan el game_id entero
+    return {int(key): value for key, value in data.items()}
+
+
+def _replace(target: dict, values: dict) -> None:
+    # En el lugar: los servicios referencian estos dicts como globales
+    target.clear()
+    target.update(values)
+
+
+async def restore(state: dict) -> None:
+    """Vuelve a cargar un snapshot y retoma las ventanas de evento pendientes."""
+    if state.get("version") != CHECKPOINT_VERSION:
+        return
+    _replace(event_state_service.event_states, state.get("event_states", {}))
+    saved_votes = state.get("votes", {})
+    _replace(votes.Votes_received, {
+        game_id: [tuple(vote) for vote in received]
+        for game_id, received in _int_keys(saved_votes.get("received", {})).items()
+    })
+    _replace(votes.End_votation, _int_keys(saved_votes.get("ended", {})))
+    _replace(votes.Order_vote, _int_keys(saved_votes.get("order", {})))
+    _replace(votes.Current_voter_index, _int_keys(saved_votes.get("current_index", {})))
+    for event in state.get("events", []):
+        remaining = event["deadline"] - time.time()
+        await event_timer.resume_event(event["game_id"], event["room_id"], remaining)
+
+
+class StateCheckpoint:
+    """
+    Periodically write `snapshot()` to a JSON file and load it on startup.
+
+    Writes are atomic (temporary file plus `os.replace`) and skipped when
+    nothing changed since the last one, so an idle server does no I/O.
+    Event windows are stored with a wall-clock deadline: after a restart
+    they resume with whatever time they had left, or end right away.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path or settings.STATE_CHECKPOINT_PATH
+        self._last_written: str | None = None
+
+    def save(self) -> bool:
+        """Escribe el checkpoint si cambió. Retorna True si escribió."""
+        data = json.dumps(snapshot())
+        if data == self._last_written:
+            return False
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+        self._last_written = data
+        return True
+
+    async def load(self) -> bool:
+        """Restaura el checkpoint del archivo, si existe. Retorna True si había uno."""
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return False
+        except ValueError as e:
+            print(f"Checkpoint de estado ilegible ({self.path}): {e}")
+            return False
+        await restore(state)
+        return True
+
+    async def run(self) -> None:
+        """Guarda cada STATE_CHECKPOINT_INTERVAL segundos hasta que se cancela."""
+        try:
+            while True:
+                await asyncio.sleep(settings.STATE_CHECKPOINT_INTERVAL)
+                try:
+                    self.save()
+                except OSError as e:
+                    print(f"No se pudo guardar el checkpoint de estado: {e}")
+        finally:
+            # Apagado ordenado: lo último que cambió también queda guardado
+            self.save()
+
+
+state_checkpoint = StateCheckpoint()
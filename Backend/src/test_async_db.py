@@ -0,0 +1,285 @@
+import asyncio
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.cards.models import Card
+from src.game.models import Game
+from src.gameCard.models import CardPosition, GameCard
+from src.gameLogic.advance_turn_service import advance_turn
+from src.gamePlayer.models import PlayerGame
+from src.main import app
+from src.models.db import Base, async_url, get_async_db, run_db
+from src.player.models import Player
+
+
+@pytest.fixture
+def databases(tmp_path):
+    """Una DB en archivo con un engine sync (para cargar datos) y uno async (aiosqlite)."""
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(bind=sync_engine)
+    async_engine = create_async_engine(async_url(url))
+    yield sessionmaker(bind=sync_engine), async_sessionmaker(async_engine, expire_on_commit=False)
+    asyncio.run(async_engine.dispose())
+    sync_engine.dispose()
+
+
+def seed_game(sync_session) -> tuple[int, list[int]]:
+    with sync_session() as db:
+        game = Game(name="Async Game")
+        players = [
+            Player(name=f"Jugador {i}", birthdate=date(1990, 1, i), avatar="ruta",
+                   is_Social_Disgrace=False, is_Your_Turn=False, is_Owner=False, rol="innocent")
+            for i in range(1, 4)
+        ]
+        db.add(game)
+        db.add_all(players)
+        db.commit()
+        db.add_all([
+            PlayerGame(game_id=game.id, player_id=p.id, position_id_player=pos)
+            for pos, p in enumerate(players, start=1)
+        ])
+        card = Card(name="card", description="d", image_url="img", is_murderes_escapes=False)
+        db.add(card)
+        db.commit()
+        db.add(GameCard(game_id=game.id, card_id=card.id, card_position=CardPosition.MAZO_ROBO, card_order=1))
+        game.turn_id_player = players[0].id
+        db.commit()
+        return game.id, [p.id for p in players]
+
+
+def test_async_url_switches_sqlite_driver():
+    assert async_url("sqlite:///./db.sqlite") == "sqlite+aiosqlite:///./db.sqlite"
+    assert async_url("postgresql://host/db") == "postgresql+psycopg://host/db"
+
+
+def test_run_db_runs_sync_services_on_an_async_session(databases):
+    sync_session, async_session = databases
+    game_id, player_ids = seed_game(sync_session)
+
+    async def scenario():
+        async with async_session() as db:
+            result = await run_db(db, advance_turn, game_id)
+            await db.commit()
+            return result
+
+    assert asyncio.run(scenario()) == player_ids[1]
+    with sync_session() as db:
+        assert db.get(Game, game_id).turn_id_player == player_ids[1]
+
+
+def test_async_session_does_not_block_the_event_loop(databases):
+    sync_session, async_session = databases
+    game_id, _ = seed_game(sync_session)
+
+    async def ticks_during(query):
+        ticks = 0
+        done = False
+
+        async def ticker():
+            nonlocal ticks
+            while not done:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(ticker())
+        await asyncio.sleep(0)
+        ticks = 0
+        await query()
+        done = True
+        await task
+        return ticks
+
+    async def scenario():
+        async with async_session() as db:
+            on_async = await ticks_during(lambda: run_db(db, advance_turn, game_id))
+        with sync_session() as db:
+            on_sync = await ticks_during(lambda: run_db(db, advance_turn, game_id))
+        return on_async, on_sync
+
+    on_async, on_sync = asyncio.run(scenario())
+    # Con aiosqlite, o con la sesión sync en un thread, el loop sigue corriendo mientras se espera a la DB
+    assert on_async > 0
+    assert on_sync > 0
+
+
+def test_endpoints_work_with_an_async_session(databases):
+    sync_session, async_session = databases
+    game_id, _ = seed_game(sync_session)
+
+    async def override_get_async_db():
+        async with async_session() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    try:
+        client = TestClient(app)
+        response = client.get(f"/game-cards/{game_id}/cards")
+        pass_turn = client.post(f"/game/{game_id}/9999/pass")
+    finally:
+        app.dependency_overrides.pop(get_async_db, None)
+
+    assert response.status_code == 200, response.text
+    assert [c["card_position"] for c in response.json()] == ["mazo_robo"]
+    assert pass_turn.status_code == 404
+    assert pass_turn.json()["detail"] == "Player not in game"
+
+
+def test_get_async_db_falls_back_to_the_sync_session():
+    async def scenario():
+        with patch("src.models.db.async_session", None):
+            gen = get_async_db()
+            db = await gen.__anext__()
+            assert isinstance(db, Session)
+            with pytest.raises(StopAsyncIteration):
+                await gen.__anext__()
+
+    asyncio.run(scenario())
+
+
+def test_sync_writers_do_not_stall_async_sessions(tmp_path):
+    """
+    Descartes con AsyncSession y altas de jugadores con la sesión sync de get_db,
+    a la vez y sobre la misma DB (cada una con su engine, como en producción):
+    ningún writer sync espera el lock de SQLite en el event loop.
+    """
+    import httpx
+    import time
+    from src.gameLogic.start_game import start_game
+    from src.models.db import configure_sqlite, engine_options, get_db, unit_of_work
+    from src.playerCard.services import PlayerCardService
+
+    url = f"sqlite:///{tmp_path / 'mixed.db'}"
+    sync_engine = create_engine(url, **engine_options(url))
+    configure_sqlite(sync_engine)
+    Base.metadata.create_all(bind=sync_engine)
+    async_engine = create_async_engine(async_url(url), **engine_options(url))
+    configure_sqlite(async_engine.sync_engine)
+    sync_session = sessionmaker(bind=sync_engine, autoflush=False)
+    async_session = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    with unit_of_work(sync_session()) as db:
+        game = Game(name="Mixta", max_players=6, min_players=2)
+        db.add(game)
+        db.flush()
+        for i in range(4):
+            player = Player(name=f"p{i}", avatar="a", birthdate=date(1990, 1, i + 1), is_Social_Disgrace=False,
+                            is_Your_Turn=False, is_Owner=False, rol="innocent")
+            db.add(player)
+            db.flush()
+            db.add(PlayerGame(game_id=game.id, player_id=player.id))
+        db.flush()
+        start_game(db, game.id)
+        game_id = game.id
+        discards = [
+            (player_id, next(card.id for card in PlayerCardService(db).get_player_cards(player_id)
+                             if not card.name.startswith("secret_")))
+            for (player_id,) in db.query(PlayerGame.player_id).filter(PlayerGame.game_id == game_id)
+        ]
+
+    def override_get_db():
+        with unit_of_work(sync_session()) as db:
+            yield db
+
+    async def override_get_async_db():
+        async with async_session() as db:
+            try:
+                yield db
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+
+    new_player = {"name": "Nuevo", "birthdate": "1990-01-01", "avatar": "http://example.com/a.png",
+                  "is_Social_Disgrace": False, "is_Your_Turn": False, "is_Owner": False}
+
+    async def scenario():
+        lag = 0.0
+        done = False
+
+        async def watch_loop():
+            nonlocal lag
+            while not done:
+                started = time.perf_counter()
+                await asyncio.sleep(0.001)
+                lag = max(lag, time.perf_counter() - started - 0.001)
+
+        watcher = asyncio.create_task(watch_loop())
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            started = time.perf_counter()
+            responses = await asyncio.gather(
+                *(client.put(f"/game/{game_id}/{player_id}/{card_id}/discard") for player_id, card_id in discards),
+                *(client.post("/player/", json=new_player) for _ in range(4)),
+            )
+            elapsed = time.perf_counter() - started
+        done = True
+        await watcher
+        return responses, elapsed, lag
+
+    previous = dict(app.dependency_overrides)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    try:
+        responses, elapsed, lag = asyncio.run(scenario())
+    finally:
+        app.dependency_overrides.clear()
+        app.dependency_overrides.update(previous)
+        asyncio.run(async_engine.dispose())
+        sync_engine.dispose()
+
+    assert [r.status_code for r in responses] == [200] * 4 + [201] * 4, [r.text for r in responses]
+    # Antes un writer sync esperaba el busy_timeout (5 s) en el loop y el commit async no podía correr
+    assert elapsed < 2
+    assert lag < 0.5
+
+
+def test_sync_session_endpoints_stay_on_the_app_loop(databases):
+    """
+    Los endpoints con la sesión sync corren en el loop de la app y solo el
+    trabajo de base va a un thread: el lock de la partida y los broadcasts
+    se usan desde el loop al que pertenecen.
+    """
+    import httpx
+    from src.models.db import get_db
+    from src.websocket import manager
+
+    sync_session, _ = databases
+    game_id, _ = seed_game(sync_session)
+    loops = []
+
+    async def broadcast(message, room_id="0"):
+        loops.append(asyncio.get_running_loop())
+
+    def override_get_db():
+        db = sync_session()
+        try:
+            yield db
+            db.commit()
+        finally:
+            db.close()
+
+    new_player = {"name": "Nuevo", "birthdate": "1990-01-01", "avatar": "http://example.com/a.png",
+                  "is_Social_Disgrace": False, "is_Your_Turn": False, "is_Owner": False}
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            created = await client.post("/player/", json=new_player)
+            joined = await client.post(f"/game/{game_id}/{created.json()['id']}", json={"position_id_player": 4})
+        return asyncio.get_running_loop(), created, joined
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        with patch.object(manager, "broadcast", side_effect=broadcast):
+            app_loop, created, joined = asyncio.run(scenario())
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+    assert created.status_code == 201, created.text
+    assert joined.status_code == 201, joined.text
+    assert loops == [app_loop, app_loop]
@@ -1,4 +1,5 @@
 import builtins
+import os
 import sys
 import pytest
 from unittest.mock import MagicMock, patch
@@ -24,3 +25,160 @@ def test_get_db_yields_and_closes():
         with pytest.raises(StopIteration):
             next(gen)
         mock_session_instance.close.assert_called_once()
+
+
+def test_configure_sqlite_applies_the_settings_profile(tmp_path):
+    """Verifica que cada conexión nueva salga con los PRAGMA de Settings."""
+    from sqlalchemy import create_engine, text
+    from src.models.db import configure_sqlite
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'profile.db'}")
+    configure_sqlite(engine)
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+        assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+    engine.dispose()
+
+
+def test_pool_options_only_for_file_databases():
+    """Una DB en memoria usa el pool por defecto; una en archivo, el tamaño configurado."""
+    from src.models.db import pool_options
+
+    assert pool_options("sqlite://") == {}
+    assert pool_options("sqlite:///:memory:") == {}
+    assert pool_options("sqlite:///./db.sqlite") == {"pool_size": 5, "max_overflow": 10, "pool_timeout": 30.0}
+    assert pool_options("postgresql://host/db")["pool_pre_ping"] is True
+
+
+def test_engine_options_per_backend():
+    """SQLite comparte conexiones entre threads; PostgreSQL recibe el statement_timeout."""
+    from src.models.db import database_url, engine_options
+
+    assert engine_options("sqlite:///./db.sqlite")["connect_args"] == {"check_same_thread": False}
+    assert database_url("postgres://u:p@host/db") == "postgresql+psycopg://u:p@host/db"
+    with patch("src.models.db.settings.DB_STATEMENT_TIMEOUT", 2500):
+        assert engine_options("postgresql://host/db")["connect_args"] == {"options": "-c statement_timeout=2500"}
+
+
+@pytest.mark.skipif(not os.environ.get("TEST_DATABASE_URL", "").startswith("postgres"),
+                    reason="with_for_update() no bloquea nada en SQLite")
+def test_with_for_update_locks_the_row_on_postgresql(db_session):
+    """En PostgreSQL with_for_update() toma un lock real de la fila."""
+    from sqlalchemy.exc import OperationalError
+    from sqlalchemy.orm import Session
+    from src.game.models import Game
+
+    game = Game(name="Lock")
+    db_session.add(game)
+    db_session.commit()
+    db_session.query(Game).filter(Game.id == game.id).with_for_update().one()
+
+    other = Session(bind=db_session.get_bind())
+    try:
+        with pytest.raises(OperationalError):
+            other.query(Game).filter(Game.id == game.id).with_for_update(nowait=True).one()
+    finally:
+        other.close()
+        db_session.rollback()
+        db_session.delete(game)
+        db_session.commit()
+
+
+def test_get_db_commits_once_or_rolls_back():
+    """get_db es la unit of work de la request: un commit si terminó bien, un rollback si falló."""
+    from src.models.db import get_db
+
+    ok_session = MagicMock()
+    with patch("src.models.db.session", MagicMock(return_value=ok_session)):
+        gen = get_db()
+        next(gen)
+        with pytest.raises(StopIteration):
+            next(gen)
+    ok_session.commit.assert_called_once()
+    ok_session.rollback.assert_not_called()
+
+    failed_session = MagicMock()
+    with patch("src.models.db.session", MagicMock(return_value=failed_session)):
+        gen = get_db()
+        next(gen)
+        with pytest.raises(ValueError):
+            gen.throw(ValueError("fallo el endpoint"))
+    failed_session.commit.assert_not_called()
+    failed_session.rollback.assert_called_once()
+    failed_session.close.assert_called_once()
+
+
+@pytest.fixture
+def file_session(tmp_path):
+    """Sesiones sobre una DB SQLite en archivo con el perfil de producción."""
+    from sqlalchemy import create_engine
+    from src.models.db import Base, configure_sqlite
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'uow.db'}")
+    configure_sqlite(engine)
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine, autoflush=False)
+    engine.dispose()
+
+
+def test_savepoint_does_not_commit_the_request(file_session):
+    """Un savepoint deshace solo su parte, y el rollback de la request deshace también lo del savepoint."""
+    from src.game.models import Game
+    from src.models.db import unit_of_work
+
+    with unit_of_work(file_session()) as db:
+        db.add(Game(name="Antes"))
+        db.flush()
+        with pytest.raises(ValueError):
+            with db.begin_nested():
+                db.add(Game(name="Descartada"))
+                db.flush()
+                raise ValueError
+    with file_session() as db:
+        assert [g.name for g in db.query(Game)] == ["Antes"]
+
+    # Sin escrituras antes del savepoint (pysqlite todavía no abrió la transacción)
+    with pytest.raises(RuntimeError):
+        with unit_of_work(file_session()) as db:
+            db.query(Game).all()
+            with db.begin_nested():
+                db.add(Game(name="Dentro del savepoint"))
+            raise RuntimeError
+    with file_session() as db:
+        assert [g.name for g in db.query(Game)] == ["Antes"]
+
+
+def test_start_game_commits_once(file_session):
+    """Iniciar una partida (~90 cartas creadas y repartidas) es un único commit."""
+    from datetime import date
+    from sqlalchemy import event
+    from src.game.models import Game
+    from src.gameCard.models import GameCard
+    from src.gameLogic.start_game import start_game
+    from src.gamePlayer.models import PlayerGame
+    from src.models.db import unit_of_work
+    from src.player.models import Player
+
+    with file_session() as db:
+        game = Game(name="Un commit", max_players=6, min_players=2)
+        players = [Player(name=f"Jugador {i}", birthdate=date(1990, 1, i), avatar="ruta",
+                          is_Social_Disgrace=False, is_Your_Turn=False, is_Owner=i == 1, rol="innocent")
+                   for i in range(1, 5)]
+        db.add_all([game, *players])
+        db.flush()
+        db.add_all([PlayerGame(game_id=game.id, player_id=p.id) for p in players])
+        db.commit()
+        game_id = game.id
+
+    commits = []
+    event.listen(file_session.kw["bind"], "commit", lambda conn: commits.append(conn))
+    with unit_of_work(file_session()) as db:
+        start_game(db, game_id)
+
+    assert len(commits) == 1
+    with file_session() as db:
+        assert db.get(Game, game_id).is_started
+        assert db.query(GameCard).filter(GameCard.game_id == game_id).count() > 0
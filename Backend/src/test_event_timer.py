@@ -3,6 +3,9 @@ import time
 import asyncio
 from unittest.mock import patch, AsyncMock
 
+from src.event_timer import countdown
+from src.timer_scheduler import timers
+
 # --- IDs Globales para este test ---
 timer_player_id_1 = None
 timer_player_id_2 = None
@@ -95,8 +98,10 @@ def test_websocket_receives_event_started(client):
             assert msg["payload"]["event_by_player"] == player_id
             assert msg["payload"]["player_name"] == "Timer Player 1"
         
-        # Verificamos que la tarea de fondo (countdown) fue llamada
+        # El primer tick sale con la respuesta; el resto queda en el scheduler
         mock_countdown.assert_called_once()
+        assert (game_id, room_id) in timers
+    timers.cancel((game_id, room_id))
 
 
 def test_cancel_event(client):
@@ -126,4 +131,85 @@ def test_cancel_event(client):
     data = response_cancel.json()
     assert data["message"] == "Evento cancelado"
     assert data["room_id"] == room_id
-    assert data["cancelled_by"] == player_id_2
\ No newline at end of file
+    assert data["cancelled_by"] == player_id_2
+    assert (game_id, room_id) not in timers
+
+
+def test_start_event_twice_is_rejected(client):
+    game_id = 3
+    room_id = "sala_doble_test"
+
+    with patch("src.event_timer.countdown", new_callable=AsyncMock):
+        first = client.post(f"/game/{game_id}/event/start?room_id={room_id}", json={"player_id": timer_player_id_1})
+        second = client.post(f"/game/{game_id}/event/start?room_id={room_id}", json={"player_id": timer_player_id_2})
+    timers.cancel((game_id, room_id))
+
+    assert first.status_code == 200
+    assert second.status_code == 400
+
+
+def test_cancel_without_event_is_rejected(client):
+    response = client.post("/game/99/event/cancel?room_id=sala_vacia", json={"player_id": timer_player_id_1})
+    assert response.status_code == 400
+
+
+def test_event_started_carries_deadline_and_ticks_are_opt_in(client):
+    game_id = 4
+    room_id = "sala_deadline_test"
+
+    with client.websocket_connect(f"/ws/{room_id}") as modern, \
+         client.websocket_connect(f"/ws/{room_id}?ticks=true") as legacy:
+        response = client.post(f"/game/{game_id}/event/start?room_id={room_id}", json={"player_id": timer_player_id_1})
+        assert response.status_code == 200, response.text
+        cancel = client.post(f"/game/{game_id}/event/cancel?room_id={room_id}", json={"player_id": timer_player_id_2})
+        assert cancel.status_code == 200, cancel.text
+
+        started = modern.receive_json()
+        assert started["type"] == "EVENT_STARTED"
+        assert started["payload"]["deadline"] - started["payload"]["server_time"] == pytest.approx(10000, abs=50)
+        # Sin ?ticks=true lo siguiente ya es la cancelación
+        cancelled = modern.receive_json()
+        assert [m["type"] for m in cancelled["messages"]] == ["COUNTDOWN_CANCELLED", "EVENT_CANCELLED"]
+
+        assert legacy.receive_json()["type"] == "EVENT_STARTED"
+        tick = legacy.receive_json()
+        assert tick["type"] == "COUNTDOWN_TICK"
+        assert tick["payload"] == {"game_id": game_id, "time": 10}
+        assert legacy.receive_json()["type"] == "batch"
+
+
+def test_countdown_sends_sparse_sync_messages():
+    with patch("src.event_timer.manager.broadcast", new_callable=AsyncMock) as mock_broadcast, \
+         patch("src.event_timer.settings.WS_COUNTDOWN_SYNC_INTERVAL", 5):
+        asyncio.run(countdown(7, "sala", time.monotonic() + 5))
+        asyncio.run(countdown(7, "sala", time.monotonic() + 4))
+
+    messages = [c[0][0].model_dump(mode="json") for c in mock_broadcast.call_args_list]
+    assert [m["type"] for m in messages] == ["COUNTDOWN_TICK", "COUNTDOWN_SYNC", "COUNTDOWN_TICK"]
+    sync = messages[1]["payload"]
+    assert sync["game_id"] == 7
+    assert sync["deadline"] - sync["server_time"] == pytest.approx(5000, abs=50)
+
+
+def test_countdown_tick_returns_next_deadline():
+    with patch("src.event_timer.manager.broadcast", new_callable=AsyncMock) as mock_broadcast:
+        deadline = time.monotonic() + 3
+        next_deadline = asyncio.run(countdown(7, "sala", deadline))
+
+    assert next_deadline == deadline - 2
+    tick = mock_broadcast.call_args[0][0].model_dump(mode="json")
+    assert tick == {"type": "COUNTDOWN_TICK", "payload": {"game_id": 7, "time": 3}}
+
+
+def test_countdown_last_tick_finalizes_the_event():
+    with patch("src.event_timer.manager.broadcast", new_callable=AsyncMock) as mock_broadcast, \
+         patch("src.event_timer.event_state_service.finalize", new_callable=AsyncMock, return_value="resolved") as mock_finalize:
+        next_deadline = asyncio.run(countdown(7, "sala", time.monotonic()))
+
+    assert next_deadline is None
+    mock_finalize.assert_awaited_once_with(7)
+    messages = [c[0][0].model_dump(mode="json") for c in mock_broadcast.call_args_list]
+    assert messages == [
+        {"type": "COUNTDOWN_TICK", "payload": {"game_id": 7, "time": 0}},
+        {"type": "COUNTDOWN_END", "payload": {"game_id": 7, "final_state": "resolved"}},
+    ]
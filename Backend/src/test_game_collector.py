@@ -0,0 +1,186 @@
+import fcntl
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, func, insert, select, update
+from sqlalchemy.orm import sessionmaker
+
+from src.cards.models import Card, DetectiveCard
+from src.detectiveSet.models import DetectiveSet
+from src.game.models import Game
+from src.gameCard.models import GameCard
+from src.gameLogic.create_game_perfile import initialize_game_cards
+from src.gameLogic.murderer_escapes_service import murderer_escapes_service
+from src.gamePlayer.models import PlayerGame
+from src.game_collector import (
+    GameCollector,
+    enable_incremental_vacuum,
+    incremental_vacuum,
+    migrate_incremental_vacuum,
+    retired_card_table,
+    retired_player_table,
+)
+from src.models.db import Base, configure_sqlite
+from src.player.models import Player
+from src.playerCard.models import player_card_table
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    """DB en archivo propia del test, con auto_vacuum incremental como en producción."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'collector.db'}")
+    configure_sqlite(engine)
+    assert enable_incremental_vacuum(engine)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def _player(name):
+    return Player(
+        name=name, avatar="a.png", birthdate=date(1990, 1, 1),
+        is_Social_Disgrace=False, is_Your_Turn=False, is_Owner=False, rol="innocent",
+    )
+
+
+def _finished_game(db, name="Terminada"):
+    """Partida con mazo completo, manos repartidas y un set bajado, ya terminada."""
+    game = Game(name=name)
+    players = [_player("Uno"), _player("Dos")]
+    db.add_all([game, *players])
+    db.flush()
+    db.add_all([PlayerGame(game_id=game.id, player_id=player.id) for player in players])
+    initialize_game_cards(db, game.id)
+    card_ids = db.execute(select(GameCard.card_id).where(GameCard.game_id == game.id)).scalars().all()
+    db.execute(insert(player_card_table), [
+        {"player_id": players[i % 2].id, "card_id": card_id} for i, card_id in enumerate(card_ids[:12])
+    ])
+    detective_set = DetectiveSet(
+        id_owner=players[0].id, main_detective="Poirot", action_secret="reveal_their", is_cancellable=False
+    )
+    db.add(detective_set)
+    db.flush()
+    detective = db.execute(select(DetectiveCard).where(DetectiveCard.id.in_(card_ids))).scalars().first()
+    detective.detective_set_id = detective_set.id
+    db.flush()
+    murderer_escapes_service(db, game.id)
+    db.commit()
+    return [player.id for player in players], card_ids
+
+
+def _count(db, table):
+    return db.scalar(select(func.count()).select_from(table))
+
+
+def test_collector_removes_everything_from_finished_games(file_engine):
+    Session = sessionmaker(bind=file_engine)
+    with Session() as db:
+        # Varias partidas, para que se liberen páginas enteras
+        card_ids = [card_id for i in range(10) for card_id in _finished_game(db, f"Terminada {i}")[1]]
+        assert _count(db, retired_card_table) == len(card_ids)
+        assert _count(db, retired_player_table) == 20
+
+    report = GameCollector(Session, batch_size=300).collect()
+
+    with Session() as db:
+        for table in (Card.__table__, DetectiveCard.__table__, player_card_table, DetectiveSet.__table__,
+                      retired_card_table, retired_player_table):
+            assert _count(db, table) == 0, table.name
+        # Los jugadores quedan, listos para otra partida
+        assert _count(db, Player.__table__) == 20
+    assert report.rows["cards"] == len(card_ids)
+    assert report.rows["player_card"] == 120
+    assert report.rows["detective_set"] == 10
+    assert "player" not in report.rows
+    assert report.bytes_reclaimed > 0
+    # Una segunda corrida no encuentra nada
+    assert GameCollector(Session).collect().total_rows == 0
+
+
+def test_collector_resets_players_instead_of_deleting_them(file_engine):
+    Session = sessionmaker(bind=file_engine)
+    with Session() as db:
+        player_ids, _ = _finished_game(db)
+        db.execute(update(Player).where(Player.id == player_ids[1]).values(
+            rol="murderer", is_Social_Disgrace=True, is_Your_Turn=True, is_Owner=True,
+        ))
+        db.commit()
+
+    GameCollector(Session).collect()
+
+    with Session() as db:
+        player = db.get(Player, player_ids[1])
+        assert player.name == "Dos"
+        assert (player.rol, player.is_Social_Disgrace, player.is_Your_Turn, player.is_Owner) == (
+            "innocent", False, False, False,
+        )
+        assert _count(db, player_card_table) == 0
+        assert _count(db, retired_player_table) == 0
+
+
+def test_collector_leaves_players_that_joined_another_game_alone(file_engine):
+    Session = sessionmaker(bind=file_engine)
+    with Session() as db:
+        player_ids, _ = _finished_game(db)
+        other = Game(name="Otra")
+        db.add(other)
+        db.flush()
+        db.add(PlayerGame(game_id=other.id, player_id=player_ids[0]))
+        db.execute(update(Player).where(Player.id == player_ids[0]).values(rol="detective"))
+        db.commit()
+
+    GameCollector(Session).collect()
+
+    with Session() as db:
+        assert sorted(db.execute(select(Player.id)).scalars().all()) == sorted(player_ids)
+        # Su rol ya es el de la otra partida
+        assert db.get(Player, player_ids[0]).rol == "detective"
+        assert _count(db, PlayerGame.__table__) == 1
+        assert _count(db, retired_player_table) == 0
+
+
+def test_collector_leaves_games_in_progress_alone(file_engine):
+    Session = sessionmaker(bind=file_engine)
+    with Session() as db:
+        _finished_game(db, "Terminada")
+        playing = Game(name="En curso")
+        db.add(playing)
+        db.flush()
+        initialize_game_cards(db, playing.id)
+        db.commit()
+        in_progress = _count(db, GameCard.__table__)
+
+    GameCollector(Session).collect()
+
+    with Session() as db:
+        assert _count(db, GameCard.__table__) == in_progress
+        assert _count(db, Card.__table__) == in_progress
+
+
+def test_incremental_vacuum_without_free_pages(file_engine):
+    assert incremental_vacuum(file_engine) == 0
+
+
+def test_existing_db_is_vacuumed_once_by_a_single_process(tmp_path):
+    path = tmp_path / "existing.db"
+    engine = create_engine(f"sqlite:///{path}")
+    configure_sqlite(engine)
+    Base.metadata.create_all(bind=engine)
+
+    def auto_vacuum():
+        with engine.connect() as conn:
+            return conn.exec_driver_sql("PRAGMA auto_vacuum").scalar()
+
+    # Al importar la app solo va el pragma: una DB con tablas no se toca
+    assert not enable_incremental_vacuum(engine, vacuum=False)
+    assert auto_vacuum() == 0
+
+    # Otro worker ya tiene el lock de la migración: este arranca sin hacerla
+    with open(f"{path}.migrate-lock", "w") as other_worker:
+        fcntl.flock(other_worker, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        assert not migrate_incremental_vacuum(engine)
+        assert auto_vacuum() == 0
+
+    assert migrate_incremental_vacuum(engine)
+    assert auto_vacuum() == 2
+    engine.dispose()
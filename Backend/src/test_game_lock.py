@@ -0,0 +1,233 @@
+import asyncio
+import sqlite3
+from datetime import date
+from unittest.mock import patch
+
+import httpx
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.game.models import Game
+from src.gameCard.models import CardPosition, GameCard
+from src.gameLogic.game_state import game_states
+from src.gameLogic.start_game import start_game
+from src.gamePlayer.models import PlayerGame
+from src.game_lock import GameLocks, game_locks
+from src.main import app
+from src.models.db import Base, async_url, configure_sqlite, engine_options, get_async_db, get_db, unit_of_work
+from src.player.models import Player
+from src.playerCard.services import PlayerCardService
+
+
+@pytest.fixture
+def sync_session(tmp_path):
+    """Partida en una DB en archivo; los endpoints la usan con una AsyncSession (aiosqlite)."""
+    url = f"sqlite:///{tmp_path / 'locks.db'}"
+    sync_engine = create_engine(url, **engine_options(url))
+    configure_sqlite(sync_engine)
+    Base.metadata.create_all(bind=sync_engine)
+    async_engine = create_async_engine(async_url(url), **engine_options(url))
+    configure_sqlite(async_engine.sync_engine)
+    async_session = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with async_session() as db:
+            try:
+                yield db
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+
+    previous = app.dependency_overrides.get(get_async_db)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    yield sessionmaker(bind=sync_engine, autoflush=False)
+    if previous is None:
+        app.dependency_overrides.pop(get_async_db, None)
+    else:
+        app.dependency_overrides[get_async_db] = previous
+    asyncio.run(async_engine.dispose())
+    sync_engine.dispose()
+
+
+def seed_started_game(sync_session) -> int:
+    with unit_of_work(sync_session()) as db:
+        game = Game(name="Concurrente", max_players=6, min_players=2)
+        db.add(game)
+        db.flush()
+        for i in range(4):
+            player = Player(name=f"p{i}", avatar="a", birthdate=date(1990, 1, i + 1), is_Social_Disgrace=False,
+                            is_Your_Turn=False, is_Owner=i == 0, rol="innocent")
+            db.add(player)
+            db.flush()
+            db.add(PlayerGame(game_id=game.id, player_id=player.id))
+        db.flush()
+        start_game(db, game.id)
+        return game.id
+
+
+def deck_snapshot(sync_session, game_id: int) -> dict:
+    with sync_session() as db:
+        game = db.get(Game, game_id)
+        cards = db.execute(select(GameCard.card_id, GameCard.card_position, GameCard.card_order)
+                           .where(GameCard.game_id == game_id)).all()
+        player_ids = db.execute(select(PlayerGame.player_id).where(PlayerGame.game_id == game_id)).scalars().all()
+        hands = {player_id: [card.id for card in PlayerCardService(db).get_player_cards(player_id)
+                             if not card.name.startswith("secret_")]
+                 for player_id in player_ids}
+        return {
+            "draw_top": game.draw_top,
+            "discard_top": game.discard_top,
+            "draw": {card_id: order for card_id, position, order in cards if position == CardPosition.MAZO_ROBO},
+            "discard": sorted(order for _, position, order in cards if position == CardPosition.MAZO_DESCARTE),
+            "hands": hands,
+        }
+
+
+async def fire_together(requests) -> list[httpx.Response]:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        return await asyncio.gather(*(request(client) for request in requests))
+
+
+@pytest.mark.parametrize("engine_enabled", [True, False])
+def test_simultaneous_discards_and_draws_keep_the_decks_consistent(sync_session, monkeypatch, engine_enabled):
+    monkeypatch.setattr(game_states, "enabled", engine_enabled)
+    game_id = seed_started_game(sync_session)
+    before = deck_snapshot(sync_session, game_id)
+    contended = game_locks.contended
+
+    discards = [
+        lambda client, player_id=player_id, card_id=card_id:
+            client.put(f"/game/{game_id}/{player_id}/{card_id}/discard")
+        for player_id, hand in before["hands"].items() for card_id in hand[:2]
+    ]
+    draws = [
+        lambda client, player_id=player_id:
+            client.post(f"/game/{game_id}/{player_id}/restock", params={"cantidad_robo": 1}, json={"cards_id": []})
+        for player_id in before["hands"] for _ in range(2)
+    ]
+    responses = asyncio.run(fire_together(discards)) + asyncio.run(fire_together(draws))
+    after = deck_snapshot(sync_session, game_id)
+
+    assert [response.status_code for response in responses] == [200] * 16, [r.text for r in responses]
+    # Cada descarte tiene su propio orden, sin huecos ni repetidos
+    assert after["discard_top"] == before["discard_top"] + 8
+    assert after["discard"][-8:] == list(range(before["discard_top"] + 1, before["discard_top"] + 9))
+    # Del mazo de robo salieron exactamente las 8 cartas de arriba
+    assert after["draw_top"] == before["draw_top"] - 8
+    drawn = set(before["draw"]) - set(after["draw"])
+    assert sorted(before["draw"][card_id] for card_id in drawn) == list(range(before["draw_top"] - 7, before["draw_top"] + 1))
+    assert all(order <= after["draw_top"] for order in after["draw"].values())
+    # Cada carta robada quedó en una sola mano y todas las manos volvieron a 6
+    held = [card_id for hand in after["hands"].values() for card_id in hand]
+    assert len(held) == len(set(held)) and drawn <= set(held)
+    assert all(len(hand) == 6 for hand in after["hands"].values())
+    assert game_locks.contended > contended
+    assert len(game_locks) == 0
+
+
+def test_different_games_do_not_wait_for_each_other():
+    locks = GameLocks()
+    order = []
+
+    async def act(game_id, name, delay):
+        async with locks.hold(game_id):
+            order.append(f"{name} empieza")
+            await asyncio.sleep(delay)
+            order.append(f"{name} termina")
+
+    async def scenario():
+        await asyncio.gather(act(1, "a1", 0.02), act(1, "b1", 0), act(2, "a2", 0))
+
+    asyncio.run(scenario())
+
+    # La segunda acción de la partida 1 espera a la primera; la partida 2 no espera a nadie
+    assert order.index("b1 empieza") > order.index("a1 termina")
+    assert order.index("a2 termina") < order.index("a1 termina")
+    assert locks.stats() == {"games": 0, "acquired": 3, "contended": 1}
+
+
+def test_actions_commit_before_broadcasting(sync_session, monkeypatch):
+    # Sin el motor en memoria los servicios escriben (flush) durante la acción y toman el lock
+    monkeypatch.setattr(game_states, "enabled", False)
+    game_id = seed_started_game(sync_session)
+    state = deck_snapshot(sync_session, game_id)
+    with sync_session() as db:
+        turn_player = db.get(Game, game_id).turn_id_player
+    database = sync_session.kw["bind"].url.database
+    lock_free = []
+
+    async def broadcast(message, room_id="0"):
+        # Otro writer toma el lock de escritura sin esperar: solo puede si la request ya hizo commit
+        other = sqlite3.connect(database, timeout=0)
+        try:
+            other.execute("BEGIN IMMEDIATE")
+            other.execute("ROLLBACK")
+            lock_free.append(True)
+        except sqlite3.OperationalError:
+            lock_free.append(False)
+        finally:
+            other.close()
+
+    card_id = state["hands"][turn_player][0]
+    with patch("src.gamePlayer.endpoints.manager.broadcast", side_effect=broadcast):
+        responses = asyncio.run(fire_together([
+            lambda client: client.put(f"/game/{game_id}/{turn_player}/{card_id}/discard"),
+        ])) + asyncio.run(fire_together([
+            lambda client: client.post(f"/game/{game_id}/{turn_player}/restock",
+                                       params={"cantidad_robo": 1}, json={"cards_id": []}),
+        ]))
+        # Reponer pasa el turno: pasa ahora el jugador siguiente
+        with sync_session() as db:
+            next_player = db.get(Game, game_id).turn_id_player
+        responses += asyncio.run(fire_together([
+            lambda client: client.post(f"/game/{game_id}/{next_player}/pass"),
+        ]))
+
+    assert [response.status_code for response in responses] == [200] * 3, [r.text for r in responses]
+    assert lock_free and all(lock_free)
+
+
+def test_actions_without_game_id_in_the_path_wait_for_the_game_lock(sync_session):
+    game_id = seed_started_game(sync_session)
+    player_id = next(iter(deck_snapshot(sync_session, game_id)["hands"]))
+
+    def override_get_db():
+        with unit_of_work(sync_session()) as db:
+            yield db
+
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    # La partida sale del body (game_id o id_owner) o del jugador del path
+    requests = [
+        lambda client: client.put("/event-cards/play/999999", json={"game_id": game_id, "player_id": player_id}),
+        lambda client: client.post("/detective-set/", json={
+            "id_owner": player_id, "main_detective": "poirot", "action_secret": "hide",
+            "is_cancellable": True, "detective_card_ids": [999999],
+        }),
+        lambda client: client.delete(f"/player/{player_id}/cards/999999"),
+    ]
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            async with game_locks.hold(game_id):
+                tasks = [asyncio.create_task(request(client)) for request in requests]
+                await asyncio.sleep(0.2)
+                waiting = [not task.done() for task in tasks]
+            return waiting, await asyncio.gather(*tasks)
+
+    contended = game_locks.contended
+    try:
+        waiting, responses = asyncio.run(scenario())
+    finally:
+        if previous is None:
+            app.dependency_overrides.pop(get_db, None)
+        else:
+            app.dependency_overrides[get_db] = previous
+
+    assert waiting == [True] * 3
+    assert game_locks.contended == contended + 3
+    assert [response.status_code for response in responses] == [404, 400, 404], [r.text for r in responses]
+    assert len(game_locks) == 0
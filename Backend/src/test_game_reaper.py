@@ -0,0 +1,160 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src import event_timer
+from src.cards.logicEventCards import point_suspicions_service as votes
+from src.cards.logicEventCards.notSoFast import event_state_service
+from src.conftest import TestingSessionLocal
+from src.game.models import Game
+from src.gameLogic.create_game_perfile import initialize_game_cards
+from src.game_collector import retired_card_table
+from src.game_lock import game_locks
+from src.game_reaper import GameReaper, game_activity
+from src.timer_scheduler import timers
+from src.websocket import RoomLog, manager
+
+
+@pytest.fixture
+def started_game(test_db):
+    with TestingSessionLocal() as db:
+        game = Game(name="Abandonada", is_started=True, max_players=4, min_players=2,
+                    current_players=2, current_turn=1, turn_id_player=1)
+        db.add(game)
+        db.flush()
+        initialize_game_cards(db, game.id)
+        db.commit()
+        game_id = game.id
+    # Otros tests pudieron tocar el mismo id por HTTP
+    game_activity.forget(game_id)
+    yield game_id
+    game_activity.forget(game_id)
+
+
+@pytest.fixture
+def ephemeral_state():
+    """Aísla los dicts globales de timers, votaciones y eventos."""
+    with patch.dict(event_timer.event_deadlines, clear=True), \
+         patch.dict(votes.Votes_received, clear=True), \
+         patch.dict(votes.Order_vote, clear=True), \
+         patch.dict(event_state_service.event_states, clear=True):
+        yield
+
+
+def _game_exists(game_id):
+    with TestingSessionLocal() as db:
+        return db.get(Game, game_id) is not None
+
+
+def _reap(reaper, now):
+    with patch.object(manager, "broadcast", AsyncMock()) as broadcast:
+        report = asyncio.run(reaper.reap(now=now))
+    return report, broadcast
+
+
+def test_reaper_ends_idle_game_and_releases_its_state(started_game, ephemeral_state):
+    game_id = started_game
+    key = (game_id, str(game_id))
+    timers.schedule(key, 1e12, AsyncMock(return_value=None))
+    event_timer.event_deadlines[key] = 1e12
+    votes.Votes_received[game_id] = [(1, 2)]
+    votes.Order_vote[game_id] = [1, 2]
+    event_state_service.event_states[str(game_id)] = "active"
+    manager.logs[str(game_id)] = RoomLog(8)
+    reaper = GameReaper(TestingSessionLocal, grace=60)
+    now = time.monotonic()
+
+    # Primera vez que la ve: la gracia empieza a contar
+    report, _ = _reap(reaper, now=now)
+    assert report.games == 0
+    assert _game_exists(game_id)
+
+    report, broadcast = _reap(reaper, now=now + 61)
+
+    assert report.games == 1
+    assert (report.timers, report.votes, report.event_states, report.room_logs) == (1, 1, 1, 1)
+    assert not _game_exists(game_id)
+    assert key not in timers and key not in event_timer.event_deadlines
+    assert game_id not in votes.Votes_received and game_id not in votes.Order_vote
+    assert str(game_id) not in event_state_service.event_states
+    assert str(game_id) not in manager.logs
+    assert game_activity.last(game_id) is None
+    assert broadcast.await_args.args[0].payload == game_id
+    # Las cartas quedan para el recolector
+    with TestingSessionLocal() as db:
+        assert db.query(retired_card_table).count() > 0
+
+
+def test_reaper_keeps_games_with_sockets(started_game):
+    game_id = started_game
+    reaper = GameReaper(TestingSessionLocal, grace=60)
+    now = time.monotonic()
+    _reap(reaper, now=now)
+
+    with patch.dict(manager.rooms, {str(game_id): {1: MagicMock()}}):
+        report, _ = _reap(reaper, now=now + 1000)
+
+    assert report.games == 0
+    assert _game_exists(game_id)
+    # La presencia cuenta como actividad: la gracia vuelve a empezar
+    assert game_activity.last(game_id) == now + 1000
+    assert _reap(reaper, now=now + 1030)[0].games == 0
+
+
+def test_http_request_counts_as_activity(client, started_game):
+    game_id = started_game
+    game_activity.forget(game_id)
+
+    client.get(f"/game/{game_id}")
+    first = game_activity.last(game_id)
+    assert first is not None
+
+    client.get(f"/game/{game_id}/players")
+    assert game_activity.last(game_id) >= first
+
+
+def test_reaper_forgets_games_that_ended(started_game):
+    game_id = started_game
+    reaper = GameReaper(TestingSessionLocal, grace=60)
+    game_activity.touch(10_000_000)
+
+    now = time.monotonic()
+    report, _ = _reap(reaper, now=now)
+
+    assert game_activity.last(10_000_000) is None
+    assert game_activity.last(game_id) == now
+    assert report.tracked_games >= 1
+
+
+def test_reaper_waits_for_the_action_in_progress(started_game):
+    game_id = started_game
+    reaper = GameReaper(TestingSessionLocal, grace=60)
+    now = time.monotonic()
+    _reap(reaper, now=now)
+
+    async def scenario():
+        async with game_locks.hold(game_id):
+            reaping = asyncio.create_task(reaper.reap(now=now + 61))
+            await asyncio.sleep(0.05)
+            # La acción que tenía el lock es actividad de la partida
+            assert not reaping.done()
+            game_activity.touch(game_id, now + 61)
+        return await reaping
+
+    with patch.object(manager, "broadcast", AsyncMock()):
+        asyncio.run(scenario())
+
+    assert _game_exists(game_id)
+
+
+def test_reaper_is_off_with_a_shared_bus(started_game):
+    reaper = GameReaper(TestingSessionLocal, grace=0)
+    with patch.object(manager.bus, "shared", True), \
+         patch.object(reaper, "reap", AsyncMock()) as reap, \
+         patch("src.game_reaper.asyncio.sleep", AsyncMock()):
+        asyncio.run(asyncio.wait_for(reaper.run(), 1))
+
+    reap.assert_not_awaited()
+    assert _game_exists(started_game)
@@ -0,0 +1,79 @@
+import re
+
+import pytest
+from sqlalchemy import create_engine, inspect, select, text
+
+from src.cards.models import Card
+from src.detectiveSet.models import DetectiveSet
+from src.gameCard.models import CardPosition, GameCard
+from src.gamePlayer.models import PlayerGame
+from src.models.db import Base, create_missing_indexes
+from src.player.models import Player, RolEnum
+from src.playerCard.models import player_card_table
+
+# Las consultas más frecuentes de las partidas, tal como las arman los servicios
+HOT_QUERIES = {
+    # restock_from_draw / restock_draft_deck: tope del mazo de robo
+    "draw_top": select(GameCard).join(Card).where(
+        GameCard.game_id == 1,
+        GameCard.card_position == CardPosition.MAZO_ROBO.value,
+        GameCard.card_order == 30,
+        Card.is_murderes_escapes == False,
+    ),
+    # GameCardService.get_top_5_discard_deck_cards
+    "discard_top_5": select(Card).join(GameCard, GameCard.card_id == Card.id).where(
+        GameCard.game_id == 1,
+        GameCard.card_position == CardPosition.MAZO_DESCARTE,
+    ).order_by(GameCard.card_order.desc()).limit(5),
+    # SecretCardService.reveal: dueño de la carta
+    "card_owner": select(Player.name)
+        .join(player_card_table, Player.id == player_card_table.c.player_id)
+        .where(player_card_table.c.card_id == 7),
+    # advance_turn: jugadores de la partida en orden de turno
+    "turn_order": select(PlayerGame).where(PlayerGame.game_id == 1).order_by(PlayerGame.position_id_player),
+    # DetectiveSetService.get_sets_by_owner
+    "sets_by_owner": select(DetectiveSet).where(DetectiveSet.id_owner == 3),
+    # win_by_social_disgrace / earlyTrainToPaddington: asesino de la partida
+    "murderer_in_game": select(Player).join(PlayerGame, Player.id == PlayerGame.player_id).where(
+        PlayerGame.game_id == 1,
+        Player.rol == RolEnum.murderer,
+    ),
+}
+
+HOT_TABLES = "game_card|player_card|player_game|detective_set|player|cards"
+
+
+def query_plan(db, stmt) -> list[str]:
+    compiled = stmt.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True})
+    rows = db.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    return [row[-1] for row in rows]
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_queries_use_an_index(db_session, name):
+    if db_session.get_bind().dialect.name != "sqlite":
+        pytest.skip("EXPLAIN QUERY PLAN es de SQLite")
+    plan = query_plan(db_session, HOT_QUERIES[name])
+
+    # SCAN = recorrer la tabla (o un índice entero); las búsquedas son SEARCH
+    scans = [step for step in plan if re.match(rf"SCAN ({HOT_TABLES})\b", step)]
+    assert not scans, f"{name}: {plan}"
+    assert not any("TEMP B-TREE" in step for step in plan), f"{name}: {plan}"
+
+
+def test_create_missing_indexes_upgrades_an_existing_database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    Base.metadata.create_all(bind=engine)
+    # Una DB de antes de los índices
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.drop(conn)
+
+    created = create_missing_indexes(engine)
+
+    assert {"ix_game_card_position_order", "ix_player_card_card_id",
+            "ix_player_game_game_position", "ix_detective_set_id_owner"} <= set(created)
+    assert "ix_game_card_position_order" in {ix["name"] for ix in inspect(engine).get_indexes("game_card")}
+    assert create_missing_indexes(engine) == []
+    engine.dispose()
@@ -0,0 +1,142 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.lobby_digest import LobbyFilterEnum
+from src.websocket import ConnectionManager
+
+
+@pytest.fixture(autouse=True)
+def short_window():
+    with patch("src.lobby_digest.settings.WS_LOBBY_DIGEST_WINDOW", 0.01):
+        yield
+
+
+def game(game_id, current_players=1, max_players=4, is_started=False):
+    return {
+        "id": game_id,
+        "name": f"partida {game_id}",
+        "max_players": max_players,
+        "min_players": 2,
+        "current_players": current_players,
+        "is_started": is_started,
+        "current_turn": 0,
+        "turn_id_player": 0,
+        "draw_top": 0,
+        "discard_top": 0,
+    }
+
+
+def event(kind, payload):
+    return json.dumps({"type": kind, "payload": payload})
+
+
+def sent_json(ws):
+    return [json.loads(c.args[0]) for c in ws.send_text.await_args_list]
+
+
+def test_digest_subscribers_get_one_coalesced_frame():
+    async def scenario():
+        manager = ConnectionManager()
+        raw, digest = AsyncMock(), AsyncMock()
+        c_raw = await manager.connect(raw, "0")
+        c_digest = await manager.connect(digest, "0", digest=LobbyFilterEnum.all)
+
+        await manager.broadcast(event("gameAdd", game(1)), "0")
+        await manager.broadcast(event("gameUpdate", game(1, current_players=2)), "0")
+        await manager.broadcast(event("gameAdd", game(2)), "0")
+        await manager.broadcast(event("gameRemove", 2), "0")
+        await manager.broadcast(event("playerAdd", {"id": 9, "name": "Ana"}), "0")
+        await asyncio.sleep(0.05)
+        await c_raw.drain()
+        await c_digest.drain()
+
+        assert len(raw.send_text.await_args_list) == 5
+        assert sent_json(digest) == [{
+            "type": "lobbyDigest",
+            "payload": {
+                "games": {"upsert": [game(1, current_players=2)], "remove": [2]},
+                "players": {"upsert": [{"id": 9, "name": "Ana"}], "remove": []},
+            },
+        }]
+    asyncio.run(scenario())
+
+
+def test_open_filter_turns_unavailable_games_into_removals():
+    async def scenario():
+        manager = ConnectionManager()
+        ws_all, ws_open = AsyncMock(), AsyncMock()
+        c_all = await manager.connect(ws_all, "0", digest=LobbyFilterEnum.all)
+        c_open = await manager.connect(ws_open, "0", digest=LobbyFilterEnum.open)
+
+        await manager.broadcast(event("gameAdd", game(1)), "0")
+        await manager.broadcast(event("gameUpdate", game(2, current_players=4)), "0")
+        await manager.broadcast(event("gameUpdate", game(3, is_started=True)), "0")
+        await asyncio.sleep(0.05)
+        await c_all.drain()
+        await c_open.drain()
+
+        [digest_all] = sent_json(ws_all)
+        [digest_open] = sent_json(ws_open)
+        assert [g["id"] for g in digest_all["payload"]["games"]["upsert"]] == [1, 2, 3]
+        assert [g["id"] for g in digest_open["payload"]["games"]["upsert"]] == [1]
+        assert digest_open["payload"]["games"]["remove"] == [2, 3]
+    asyncio.run(scenario())
+
+
+def test_digest_subscribers_still_get_other_lobby_messages():
+    async def scenario():
+        manager = ConnectionManager()
+        ws = AsyncMock()
+        conn = await manager.connect(ws, "0", digest=LobbyFilterEnum.all)
+        await manager.broadcast('{"type":"gameStartGame","payload":3}', "0")
+        await asyncio.sleep(0.05)
+        await conn.drain()
+        assert [m["type"] for m in sent_json(ws)] == ["gameStartGame"]
+    asyncio.run(scenario())
+
+
+def test_digest_is_ignored_outside_the_lobby():
+    async def scenario():
+        manager = ConnectionManager()
+        ws = AsyncMock()
+        conn = await manager.connect(ws, "5", digest=LobbyFilterEnum.open)
+        await manager.broadcast(event("gameUpdate", game(5)), "5")
+        await conn.drain()
+        assert conn.digest is None
+        assert [m["type"] for m in sent_json(ws)] == ["gameUpdate"]
+        assert manager.lobby.subscribers == {}
+    asyncio.run(scenario())
+
+
+def test_lobby_events_batched_in_one_request_reach_the_digest():
+    async def scenario():
+        manager = ConnectionManager()
+        raw, digest = AsyncMock(), AsyncMock()
+        c_raw = await manager.connect(raw, "0")
+        c_digest = await manager.connect(digest, "0", digest=LobbyFilterEnum.all)
+
+        async with manager.batched():
+            await manager.broadcast(event("gameAdd", game(1)), "0")
+            await manager.broadcast('{"type":"gameStartGame","payload":3}', "0")
+            await manager.broadcast(event("playerAdd", {"id": 9, "name": "Ana"}), "0")
+        await asyncio.sleep(0.05)
+        await c_raw.drain()
+        await c_digest.drain()
+
+        [envelope] = sent_json(raw)
+        assert [m["type"] for m in envelope["messages"]] == ["gameAdd", "gameStartGame", "playerAdd"]
+        # El resto del batch llega con el mismo seq; los eventos del lobby, en el digest
+        assert sent_json(digest) == [
+            {"seq": envelope["seq"], "type": "gameStartGame", "payload": 3},
+            {
+                "type": "lobbyDigest",
+                "payload": {
+                    "games": {"upsert": [game(1)], "remove": []},
+                    "players": {"upsert": [{"id": 9, "name": "Ana"}], "remove": []},
+                },
+            },
+        ]
+    asyncio.run(scenario())
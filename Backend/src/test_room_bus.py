@@ -0,0 +1,161 @@
+import asyncio
+import json
+import multiprocessing
+import socket
+import time
+
+import pytest
+
+from src.room_bus import LocalRoomBus, UnixSocketRoomBus
+from src.settings import settings
+from src.websocket import ConnectionManager, OutboundMessage, batch_envelope
+
+ROOM = "bus_room"
+WORKERS = 3
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Requiere sockets Unix")
+
+
+class RecordingSocket:
+    """WebSocket falso que informa cada mensaje recibido a la cola compartida."""
+
+    def __init__(self, worker_id, received):
+        self.scope = {"subprotocols": []}
+        self.worker_id = worker_id
+        self.received = received
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, text):
+        self.received.put((self.worker_id, text, time.time()))
+
+    async def close(self, code=1000):
+        pass
+
+
+def run_worker(worker_id, bus_dir, ready, stop, received):
+    async def main():
+        manager = ConnectionManager(bus=UnixSocketRoomBus(bus_dir))
+        await manager.connect(RecordingSocket(worker_id, received), ROOM)
+        ready.set()
+        while not stop.is_set():
+            await asyncio.sleep(0.01)
+        manager.bus.close()
+    asyncio.run(main())
+
+
+def test_unix_bus_reaches_every_worker(tmp_path):
+    ctx = multiprocessing.get_context("spawn")
+    received = ctx.Queue()
+    stop = ctx.Event()
+    workers = []
+    for worker_id in range(WORKERS):
+        ready = ctx.Event()
+        process = ctx.Process(target=run_worker, args=(worker_id, str(tmp_path), ready, stop, received))
+        process.start()
+        workers.append((process, ready))
+
+    try:
+        for process, ready in workers:
+            assert ready.wait(timeout=30), "El worker no arrancó"
+
+        async def publish():
+            manager = ConnectionManager(bus=UnixSocketRoomBus(str(tmp_path)))
+            for i in range(5):
+                await manager.broadcast(json.dumps({"type": "ping", "payload": i, "sent_at": time.time()}), ROOM)
+            manager.bus.close()
+        asyncio.run(publish())
+
+        deliveries = [received.get(timeout=5) for _ in range(WORKERS * 5)]
+    finally:
+        stop.set()
+        for process, _ in workers:
+            process.join(timeout=10)
+
+    by_worker = {}
+    latencies = []
+    for worker_id, text, received_at in deliveries:
+        data = json.loads(text)
+        by_worker.setdefault(worker_id, []).append(data["payload"])
+        latencies.append(received_at - data["sent_at"])
+
+    assert sorted(by_worker) == list(range(WORKERS))
+    assert all(payloads == list(range(5)) for payloads in by_worker.values())
+    assert max(latencies) < 0.5, f"Latencia máxima {max(latencies):.3f}s"
+
+
+def test_unix_bus_forgets_dead_peers(tmp_path):
+    stale = tmp_path / "stale.sock"
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    sock.bind(str(stale))
+    sock.close()
+
+    async def publish():
+        manager = ConnectionManager(bus=UnixSocketRoomBus(str(tmp_path)))
+        await manager.broadcast("hola", ROOM)
+        manager.bus.close()
+    asyncio.run(publish())
+
+    assert not stale.exists()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_local_bus_skips_empty_rooms():
+    manager = ConnectionManager(bus=LocalRoomBus())
+    delivered = []
+    manager.bus.bind(lambda room_id, message, player_id=None: delivered.append(room_id))
+    asyncio.run(manager.broadcast("hola", "vacia"))
+    assert delivered == []
+
+
+def test_unix_bus_carries_player_target(tmp_path):
+    async def scenario():
+        sender = UnixSocketRoomBus(str(tmp_path))
+        receiver = UnixSocketRoomBus(str(tmp_path))
+        delivered = asyncio.Queue()
+        sender.bind(lambda room_id, message, player_id=None: None)
+        receiver.bind(lambda room_id, message, player_id=None: delivered.put_nowait((room_id, message, player_id)))
+        receiver.ensure_started()
+        sender.ensure_started()
+        try:
+            sender.publish(ROOM, OutboundMessage('{"type":"secreto"}'), player_id=7)
+            return await asyncio.wait_for(delivered.get(), timeout=2)
+        finally:
+            sender.close()
+            receiver.close()
+
+    assert asyncio.run(scenario()) == (ROOM, '{"type":"secreto"}', 7)
+
+
+def test_unix_bus_splits_a_batch_too_big_for_one_datagram(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "WS_BUS_MAX_DATAGRAM", 256)
+    messages = [OutboundMessage(json.dumps({"type": "parte", "payload": str(i) * 100})) for i in range(3)]
+
+    async def scenario():
+        sender = UnixSocketRoomBus(str(tmp_path))
+        receiver = UnixSocketRoomBus(str(tmp_path))
+        delivered = asyncio.Queue()
+        sender.bind(lambda room_id, message, player_id=None: None)
+        receiver.bind(lambda room_id, message, player_id=None: delivered.put_nowait(message))
+        receiver.ensure_started()
+        sender.ensure_started()
+        try:
+            sender.publish(ROOM, batch_envelope(messages))
+            sender.publish(ROOM, OutboundMessage(json.dumps({"type": "enorme", "payload": "x" * 1000})))
+            received = [await asyncio.wait_for(delivered.get(), timeout=2) for _ in messages]
+            return received, sender.dropped
+        finally:
+            sender.close()
+            receiver.close()
+
+    received, dropped = asyncio.run(scenario())
+    assert received == [message.text() for message in messages]
+    assert dropped == 1
+
+
+def test_bus_drops_show_in_metrics(tmp_path):
+    manager = ConnectionManager(bus=UnixSocketRoomBus(str(tmp_path)))
+    manager.bus.dropped = 2
+    assert manager.metrics_snapshot()["bus_dropped"] == 2
+    assert ConnectionManager(bus=LocalRoomBus()).metrics_snapshot()["bus_dropped"] == 0
@@ -0,0 +1,87 @@
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src import event_timer
+from src.cards.logicEventCards import point_suspicions_service as votes
+from src.cards.logicEventCards.notSoFast import event_state_service
+from src.state_checkpoint import StateCheckpoint
+from src.timer_scheduler import timers
+
+
+@pytest.fixture
+def ephemeral_state():
+    """Aísla los dicts globales que se guardan en el checkpoint."""
+    with patch.dict(event_state_service.event_states, clear=True), \
+         patch.dict(event_timer.event_deadlines, clear=True), \
+         patch.dict(votes.Votes_received, clear=True), \
+         patch.dict(votes.End_votation, clear=True), \
+         patch.dict(votes.Order_vote, clear=True), \
+         patch.dict(votes.Current_voter_index, clear=True):
+        yield
+
+
+def test_checkpoint_round_trip_restores_votes_and_event_states(tmp_path, ephemeral_state):
+    checkpoint = StateCheckpoint(str(tmp_path / "state.json"))
+    event_state_service.event_states["7"] = "cancelled"
+    votes.Votes_received[7] = [(1, 2), (3, 2)]
+    votes.End_votation[7] = False
+    votes.Order_vote[7] = [1, 3, 5]
+    votes.Current_voter_index[7] = 2
+
+    assert checkpoint.save() is True
+    assert not (tmp_path / "state.json.tmp").exists()
+
+    event_state_service.event_states.clear()
+    votes.Votes_received.clear()
+    votes.End_votation.clear()
+    votes.Order_vote.clear()
+    votes.Current_voter_index.clear()
+    assert asyncio.run(checkpoint.load()) is True
+
+    assert event_state_service.event_states == {"7": "cancelled"}
+    assert votes.Votes_received == {7: [(1, 2), (3, 2)]}
+    assert votes.End_votation == {7: False}
+    assert votes.Order_vote == {7: [1, 3, 5]}
+    assert votes.Current_voter_index == {7: 2}
+
+
+def test_save_skips_unchanged_state(tmp_path, ephemeral_state):
+    checkpoint = StateCheckpoint(str(tmp_path / "state.json"))
+    assert checkpoint.save() is True
+    assert checkpoint.save() is False
+    votes.Order_vote[1] = [4]
+    assert checkpoint.save() is True
+
+
+def test_event_window_resumes_with_remaining_time(tmp_path, ephemeral_state):
+    path = tmp_path / "state.json"
+    event_timer.event_deadlines[(3, "sala_restart")] = time.monotonic() + 6.2
+    StateCheckpoint(str(path)).save()
+    event_timer.event_deadlines.clear()
+
+    try:
+        with patch("src.event_timer.manager.broadcast", new_callable=AsyncMock) as mock_broadcast:
+            assert asyncio.run(StateCheckpoint(str(path)).load()) is True
+
+        assert (3, "sala_restart") in timers
+        remaining = event_timer.event_deadlines[(3, "sala_restart")] - time.monotonic()
+        assert remaining == pytest.approx(6.2, abs=0.2)
+        sync = mock_broadcast.call_args[0][0].model_dump(mode="json")
+        assert sync["type"] == "COUNTDOWN_SYNC"
+        assert sync["payload"]["deadline"] - sync["payload"]["server_time"] == pytest.approx(6200, abs=200)
+    finally:
+        timers.cancel((3, "sala_restart"))
+
+
+def test_load_ignores_missing_or_corrupt_file(tmp_path, ephemeral_state):
+    path = tmp_path / "state.json"
+    assert asyncio.run(StateCheckpoint(str(path)).load()) is False
+    path.write_text("{no es json")
+    assert asyncio.run(StateCheckpoint(str(path)).load()) is False
+    path.write_text(json.dumps({"version": 999, "event_states": {"1": "active"}}))
+    asyncio.run(StateCheckpoint(str(path)).load())
+    assert event_state_service.event_states == {}
@@ -0,0 +1,128 @@
+import asyncio
+import time
+
+from src.timer_scheduler import TimerScheduler
+
+
+def recorder(fired, name, event=None, next_deadline=None):
+    async def callback():
+        fired.append(name)
+        if event is not None:
+            event.set()
+        return next_deadline
+    return callback
+
+
+def run_scheduler(scenario):
+    """Corre `scenario(scheduler)` con el driver del scheduler como tarea del mismo loop."""
+    async def main():
+        scheduler = TimerScheduler()
+        driver = asyncio.create_task(scheduler.run())
+        try:
+            return await asyncio.wait_for(scenario(scheduler), timeout=2)
+        finally:
+            driver.cancel()
+    return asyncio.run(main())
+
+
+def test_timers_fire_in_deadline_order_on_the_loop():
+    async def scenario(scheduler):
+        fired, done = [], asyncio.Event()
+        now = time.monotonic()
+        scheduler.schedule("c", now + 0.06, recorder(fired, "c", done))
+        scheduler.schedule("a", now + 0.02, recorder(fired, "a"))
+        scheduler.schedule("b", now + 0.04, recorder(fired, "b"))
+        assert scheduler.active() == 3
+
+        await done.wait()
+        assert fired == ["a", "b", "c"]
+        assert scheduler.active() == 0
+
+    run_scheduler(scenario)
+
+
+def test_cancelled_timer_never_fires():
+    async def scenario(scheduler):
+        fired, done = [], asyncio.Event()
+        now = time.monotonic()
+        scheduler.schedule("cancelled", now + 0.02, recorder(fired, "cancelled"))
+        scheduler.schedule("kept", now + 0.05, recorder(fired, "kept", done))
+
+        assert scheduler.cancel("cancelled") is True
+        assert scheduler.cancel("cancelled") is False
+        assert "cancelled" not in scheduler
+        await done.wait()
+        assert fired == ["kept"]
+
+    run_scheduler(scenario)
+
+
+def test_callback_rearms_its_key_with_the_returned_deadline():
+    async def scenario(scheduler):
+        start = time.monotonic()
+        runs, done = [], asyncio.Event()
+
+        async def tick():
+            runs.append(time.monotonic() - start)
+            if len(runs) == 3:
+                done.set()
+                return None
+            return start + 0.03 * len(runs)
+
+        scheduler.schedule("tick", start, tick)
+        await done.wait()
+        await asyncio.sleep(0)
+        assert len(runs) == 3
+        # Cada tick corre en su deadline absoluto, no acumula el atraso del anterior
+        assert runs[2] >= 0.06
+        assert scheduler.active() == 0
+
+    run_scheduler(scenario)
+
+
+def test_rescheduling_a_key_replaces_the_pending_timer():
+    async def scenario(scheduler):
+        fired, done = [], asyncio.Event()
+        now = time.monotonic()
+        scheduler.schedule("game", now + 0.02, recorder(fired, "old"))
+        scheduler.schedule("game", now + 0.04, recorder(fired, "new", done))
+        assert scheduler.active() == 1
+
+        await done.wait()
+        await asyncio.sleep(0.02)
+        assert fired == ["new"]
+
+    run_scheduler(scenario)
+
+
+def test_failing_callback_does_not_stop_the_scheduler():
+    async def scenario(scheduler):
+        fired, done = [], asyncio.Event()
+
+        async def broken():
+            raise RuntimeError("boom")
+
+        now = time.monotonic()
+        scheduler.schedule("broken", now, broken)
+        scheduler.schedule("ok", now + 0.02, recorder(fired, "ok", done))
+        await done.wait()
+        assert fired == ["ok"]
+        assert "broken" not in scheduler
+
+    run_scheduler(scenario)
+
+
+def test_timers_scheduled_before_the_driver_starts_wait_for_it():
+    scheduler = TimerScheduler()
+    fired = []
+    scheduler.schedule("early", time.monotonic(), recorder(fired, "early"))
+    assert fired == []
+
+    async def main():
+        driver = asyncio.create_task(scheduler.run())
+        await asyncio.sleep(0.02)
+        driver.cancel()
+    asyncio.run(main())
+
+    assert fired == ["early"]
+    assert scheduler.active() == 0
@@ -1,42 +1,65 @@
 import asyncio
+import json
+import pytest
 from unittest.mock import AsyncMock, patch
 from fastapi import WebSocketDisconnect
+from src.settings import settings
+from src.timer_scheduler import timers
 from src.websocket import ConnectionManager, websocket_endpoint
 
 
+@pytest.fixture(autouse=True)
+def fixed_seq():
+    # Los logs de cada room arrancan en seq 0, así el primer mensaje es el 1
+    with patch("src.websocket.random.randrange", return_value=0):
+        yield
+
+
+def room_sockets(manager, room_id):
+    return [c.websocket for c in manager.connections(room_id)]
+
+
 def test_connect_creates_new_room():
-    manager = ConnectionManager()
-    mock_ws = AsyncMock()
-    asyncio.run(manager.connect(mock_ws, "room1"))
-    assert "room1" in manager.rooms
-    assert mock_ws in manager.rooms["room1"]
-    mock_ws.accept.assert_awaited_once()
+    async def scenario():
+        manager = ConnectionManager()
+        mock_ws = AsyncMock()
+        await manager.connect(mock_ws, "room1")
+        assert "room1" in manager.rooms
+        assert mock_ws in room_sockets(manager, "room1")
+        mock_ws.accept.assert_awaited_once()
+    asyncio.run(scenario())
 
 
 def test_connect_existing_room():
-    manager = ConnectionManager()
-    mock_ws1, mock_ws2 = AsyncMock(), AsyncMock()
-    asyncio.run(manager.connect(mock_ws1, "room1"))
-    asyncio.run(manager.connect(mock_ws2, "room1"))
-    assert len(manager.rooms["room1"]) == 2
+    async def scenario():
+        manager = ConnectionManager()
+        mock_ws1, mock_ws2 = AsyncMock(), AsyncMock()
+        await manager.connect(mock_ws1, "room1")
+        await manager.connect(mock_ws2, "room1")
+        assert len(manager.rooms["room1"]) == 2
+    asyncio.run(scenario())
 
 
 def test_disconnect_removes_ws_and_deletes_room():
-    manager = ConnectionManager()
-    mock_ws = AsyncMock()
-    asyncio.run(manager.connect(mock_ws, "room1"))
-    manager.disconnect(mock_ws, "room1")
-    assert "room1" not in manager.rooms
+    async def scenario():
+        manager = ConnectionManager()
+        mock_ws = AsyncMock()
+        await manager.connect(mock_ws, "room1")
+        manager.disconnect(mock_ws, "room1")
+        assert "room1" not in manager.rooms
+    asyncio.run(scenario())
 
 
 def test_disconnect_with_remaining_clients():
-    manager = ConnectionManager()
-    ws1, ws2 = AsyncMock(), AsyncMock()
-    asyncio.run(manager.connect(ws1, "room1"))
-    asyncio.run(manager.connect(ws2, "room1"))
-    manager.disconnect(ws1, "room1")
-    assert "room1" in manager.rooms
-    assert ws2 in manager.rooms["room1"]
+    async def scenario():
+        manager = ConnectionManager()
+        ws1, ws2 = AsyncMock(), AsyncMock()
+        await manager.connect(ws1, "room1")
+        await manager.connect(ws2, "room1")
+        manager.disconnect(ws1, "room1")
+        assert "room1" in manager.rooms
+        assert room_sockets(manager, "room1") == [ws2]
+    asyncio.run(scenario())
 
 
 def test_send_message_calls_send_text():
@@ -47,13 +70,17 @@ def test_send_message_calls_send_text():
 
 
 def test_broadcast_sends_to_all_clients():
-    manager = ConnectionManager()
-    ws1, ws2 = AsyncMock(), AsyncMock()
-    asyncio.run(manager.connect(ws1, "room1"))
-    asyncio.run(manager.connect(ws2, "room1"))
-    asyncio.run(manager.broadcast("mensaje", "room1"))
-    ws1.send_text.assert_awaited_with("mensaje")
-    ws2.send_text.assert_awaited_with("mensaje")
+    async def scenario():
+        manager = ConnectionManager()
+        ws1, ws2 = AsyncMock(), AsyncMock()
+        c1 = await manager.connect(ws1, "room1")
+        c2 = await manager.connect(ws2, "room1")
+        await manager.broadcast("mensaje", "room1")
+        await c1.drain()
+        await c2.drain()
+        ws1.send_text.assert_awaited_with("mensaje")
+        ws2.send_text.assert_awaited_with("mensaje")
+    asyncio.run(scenario())
 
 
 def test_broadcast_no_room_does_nothing():
@@ -61,9 +88,74 @@ def test_broadcast_no_room_does_nothing():
     asyncio.run(manager.broadcast("mensaje", "no_existe"))
 
 
+def test_broadcast_does_not_wait_for_slow_client():
+    async def scenario():
+        manager = ConnectionManager()
+        slow, fast = AsyncMock(), AsyncMock()
+
+        async def hang(_):
+            await asyncio.sleep(10)
+        slow.send_text.side_effect = hang
+
+        await manager.connect(slow, "room1")
+        c_fast = await manager.connect(fast, "room1")
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for i in range(5):
+            await manager.broadcast(f"m{i}", "room1")
+        assert loop.time() - start < 0.05
+        await asyncio.wait_for(c_fast.drain(), timeout=1)
+        assert fast.send_text.await_count == 5
+    asyncio.run(scenario())
+
+
+def test_slow_client_is_dropped_after_send_timeout():
+    async def scenario():
+        manager = ConnectionManager()
+        slow, fast = AsyncMock(), AsyncMock()
+
+        async def hang(_):
+            await asyncio.sleep(10)
+        slow.send_text.side_effect = hang
+
+        await manager.connect(slow, "room1")
+        await manager.connect(fast, "room1")
+        with patch("src.websocket.settings.WS_SEND_TIMEOUT", 0.05):
+            await manager.broadcast("mensaje", "room1")
+            await asyncio.sleep(0.2)
+        assert room_sockets(manager, "room1") == [fast]
+        slow.close.assert_awaited()
+    asyncio.run(scenario())
+
+
+def test_client_overflowing_queue_is_dropped():
+    async def scenario():
+        manager = ConnectionManager()
+        slow = AsyncMock()
+
+        async def hang(_):
+            await asyncio.sleep(10)
+        slow.send_text.side_effect = hang
+
+        with patch("src.websocket.settings.WS_SEND_QUEUE_SIZE", 2):
+            await manager.connect(slow, "room1")
+        for i in range(5):
+            await manager.broadcast(f"m{i}", "room1")
+        assert "room1" not in manager.rooms
+    asyncio.run(scenario())
+
+
 def test_websocket_endpoint_normal_flow():
     mock_ws = AsyncMock()
-    mock_ws.receive_text = AsyncMock(side_effect=["hola", "chau", WebSocketDisconnect()])
+    messages = iter(["hola", "chau"])
+
+    async def receive():
+        await asyncio.sleep(0.01)
+        try:
+            return next(messages)
+        except StopIteration:
+            raise WebSocketDisconnect()
+    mock_ws.receive_text = AsyncMock(side_effect=receive)
     manager = ConnectionManager()
     with patch("src.websocket.manager", manager):
         asyncio.run(websocket_endpoint(mock_ws, "room1"))
@@ -80,3 +172,497 @@ def test_websocket_endpoint_disconnect_immediate():
     with patch("src.websocket.manager", manager):
         asyncio.run(websocket_endpoint(mock_ws, "room1"))
     assert "room1" not in manager.rooms
+
+
+def test_broadcast_serializes_model_once_per_room():
+    from pydantic import BaseModel
+
+    class WSPing(BaseModel):
+        type: str = "ping"
+        payload: int
+
+    async def scenario():
+        manager = ConnectionManager()
+        sockets = [AsyncMock() for _ in range(3)]
+        connections = [await manager.connect(ws, "room1") for ws in sockets]
+        message = WSPing(payload=1)
+        with patch.object(WSPing, "model_dump_json", wraps=message.model_dump_json) as dump:
+            await manager.broadcast(message, "room1")
+            for c in connections:
+                await c.drain()
+            assert dump.call_count == 1
+        for ws in sockets:
+            ws.send_text.assert_awaited_once_with('{"seq":1,"type":"ping","payload":1}')
+    asyncio.run(scenario())
+
+
+def test_broadcast_to_empty_room_skips_serialization():
+    message = AsyncMock()
+    manager = ConnectionManager()
+    asyncio.run(manager.broadcast(message, "no_existe"))
+    message.model_dump_json.assert_not_called()
+
+
+def test_msgpack_client_receives_binary_frames():
+    import msgpack
+    from pydantic import BaseModel
+
+    class WSPing(BaseModel):
+        type: str = "ping"
+        payload: int
+
+    async def scenario():
+        manager = ConnectionManager()
+        binary_ws, json_ws = AsyncMock(), AsyncMock()
+        binary_ws.scope = {"subprotocols": ["msgpack"]}
+        json_ws.scope = {"subprotocols": []}
+        c1 = await manager.connect(binary_ws, "room1")
+        c2 = await manager.connect(json_ws, "room1")
+        binary_ws.accept.assert_awaited_once_with(subprotocol="msgpack")
+        await manager.broadcast(WSPing(payload=7), "room1")
+        await c1.drain()
+        await c2.drain()
+        frame = binary_ws.send_bytes.await_args.args[0]
+        assert msgpack.unpackb(frame) == {"seq": 1, "type": "ping", "payload": 7}
+        json_ws.send_text.assert_awaited_once_with('{"seq":1,"type":"ping","payload":7}')
+    asyncio.run(scenario())
+
+
+def test_batched_broadcasts_are_sent_as_one_frame_per_room():
+    async def scenario():
+        manager = ConnectionManager()
+        ws_a, ws_b = AsyncMock(), AsyncMock()
+        c_a = await manager.connect(ws_a, "room1")
+        c_b = await manager.connect(ws_b, "room2")
+        async with manager.batched():
+            await manager.broadcast('{"type":"restock"}', "room1")
+            await manager.broadcast('{"type":"discard"}', "room1")
+            await manager.broadcast('{"type":"nextTurn"}', "room1")
+            await manager.broadcast('{"type":"solo"}', "room2")
+            ws_a.send_text.assert_not_awaited()
+        await c_a.drain()
+        await c_b.drain()
+        ws_a.send_text.assert_awaited_once_with(
+            '{"seq":1,"type":"batch","messages":[{"type":"restock"},{"type":"discard"},{"type":"nextTurn"}]}')
+        ws_b.send_text.assert_awaited_once_with('{"seq":1,"type":"solo"}')
+    asyncio.run(scenario())
+
+
+def test_broadcast_after_batch_closed_is_sent_immediately():
+    async def scenario():
+        manager = ConnectionManager()
+        ws = AsyncMock()
+        conn = await manager.connect(ws, "room1")
+        later = asyncio.Event()
+
+        async def background():
+            await later.wait()
+            await manager.broadcast('{"type":"tick"}', "room1")
+
+        async with manager.batched():
+            task = asyncio.create_task(background())
+        later.set()
+        await task
+        await conn.drain()
+        ws.send_text.assert_awaited_once_with('{"seq":1,"type":"tick"}')
+    asyncio.run(scenario())
+
+
+def test_http_request_broadcasts_are_coalesced():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from src.websocket import BroadcastBatchMiddleware, websocket_router
+
+    app = FastAPI()
+    app.add_middleware(BroadcastBatchMiddleware)
+    app.include_router(websocket_router)
+    manager = ConnectionManager()
+
+    @app.post("/action")
+    async def action():
+        await manager.broadcast('{"type":"a"}', "room1")
+        await manager.broadcast('{"type":"b"}', "room1")
+        return {}
+
+    with patch("src.websocket.manager", manager), TestClient(app) as client:
+        with client.websocket_connect("/ws/room1") as websocket:
+            assert client.post("/action").status_code == 200
+            assert websocket.receive_json() == {"seq": 1, "type": "batch", "messages": [{"type": "a"}, {"type": "b"}]}
+
+
+def test_failed_request_broadcasts_are_discarded():
+    from fastapi import FastAPI, HTTPException
+    from fastapi.testclient import TestClient
+    from src.websocket import BroadcastBatchMiddleware, websocket_router
+
+    app = FastAPI()
+    app.add_middleware(BroadcastBatchMiddleware)
+    app.include_router(websocket_router)
+    manager = ConnectionManager()
+
+    @app.post("/rejected")
+    async def rejected():
+        await manager.broadcast('{"type":"rejected"}', "room1")
+        await manager.send_to_player("room1", 1, '{"type":"rejectedHand"}')
+        raise HTTPException(status_code=400, detail="no")
+
+    @app.post("/crashed")
+    async def crashed():
+        await manager.broadcast('{"type":"crashed"}', "room1")
+        raise RuntimeError("boom")
+
+    @app.post("/ok")
+    async def ok():
+        await manager.broadcast('{"type":"ok"}', "room1")
+        return {}
+
+    with patch("src.websocket.manager", manager), TestClient(app, raise_server_exceptions=False) as client:
+        with client.websocket_connect("/ws/room1") as websocket:
+            assert client.post("/rejected").status_code == 400
+            assert client.post("/crashed").status_code == 500
+            assert client.post("/ok").status_code == 200
+            # Lo primero que llega es lo de la única request que terminó bien
+            assert websocket.receive_json() == {"seq": 1, "type": "ok"}
+
+
+def test_room_messages_are_stamped_with_increasing_seq():
+    async def scenario():
+        manager = ConnectionManager()
+        ws = AsyncMock()
+        conn = await manager.connect(ws, "room1")
+        await manager.broadcast('{"type":"a"}', "room1")
+        await manager.broadcast('{}', "room1")
+        await manager.broadcast("texto libre", "room1")
+        await conn.drain()
+        sent = [c.args[0] for c in ws.send_text.await_args_list]
+        assert sent == ['{"seq":1,"type":"a"}', '{"seq":2}', "texto libre"]
+        assert manager.logs["room1"].seq == 3
+    asyncio.run(scenario())
+
+
+def test_reconnect_with_since_replays_missed_messages():
+    async def scenario():
+        manager = ConnectionManager()
+        ws = AsyncMock()
+        conn = await manager.connect(ws, "room1")
+        await manager.broadcast('{"type":"a"}', "room1")
+        await conn.drain()
+        manager.disconnect(ws, "room1")
+
+        # Mientras el cliente está desconectado la room sigue registrando mensajes
+        await manager.broadcast('{"type":"b"}', "room1")
+        await manager.broadcast('{"type":"c"}', "room1")
+
+        again = AsyncMock()
+        conn = await manager.connect(again, "room1", since=1)
+        await conn.drain()
+        sent = [c.args[0] for c in again.send_text.await_args_list]
+        assert sent == ['{"seq":2,"type":"b"}', '{"seq":3,"type":"c"}']
+    asyncio.run(scenario())
+
+
+def test_reconnect_up_to_date_replays_nothing():
+    async def scenario():
+        manager = ConnectionManager()
+        ws = AsyncMock()
+        await manager.connect(ws, "room1")
+        await manager.broadcast('{"type":"a"}', "room1")
+        again = AsyncMock()
+        conn = await manager.connect(again, "room1", since=1)
+        await conn.drain()
+        again.send_text.assert_not_awaited()
+    asyncio.run(scenario())
+
+
+def test_reconnect_with_evicted_gap_requires_resync():
+    async def scenario():
+        manager = ConnectionManager()
+        await manager.connect(AsyncMock(), "room1")
+        for i in range(5):
+            await manager.broadcast('{"type":"m%d"}' % i, "room1")
+
+        again = AsyncMock()
+        conn = await manager.connect(again, "room1", since=1)
+        await conn.drain()
+        again.send_text.assert_awaited_once_with('{"type":"resyncRequired","payload":5}')
+    with patch("src.websocket.settings.WS_REPLAY_BUFFER_SIZE", 3):
+        asyncio.run(scenario())
+
+
+def test_reconnect_with_unknown_seq_requires_resync():
+    async def scenario():
+        manager = ConnectionManager()
+        again = AsyncMock()
+        conn = await manager.connect(again, "room1", since=12345)
+        await conn.drain()
+        again.send_text.assert_awaited_once_with('{"type":"resyncRequired","payload":0}')
+    asyncio.run(scenario())
+
+
+def test_send_to_player_reaches_only_that_player():
+    async def scenario():
+        manager = ConnectionManager()
+        ws_1, ws_2, anonymous = AsyncMock(), AsyncMock(), AsyncMock()
+        c_1 = await manager.connect(ws_1, "room1", player_id=1)
+        c_2 = await manager.connect(ws_2, "room1", player_id=2)
+        c_anon = await manager.connect(anonymous, "room1")
+        await manager.send_to_player("room1", 2, '{"type":"card"}')
+        for c in (c_1, c_2, c_anon):
+            await c.drain()
+        ws_2.send_text.assert_awaited_once_with('{"seq":1,"type":"card"}')
+        ws_1.send_text.assert_not_awaited()
+        anonymous.send_text.assert_not_awaited()
+    asyncio.run(scenario())
+
+
+def test_private_socket_requires_a_player_of_the_game(client):
+    from datetime import date
+    from src.conftest import TestingSessionLocal
+    from src.game.models import Game
+    from src.gamePlayer.models import PlayerGame
+    from src.player.models import Player
+
+    with TestingSessionLocal() as db:
+        game = Game(name="Privada", max_players=4, min_players=2)
+        players = [Player(name=f"p{i}", avatar="a", birthdate=date(1990, 1, 1), is_Social_Disgrace=False,
+                          is_Your_Turn=False, is_Owner=False, rol="innocent") for i in range(2)]
+        db.add_all([game, *players])
+        db.flush()
+        db.add(PlayerGame(game_id=game.id, player_id=players[0].id))
+        db.commit()
+        game_id, member, stranger = game.id, players[0].id, players[1].id
+
+    with patch("src.websocket.session", TestingSessionLocal):
+        with client.websocket_connect(f"/ws/{game_id}?player_id={member}") as websocket:
+            websocket.send_text('{"type":"pong"}')
+        for room_id, player_id in ((game_id, stranger), ("0", member)):
+            with pytest.raises(WebSocketDisconnect) as rejected:
+                with client.websocket_connect(f"/ws/{room_id}?player_id={player_id}"):
+                    pass
+            assert rejected.value.code == 1008
+
+
+def test_replay_only_includes_own_private_messages():
+    async def scenario():
+        manager = ConnectionManager()
+        await manager.connect(AsyncMock(), "room1", player_id=1)
+        await manager.broadcast('{"type":"public"}', "room1")
+        await manager.send_to_player("room1", 1, '{"type":"mine"}')
+        await manager.send_to_player("room1", 2, '{"type":"theirs"}')
+
+        again = AsyncMock()
+        conn = await manager.connect(again, "room1", since=0, player_id=1)
+        await conn.drain()
+        sent = [c.args[0] for c in again.send_text.await_args_list]
+        assert sent == ['{"seq":1,"type":"public"}', '{"seq":2,"type":"mine"}']
+    asyncio.run(scenario())
+
+
+def test_send_to_player_keeps_order_with_batched_broadcasts():
+    async def scenario():
+        manager = ConnectionManager()
+        ws = AsyncMock()
+        conn = await manager.connect(ws, "room1", player_id=1)
+        async with manager.batched():
+            await manager.broadcast('{"type":"discard"}', "room1")
+            await manager.send_to_player("room1", 1, '{"type":"trade"}')
+            await manager.broadcast('{"type":"nextTurn"}', "room1")
+        await conn.drain()
+        sent = [c.args[0] for c in ws.send_text.await_args_list]
+        assert sent == ['{"seq":1,"type":"discard"}', '{"seq":2,"type":"trade"}', '{"seq":3,"type":"nextTurn"}']
+    asyncio.run(scenario())
+
+
+def test_countdown_ticks_only_reach_sockets_that_opted_in():
+    async def scenario():
+        manager = ConnectionManager()
+        modern, legacy = AsyncMock(), AsyncMock()
+        c_modern = await manager.connect(modern, "room1")
+        c_legacy = await manager.connect(legacy, "room1", ticks=True)
+        async with manager.batched():
+            await manager.broadcast('{"type":"EVENT_STARTED"}', "room1")
+            await manager.broadcast('{"type":"COUNTDOWN_TICK"}', "room1")
+            await manager.broadcast('{"type":"COUNTDOWN_END"}', "room1")
+        for c in (c_modern, c_legacy):
+            await c.drain()
+        assert [c.args[0] for c in modern.send_text.await_args_list] == [
+            '{"seq":1,"type":"EVENT_STARTED"}', '{"seq":3,"type":"COUNTDOWN_END"}',
+        ]
+        assert [c.args[0] for c in legacy.send_text.await_args_list] == [
+            '{"seq":1,"type":"EVENT_STARTED"}', '{"seq":2,"type":"COUNTDOWN_TICK"}', '{"seq":3,"type":"COUNTDOWN_END"}',
+        ]
+
+        again = AsyncMock()
+        conn = await manager.connect(again, "room1", since=0)
+        await conn.drain()
+        assert [c.args[0] for c in again.send_text.await_args_list] == [
+            '{"seq":1,"type":"EVENT_STARTED"}', '{"seq":3,"type":"COUNTDOWN_END"}',
+        ]
+    asyncio.run(scenario())
+
+
+def test_reaper_pings_idle_sockets_and_drops_unresponsive_ones():
+    async def scenario():
+        manager = ConnectionManager()
+        quiet, alive = AsyncMock(), AsyncMock()
+        c_quiet = await manager.connect(quiet, "room1")
+        c_alive = await manager.connect(alive, "room1")
+        start = c_quiet.last_seen
+
+        assert manager.reap(now=start + settings.WS_PING_INTERVAL + 1) == 0
+        await c_quiet.drain()
+        quiet.send_text.assert_awaited_once_with('{"type":"ping"}')
+
+        c_alive.last_seen = start + settings.WS_PING_TIMEOUT
+        assert manager.reap(now=start + settings.WS_PING_TIMEOUT + 1) == 1
+        await asyncio.sleep(0.01)
+        assert room_sockets(manager, "room1") == [alive]
+        quiet.close.assert_awaited_once_with(code=1008)
+        assert manager.reaped_connections == 1
+        assert manager.metrics_snapshot()["reaped_connections"] == 1
+    asyncio.run(scenario())
+
+
+def test_reaper_evicts_logs_of_empty_rooms():
+    async def scenario():
+        manager = ConnectionManager()
+        ws = AsyncMock()
+        await manager.connect(ws, "room1")
+        manager.disconnect(ws, "room1")
+        touched = manager.logs["room1"].touched
+
+        manager.reap(now=touched + settings.WS_ROOM_LOG_TTL - 1)
+        assert "room1" in manager.logs
+        manager.reap(now=touched + settings.WS_ROOM_LOG_TTL + 1)
+        assert manager.logs == {}
+    asyncio.run(scenario())
+
+
+def test_websocket_endpoint_does_not_broadcast_pongs():
+    mock_ws = AsyncMock()
+    messages = iter(['{"type":"pong"}', "hola"])
+
+    async def receive():
+        await asyncio.sleep(0.01)
+        try:
+            return next(messages)
+        except StopIteration:
+            raise WebSocketDisconnect()
+    mock_ws.receive_text = AsyncMock(side_effect=receive)
+    manager = ConnectionManager()
+    with patch("src.websocket.manager", manager):
+        asyncio.run(websocket_endpoint(mock_ws, "room1"))
+    sent = [c.args[0] for c in mock_ws.send_text.await_args_list]
+    assert sent == ["hola"]
+
+
+def test_metrics_count_messages_bytes_and_latency():
+    async def scenario():
+        manager = ConnectionManager()
+        ws_1, ws_2 = AsyncMock(), AsyncMock()
+        c_1 = await manager.connect(ws_1, "room1", player_id=1)
+        c_2 = await manager.connect(ws_2, "room1", player_id=2)
+        await manager.broadcast('{"type":"gameNextTurn","payload":2}', "room1")
+        await manager.broadcast('{"type":"gameNextTurn","payload":3}', "room1")
+        await manager.send_to_player("room1", 1, '{"type":"card_trade_request"}')
+        await c_1.drain()
+        await c_2.drain()
+
+        snapshot = manager.metrics_snapshot()
+        frame = len('{"seq":1,"type":"gameNextTurn","payload":2}')
+        assert snapshot["connections"] == 2
+        assert snapshot["rooms"] == {"room1": 2}
+        assert snapshot["broadcasts"] == 2
+        assert snapshot["broadcasts_per_second"] > 0
+        assert snapshot["messages_by_type"] == {"gameNextTurn": 2, "card_trade_request": 1}
+        assert snapshot["frames_sent"] == 5
+        assert snapshot["bytes_sent"] == 4 * frame + len('{"seq":3,"type":"card_trade_request"}')
+        assert 0 <= snapshot["fanout_latency"]["p50"] <= snapshot["fanout_latency"]["p99"]
+        assert [q["queue_depth"] for q in snapshot["send_queues"]] == [0, 0]
+    asyncio.run(scenario())
+
+
+def test_websocket_metrics_endpoint(client):
+    manager = ConnectionManager()
+    manager.reaped_connections = 3
+    manager.metrics.observe_message("gameNextTurn")
+    with patch("src.websocket.manager", manager):
+        response = client.get("/ws/metrics")
+        prometheus = client.get("/ws/metrics", params={"format": "prometheus"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["connections"] == 0
+    assert data["broadcasts"] == 1
+    assert data["messages_by_type"] == {"gameNextTurn": 1}
+    assert data["reaped_connections"] == 3
+    assert data["bus_dropped"] == 0
+    assert data["active_timers"] == timers.active()
+
+    assert prometheus.status_code == 200
+    assert prometheus.headers["content-type"].startswith("text/plain")
+    assert "ws_broadcasts_total 1" in prometheus.text
+    assert 'ws_messages_total{type="gameNextTurn"} 1' in prometheus.text
+    assert "ws_reaped_connections_total 3" in prometheus.text
+    assert "ws_bus_dropped_total 0" in prometheus.text
+    assert f"timers_active {timers.active()}" in prometheus.text
+
+
+class CountingSocket:
+    """WebSocket mínimo para pruebas de carga: guarda los seq recibidos."""
+
+    def __init__(self):
+        self.seqs = []
+
+    async def accept(self, subprotocol=None):
+        pass
+
+    async def send_text(self, text):
+        self.seqs.append(json.loads(text).get("seq"))
+
+    async def close(self, code=1000):
+        pass
+
+
+def test_membership_churn_under_concurrent_broadcasts():
+    rooms = [f"stress{i}" for i in range(4)]
+    stable_per_room = 25
+    churn_tasks = 4
+    churn_per_task = 750
+    broadcasts_per_room = 200
+    manager = ConnectionManager()
+
+    async def churn(worker):
+        for i in range(churn_per_task):
+            room_id = rooms[(worker + i) % len(rooms)]
+            ws = CountingSocket()
+            await manager.connect(ws, room_id)
+            if i % 3 == 0:
+                await asyncio.sleep(0)
+            manager.disconnect(ws, room_id)
+
+    async def scenario():
+        stable = {room_id: [CountingSocket() for _ in range(stable_per_room)] for room_id in rooms}
+        connections = [
+            await manager.connect(ws, room_id) for room_id, sockets in stable.items() for ws in sockets
+        ]
+        workers = [churn(w) for w in range(churn_tasks)]
+
+        async def broadcaster():
+            for i in range(broadcasts_per_room):
+                for room_id in rooms:
+                    await manager.broadcast('{"type":"tick","payload":%d}' % i, room_id)
+                await asyncio.sleep(0)
+
+        await asyncio.gather(broadcaster(), *workers)
+        for connection in connections:
+            await connection.drain()
+        for room_id, sockets in stable.items():
+            for ws in sockets:
+                assert len(ws.seqs) == broadcasts_per_room
+                assert ws.seqs == list(range(ws.seqs[0], ws.seqs[0] + broadcasts_per_room))
+            for ws in sockets:
+                manager.disconnect(ws, room_id)
+
+    asyncio.run(scenario())
+    assert manager.rooms == {}
+    assert manager.connections() == ()
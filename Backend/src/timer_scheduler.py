@@ -0,0 +1,120 @@
+"""Scheduler central de timers: un solo loop maneja todas las ventanas de evento."""
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Awaitable, Callable, Hashable
+
+TimerCallback = Callable[[], Awaitable[float | None]]
+
+
+class Timer:
+    __slots__ = ("key", "deadline", "callback", "cancelled")
+
+    def __init__(self, key: Hashable, deadline: float, callback: TimerCallback):
+        self.key = key
+        self.deadline = deadline
+        self.callback = callback
+        self.cancelled = False
+
+
+class TimerScheduler:
+    """
+    Heap of timers keyed by an arbitrary hashable, driven by one task.
+
+    Deadlines are absolute `time.monotonic()` values, so a chain of ticks
+    computed from a fixed start never drifts. A callback may return the
+    deadline of its next run to re-arm the same key; returning None ends
+    the timer. Cancelled timers are dropped lazily when they reach the top
+    of the heap.
+
+    The driver is `run()`, a single task on the app loop started from the
+    lifespan and cancelled on shutdown, so timers outlive the request that
+    scheduled them. Timers scheduled before it starts wait in the heap.
+    Callbacks run on the app loop and must not block it.
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[float, int, Timer]] = []
+        self._timers: dict[Hashable, Timer] = {}
+        self._order = itertools.count()
+        self._wakeup: asyncio.Event | None = None
+
+    def schedule(self, key: Hashable, deadline: float, callback: TimerCallback) -> None:
+        """Programa `callback` para `deadline` (time.monotonic()); reemplaza el timer previo de `key`."""
+        timer = Timer(key, deadline, callback)
+        previous = self._timers.get(key)
+        if previous is not None:
+            previous.cancelled = True
+        self._timers[key] = timer
+        self._push(timer)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def cancel(self, key: Hashable) -> bool:
+        """Cancela el timer de `key`. Retorna False si no había ninguno activo."""
+        timer = self._timers.pop(key, None)
+        if timer is None:
+            return False
+        timer.cancelled = True
+        return True
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._timers
+
+    def active(self) -> int:
+        return len(self._timers)
+
+    def _push(self, timer: Timer) -> None:
+        heapq.heappush(self._heap, (timer.deadline, next(self._order), timer))
+
+    def _pop_due(self, now: float) -> tuple[list[Timer], float | None]:
+        due = []
+        while self._heap:
+            deadline, _, timer = self._heap[0]
+            if timer.cancelled:
+                heapq.heappop(self._heap)
+                continue
+            if deadline > now:
+                return due, deadline
+            heapq.heappop(self._heap)
+            due.append(timer)
+        return due, None
+
+    async def run(self):
+        """Dispara los timers a medida que vencen, hasta que se cancela la tarea."""
+        self._wakeup = asyncio.Event()
+        try:
+            while True:
+                # Se limpia antes de mirar el heap para no perder un schedule() de un callback
+                self._wakeup.clear()
+                due, next_deadline = self._pop_due(time.monotonic())
+                for timer in due:
+                    await self._fire(timer)
+                if due:
+                    continue
+                timeout = None if next_deadline is None else max(0.0, next_deadline - time.monotonic())
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._wakeup = None
+
+    async def _fire(self, timer: Timer) -> None:
+        try:
+            next_deadline = await timer.callback()
+        except Exception as e:
+            print(f"Timer {timer.key}: error en el callback: {e}")
+            next_deadline = None
+        if timer.cancelled or self._timers.get(timer.key) is not timer:
+            return
+        if next_deadline is None:
+            del self._timers[timer.key]
+            return
+        timer.deadline = next_deadline
+        self._push(timer)
+
+
+timers = TimerScheduler()
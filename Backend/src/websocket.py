@@ -1,42 +1,795 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+import asyncio
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+
+from src.settings import settings
+from src.models.db import session
+from src.gamePlayer.models import PlayerGame
+from src.room_bus import create_room_bus
+from src.lobby_digest import LOBBY_EVENTS, LOBBY_ROOM, LobbyDigest, LobbyFilterEnum
+from src.timer_scheduler import timers
+from src.ws_metrics import WebSocketMetrics, render_prometheus
+
+try:
+    import msgpack
+except ImportError:  # el subprotocolo binario es opcional
+    msgpack = None
 
 websocket_router = APIRouter()
 
-class ConnectionManager:
+MSGPACK_SUBPROTOCOL = "msgpack"
+
+_TYPE_FIELD = re.compile(r'"type"\s*:\s*"([^"]*)"')
+
+
+# Mensajes que solo reciben los sockets que los pidieron con ?ticks=true
+# (la cuenta regresiva segundo a segundo de los clientes viejos)
+TICK_TYPES = {"COUNTDOWN_TICK"}
+
+
+def message_type(message: BaseModel | str) -> str | None:
+    """Campo `type` de un mensaje WS, sin serializarlo ni parsearlo entero."""
+    if not isinstance(message, str):
+        return getattr(message, "type", None)
+    match = _TYPE_FIELD.search(message)
+    return match.group(1) if match else None
+
+
+class OutboundMessage:
+    """
+    Wrap a message sent to a room and cache its encoded frames.
+
+    Each encoding is computed at most once, lazily, the first time a
+    connection that needs it is about to send, so a broadcast costs one
+    serialization per room no matter how many clients are listening.
+    """
+
+    __slots__ = ("_model", "_text", "_binary", "_text_size")
+
+    def __init__(self, message: BaseModel | str):
+        self._model = message if isinstance(message, BaseModel) else None
+        self._text = message if isinstance(message, str) else None
+        self._binary = None
+        self._text_size = None
+
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self._model.model_dump_json()
+        return self._text
+
+    def message_type(self) -> str | None:
+        return message_type(self._model if self._model is not None else self.text())
+
+    def text_size(self) -> int:
+        """Tamaño en bytes del frame de texto (UTF-8)."""
+        if self._text_size is None:
+            self._text_size = len(self.text().encode())
+        return self._text_size
+
+    def data(self):
+        """Contenido del mensaje como objeto JSON (None si es texto libre)."""
+        if self._model is not None:
+            return self._model.model_dump(mode="json")
+        try:
+            return json.loads(self.text())
+        except ValueError:
+            return None
+
+    def binary(self) -> bytes | str:
+        if self._binary is None:
+            data = self.data()
+            # Texto libre (no JSON): se reenvía como frame de texto
+            self._binary = self.text() if data is None else msgpack.packb(data)
+        return self._binary
+
+    def with_seq(self, seq: int, player_id: int | None = None) -> "OutboundMessage":
+        return SequencedMessage(self, seq, player_id)
+
+
+class SequencedMessage(OutboundMessage):
+    """
+    An OutboundMessage stamped with its room sequence number.
+
+    The `seq` key is spliced into the already serialized JSON object, so
+    stamping does not serialize the message a second time. `player_id` is
+    set for messages addressed to a single player of the room.
+    """
+
+    __slots__ = ("_base", "seq", "player_id")
+
+    def __init__(self, base: OutboundMessage, seq: int, player_id: int | None = None):
+        super().__init__("")
+        self._text = None
+        self._base = base
+        self.seq = seq
+        self.player_id = player_id
+
+    def text(self) -> str:
+        if self._text is None:
+            base = self._base.text()
+            if not base.startswith("{"):
+                self._text = base
+            elif base[1:].lstrip().startswith("}"):
+                self._text = '{"seq":%d}' % self.seq
+            else:
+                self._text = '{"seq":%d,%s' % (self.seq, base[1:])
+        return self._text
+
+    def message_type(self) -> str | None:
+        return self._base.message_type()
+
+    def data(self):
+        data = self._base.data()
+        if isinstance(data, dict):
+            data = {"seq": self.seq, **data}
+        return data
+
+
+class RoomLog:
+    """
+    Bounded log of the last messages delivered to a room.
+
+    Sequence numbers start at a random offset for every new log, so a
+    `since` coming from another worker or from a log that was already
+    discarded falls outside the buffered range and triggers a resync
+    instead of replaying the wrong messages.
+    """
+
+    def __init__(self, size: int):
+        self.seq = random.randrange(1 << 40)
+        self.messages: deque[SequencedMessage] = deque(maxlen=size)
+        self.touched = time.monotonic()
+
+    def append(self, message: OutboundMessage, player_id: int | None = None) -> SequencedMessage:
+        self.touched = time.monotonic()
+        self.seq += 1
+        stamped = message.with_seq(self.seq, player_id)
+        self.messages.append(stamped)
+        return stamped
+
+    def since(self, seq: int, player_id: int | None = None) -> list[SequencedMessage] | None:
+        """
+        Mensajes posteriores a `seq` visibles para `player_id`, o None si ya
+        no están en el buffer.
+        """
+        first = self.messages[0].seq if self.messages else self.seq + 1
+        if seq > self.seq or seq < first - 1:
+            return None
+        return [
+            m for m in self.messages
+            if m.seq > seq and (m.player_id is None or m.player_id == player_id)
+        ]
+
+
+class WSResyncRequired(BaseModel):
+    type: str = "resyncRequired"
+    payload: int
+
+
+# Heartbeat de aplicación: el cliente responde cada ping con {"type": "pong"}
+PING_MESSAGE = OutboundMessage('{"type":"ping"}')
+
+
+def is_pong(text: str) -> bool:
+    if '"pong"' not in text:
+        return False
+    try:
+        return json.loads(text).get("type") == "pong"
+    except (ValueError, AttributeError):
+        return False
+
+
+class MessageBatch:
+    """
+    Collect the broadcasts made while handling one action, per room.
+
+    When flushed, each room gets a single frame: the message itself if
+    there was only one, or a `{"type": "batch", "messages": [...]}`
+    envelope keeping the original order. Messages for a single player
+    wait in the same queue and go out on their own, in order. A discarded
+    batch (the action failed) sends nothing.
+    """
+
     def __init__(self):
-        self.rooms: dict[str, list[WebSocket]] = {}
+        self.rooms: dict[str, list[tuple[OutboundMessage, int | None]]] = {}
+        self.closed = False
+
+    def add(self, room_id: str, message: BaseModel | str, player_id: int | None = None) -> bool:
+        if self.closed:
+            return False
+        self.rooms.setdefault(room_id, []).append((OutboundMessage(message), player_id))
+        return True
+
+    def discard(self) -> None:
+        """Olvida lo acumulado: lo que anunciaba no se confirmó."""
+        self.rooms.clear()
+        self.closed = True
+
+
+class Deferred:
+    """
+    Awaits que deja pendientes el código sync de una acción (el que corre en
+    un thread con `run_db`): desde ahí no se puede esperar a `manager` ni a
+    nada atado al event loop. `run()` los hace en orden, ya en el loop.
+    """
+
+    def __init__(self):
+        self.calls: list[tuple] = []
+
+    def add(self, function, *args, **kwargs) -> None:
+        self.calls.append((function, args, kwargs))
+
+    async def run(self) -> None:
+        calls, self.calls = self.calls, []
+        for function, args, kwargs in calls:
+            await function(*args, **kwargs)
+
+
+class BatchMessage(OutboundMessage):
+    """
+    A `batch` frame that keeps the messages it was built from.
 
-    async def connect(self, websocket: WebSocket, room_id: str):
-        await websocket.accept()
-        if room_id not in self.rooms:
-            self.rooms[room_id] = []
-        self.rooms[room_id].append(websocket)
+    The room bus falls back to sending `messages` one by one when the
+    whole batch does not fit in a single datagram.
+    """
+
+    __slots__ = ("messages",)
+
+    def __init__(self, messages: list[OutboundMessage]):
+        super().__init__('{"type":"batch","messages":[' + ",".join(m.text() for m in messages) + "]}")
+        self.messages = messages
+
+
+def batch_envelope(messages: list[OutboundMessage]) -> OutboundMessage:
+    if len(messages) == 1:
+        return messages[0]
+    return BatchMessage(messages)
+
+
+# Batch de la request en curso (None fuera de una request HTTP)
+_pending_batch: ContextVar[MessageBatch | None] = ContextVar("ws_pending_batch", default=None)
+
+
+class Connection:
+    """
+    Socket de un cliente con su propia cola de salida acotada.
+
+    Una tarea escritora dedicada vacía la cola, así que un cliente lento
+    solo atrasa sus propios mensajes y nunca al que hace el broadcast ni
+    al resto de la room. Se desconecta a los clientes que desbordan la
+    cola o que tardan más de `WS_SEND_TIMEOUT` en enviar un frame.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        room_id: str,
+        manager: "ConnectionManager",
+        binary: bool = False,
+        player_id: int | None = None,
+        digest: LobbyFilterEnum | None = None,
+        ticks: bool = False,
+    ):
+        self.id = next(Connection._ids)
+        self.websocket = websocket
+        self.room_id = room_id
+        self.player_id = player_id
+        # Suscripción al digest del lobby: recibe lobbyDigest en vez de cada evento
+        self.digest = digest
+        self.ticks = ticks
+        self.binary = binary
+        self.closed = False
+        self.last_seen = time.monotonic()
+        self.last_ping = self.last_seen
+        self._manager = manager
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=settings.WS_SEND_QUEUE_SIZE)
+        self._loop = asyncio.get_running_loop()
+        self._writer = self._loop.create_task(self._write_loop())
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def enqueue(self, message: OutboundMessage) -> None:
+        """Encola un mensaje sin bloquear."""
+        if self.closed:
+            return
+        self._put(message, time.monotonic())
+
+    def expire(self) -> None:
+        """Desconecta el socket."""
+        self._drop()
+
+    def _put(self, message: OutboundMessage, queued_at: float) -> None:
+        if self.closed:
+            return
+        try:
+            self._queue.put_nowait((message, queued_at))
+        except asyncio.QueueFull:
+            print(f"Cliente lento en la room {self.room_id}: cola llena, desconectando")
+            self._drop()
+
+    async def _write_loop(self):
+        try:
+            while True:
+                message, queued_at = await self._queue.get()
+                # asyncio.wait en lugar de wait_for: wait_for puede tragarse la
+                # cancelación si el envío termina justo al cancelar el writer
+                send = asyncio.ensure_future(self._send(message))
+                try:
+                    done, _ = await asyncio.wait((send,), timeout=settings.WS_SEND_TIMEOUT)
+                finally:
+                    send.cancel()
+                    self._queue.task_done()
+                if not done:
+                    raise asyncio.TimeoutError
+                nbytes = send.result()
+                self._manager.metrics.observe_send(nbytes, time.monotonic() - queued_at)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            print(f"Cliente trabado en la room {self.room_id}: timeout de envío, desconectando")
+        except Exception:
+            pass
+        finally:
+            self._drop()
+
+    async def _send(self, message: OutboundMessage) -> int:
+        if self.binary:
+            frame = message.binary()
+            if isinstance(frame, bytes):
+                await self.websocket.send_bytes(frame)
+                return len(frame)
+        await self.websocket.send_text(message.text())
+        return message.text_size()
+
+    def _drop(self) -> None:
+        if self.closed:
+            return
+        self._manager.disconnect(self.websocket, self.room_id)
+        if not self._loop.is_closed():
+            self._loop.create_task(self._close_socket())
+
+    async def _close_socket(self):
+        try:
+            await asyncio.wait_for(self.websocket.close(code=1008), timeout=settings.WS_SEND_TIMEOUT)
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """Detiene el writer. Los mensajes pendientes se descartan."""
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            current = asyncio.current_task()
+        except RuntimeError:
+            current = None
+        if self._writer is not current and not self._loop.is_closed():
+            self._writer.cancel()
+
+    async def drain(self) -> None:
+        """Espera a que se hayan enviado todos los mensajes encolados."""
+        await self._queue.join()
+
+
+class ConnectionManager:
+    """
+    Registro de los sockets abiertos de cada room.
+
+    Cada room mapea ids de conexión a conexiones y `_sockets` las indexa
+    por socket, así que entrar y salir es O(1). Sockets, broadcasts y
+    timers viven en el loop de la app; el lock re-entrante solo mantiene
+    consistente el registro para el endpoint de métricas, que lo lee
+    desde un thread. El fan-out recorre un snapshot inmutable por room
+    que se rearma solo cuando cambian los miembros de la room.
+    """
+
+    def __init__(self, bus=None):
+        self.rooms: dict[str, dict[int, Connection]] = {}
+        self.logs: dict[str, RoomLog] = {}
+        self._sockets: dict[int, Connection] = {}
+        self._snapshots: dict[str, tuple[Connection, ...]] = {}
+        # RLock: un enqueue que desborda la cola desconecta desde adentro del lock
+        self._lock = threading.RLock()
+        self.bus = bus or create_room_bus()
+        self.bus.bind(self.deliver)
+        self.reaped_connections = 0
+        self.metrics = WebSocketMetrics()
+        self.lobby = LobbyDigest(OutboundMessage)
+        self._reaper: asyncio.Task | None = None
+
+    async def connect(
+        self,
+        websocket: WebSocket,
+        room_id: str,
+        since: int | None = None,
+        player_id: int | None = None,
+        digest: LobbyFilterEnum | None = None,
+        ticks: bool = False,
+    ) -> Connection:
+        """
+        Acepta el socket y lo suma a la room. Si el cliente indica `since`
+        (último seq recibido) se le reenvían los mensajes perdidos, o un
+        `resyncRequired` si ya no están en el buffer. Con `player_id` el
+        socket recibe además los mensajes privados de ese jugador. En el
+        lobby, `digest` cambia los eventos de partidas y jugadores por un
+        `lobbyDigest` periódico con los cambios acumulados. Solo con `ticks`
+        llegan los COUNTDOWN_TICK de cada segundo.
+        """
+        if room_id != LOBBY_ROOM:
+            digest = None
+        scope = getattr(websocket, "scope", None)
+        offered = scope.get("subprotocols", []) if isinstance(scope, dict) else []
+        binary = msgpack is not None and MSGPACK_SUBPROTOCOL in offered
+        if binary:
+            await websocket.accept(subprotocol=MSGPACK_SUBPROTOCOL)
+        else:
+            await websocket.accept()
+        self.bus.ensure_started()
+        self._ensure_reaper()
+        connection = Connection(websocket, room_id, self, binary=binary, player_id=player_id, digest=digest, ticks=ticks)
+        if digest is not None:
+            self.lobby.subscribe(connection)
+        with self._lock:
+            self.rooms.setdefault(room_id, {})[connection.id] = connection
+            self._sockets[id(websocket)] = connection
+            self._snapshots.pop(room_id, None)
+            log = self.logs.get(room_id)
+            if log is None:
+                log = self.logs[room_id] = RoomLog(settings.WS_REPLAY_BUFFER_SIZE)
+            # Dentro del lock: ningún mensaje puede quedar entre el replay y el registro
+            if since is not None:
+                missed = log.since(since, player_id)
+                if missed is None:
+                    connection.enqueue(OutboundMessage(WSResyncRequired(payload=log.seq)))
+                else:
+                    for message in missed:
+                        if ticks or message.message_type() not in TICK_TYPES:
+                            connection.enqueue(message)
+        return connection
 
     def disconnect(self, websocket: WebSocket, room_id: str):
-        if room_id in self.rooms:
-            self.rooms[room_id].remove(websocket)
-            if not self.rooms[room_id]:
+        with self._lock:
+            connection = self._sockets.get(id(websocket))
+            if connection is None or connection.room_id != room_id:
+                return
+            del self._sockets[id(websocket)]
+            room = self.rooms[room_id]
+            del room[connection.id]
+            self._snapshots.pop(room_id, None)
+            if not room:
                 del self.rooms[room_id]  # eliminar room vacía
+                if room_id in self.logs:
+                    self.logs[room_id].touched = time.monotonic()
+        if connection.digest is not None:
+            self.lobby.unsubscribe(connection)
+        connection.close()
+
+    def connections(self, room_id: str | None = None) -> tuple[Connection, ...]:
+        """Snapshot inmutable de las conexiones de una room (o de todas)."""
+        with self._lock:
+            if room_id is None:
+                return tuple(self._sockets.values())
+            snapshot = self._snapshots.get(room_id)
+            if snapshot is None:
+                snapshot = tuple(self.rooms.get(room_id, {}).values())
+                if snapshot:
+                    self._snapshots[room_id] = snapshot
+            return snapshot
+
+    def reap(self, now: float | None = None) -> int:
+        """
+        Una pasada del reaper: manda ping a los sockets sin actividad desde
+        hace WS_PING_INTERVAL, desconecta los que no respondieron en
+        WS_PING_TIMEOUT y descarta los logs de rooms vacías vencidos.
+        Retorna la cantidad de sockets desconectados.
+        """
+        now = time.monotonic() if now is None else now
+        reaped = 0
+        for connection in self.connections():
+            idle = now - connection.last_seen
+            if idle > settings.WS_PING_TIMEOUT:
+                print(f"Socket sin respuesta en la room {connection.room_id}: desconectando")
+                connection.expire()
+                reaped += 1
+            elif idle > settings.WS_PING_INTERVAL and now - connection.last_ping > settings.WS_PING_INTERVAL:
+                connection.last_ping = now
+                connection.enqueue(PING_MESSAGE)
+        with self._lock:
+            for room_id, log in list(self.logs.items()):
+                if room_id not in self.rooms and now - log.touched > settings.WS_ROOM_LOG_TTL:
+                    del self.logs[room_id]
+            self.reaped_connections += reaped
+        return reaped
+
+    def drop_room_log(self, room_id: str) -> bool:
+        """Descarta ya el log de una room sin conexiones (p. ej. de una partida terminada)."""
+        with self._lock:
+            if room_id in self.rooms:
+                return False
+            return self.logs.pop(room_id, None) is not None
+
+    def _ensure_reaper(self) -> None:
+        # Se (re)arranca en el loop actual si no existe o si su loop murió
+        if self._reaper is not None and not self._reaper.done() and not self._reaper.get_loop().is_closed():
+            return
+        self._reaper = asyncio.get_running_loop().create_task(self._reap_loop())
+
+    async def _reap_loop(self):
+        while True:
+            await asyncio.sleep(settings.WS_PING_INTERVAL / 2)
+            self.reap()
+
+    def metrics_snapshot(self) -> dict:
+        with self._lock:
+            rooms = {room_id: len(connections) for room_id, connections in self.rooms.items()}
+        metrics = self.metrics
+        return {
+            "connections": sum(rooms.values()),
+            "rooms": rooms,
+            "room_logs": len(self.logs),
+            "broadcasts": metrics.broadcasts,
+            "broadcasts_per_second": metrics.broadcasts_per_second(),
+            "messages_by_type": dict(metrics.messages_by_type),
+            "bytes_sent": metrics.bytes_sent,
+            "frames_sent": metrics.frames_sent,
+            "fanout_latency": {**metrics.latency_quantiles(), "sum": metrics.latency_sum},
+            "send_queues": [
+                {
+                    "connection_id": c.id,
+                    "room_id": c.room_id,
+                    "player_id": c.player_id,
+                    "queue_depth": c.queue_depth,
+                }
+                for c in self.connections()
+            ],
+            "reaped_connections": self.reaped_connections,
+            "bus_dropped": self.bus.dropped,
+            "active_timers": timers.active(),
+        }
 
     async def send_message(self, message: str, websocket: WebSocket):
         await websocket.send_text(message)
 
-    async def broadcast(self, message: str, room_id: str = "0"):
-        if room_id in self.rooms:
-            for connection in self.rooms[room_id]:
-                await connection.send_text(message)
+    async def broadcast(self, message: BaseModel | str, room_id: str = "0"):
+        """
+        Encola el mensaje en cada conexión de la room y retorna enseguida.
+        El envío real lo hace el writer de cada conexión.
+
+        `message` puede ser un modelo `WS*Message` o un string ya serializado.
+        El modelo se serializa como mucho una vez por encoding y nunca si la
+        room está vacía. Con un bus compartido el mensaje llega también a los
+        sockets de los demás workers.
+
+        Los COUNTDOWN_TICK no entran al batch (cada socket decide si los
+        recibe): sale lo acumulado para la room y después el tick solo.
+        """
+        room_id = str(room_id)
+        kind = message_type(message)
+        self.metrics.observe_message(kind)
+        batch = _pending_batch.get()
+        if kind in TICK_TYPES:
+            self._flush_room(batch, room_id)
+        elif batch is not None and batch.add(room_id, message):
+            return
+        if not self._has_audience(room_id):
+            return
+        self.bus.publish(room_id, OutboundMessage(message))
+
+    async def send_to_player(self, room_id: str, player_id: int, message: BaseModel | str):
+        """
+        Envía un mensaje solo a los sockets de la room registrados con
+        `player_id`. Si hay un batch abierto espera en él junto a los
+        broadcasts de la room, así el orden con respecto a ellos se mantiene.
+        """
+        room_id = str(room_id)
+        self.metrics.observe_message(message_type(message), unicast=True)
+        batch = _pending_batch.get()
+        if batch is not None and batch.add(room_id, message, player_id):
+            return
+        if not self._has_audience(room_id):
+            return
+        self.bus.publish(room_id, OutboundMessage(message), player_id=player_id)
+
+    def _flush_room(self, batch: MessageBatch | None, room_id: str) -> None:
+        """Adelanta lo acumulado para `room_id` en el batch abierto, si hay."""
+        if batch is None or batch.closed:
+            return
+        pending = batch.rooms.pop(room_id, None)
+        if pending:
+            self._publish_pending(room_id, pending)
+
+    def _publish_pending(self, room_id: str, pending: list[tuple[OutboundMessage, int | None]]) -> None:
+        """Un frame por cada tramo de broadcasts seguidos; los privados salen solos, en orden."""
+        if not self._has_audience(room_id):
+            return
+        for player_id, entries in itertools.groupby(pending, key=lambda entry: entry[1]):
+            messages = [message for message, _ in entries]
+            if player_id is None:
+                self.bus.publish(room_id, batch_envelope(messages))
+            else:
+                for message in messages:
+                    self.bus.publish(room_id, message, player_id=player_id)
+
+    def _has_audience(self, room_id: str) -> bool:
+        return self.bus.shared or room_id in self.rooms or room_id in self.logs
+
+    async def flush(self, batch: MessageBatch) -> None:
+        """Envía un frame por room con todo lo acumulado en el batch."""
+        batch.closed = True
+        for room_id, pending in batch.rooms.items():
+            self._publish_pending(room_id, pending)
+
+    @asynccontextmanager
+    async def batched(self):
+        """
+        Agrupa los broadcasts hechos dentro del bloque y los envía al salir.
+        Si el bloque termina con una excepción no se envía nada. Las tareas
+        lanzadas dentro del bloque heredan el batch, pero una vez cerrado sus
+        broadcasts vuelven a salir de inmediato.
+        """
+        batch = MessageBatch()
+        token = _pending_batch.set(batch)
+        try:
+            yield batch
+        except BaseException:
+            batch.discard()
+            raise
+        finally:
+            _pending_batch.reset(token)
+            await self.flush(batch)
+
+    def deliver(self, room_id: str, message: OutboundMessage | str, player_id: int | None = None) -> None:
+        """
+        Entrega un mensaje publicado en el bus a las conexiones locales de la
+        room (o solo a las de `player_id`), numerándolo y guardándolo en el
+        log de la room.
+        """
+        if not isinstance(message, OutboundMessage):
+            message = OutboundMessage(message)
+        # Lo que reciben los sockets suscriptos al digest (None: nada)
+        digest_view = message
+        if room_id == LOBBY_ROOM and player_id is None and self.lobby.subscribers:
+            digest_view = self._record_lobby_events(message)
+        tick = message.message_type() in TICK_TYPES
+        # Numerar y encolar bajo el mismo lock mantiene el orden de seq en cada socket
+        with self._lock:
+            log = self.logs.get(room_id)
+            connections = self.connections(room_id)
+            if log is None and not connections:
+                return
+            if log is not None:
+                stamped = log.append(message, player_id)
+                if digest_view is message:
+                    digest_view = stamped
+                elif digest_view is not None:
+                    digest_view = digest_view.with_seq(stamped.seq)
+                message = stamped
+            for connection in connections:
+                outgoing = digest_view if connection.digest is not None else message
+                if outgoing is None:
+                    continue
+                if tick and not connection.ticks:
+                    continue
+                if player_id is None or connection.player_id == player_id:
+                    connection.enqueue(outgoing)
+
+    def _record_lobby_events(self, message: OutboundMessage) -> OutboundMessage | None:
+        """
+        Suma al digest los eventos de partidas y jugadores de `message`, también
+        los que vienen dentro de un batch, y retorna lo que queda para los
+        suscriptores del digest: el mensaje, un batch sin esos eventos o None.
+        """
+        kind = message.message_type()
+        if kind in LOBBY_EVENTS:
+            self.lobby.record(kind, message.data())
+            return None
+        if kind != "batch":
+            return message
+        data = message.data()
+        inner = data.get("messages", []) if isinstance(data, dict) else []
+        rest = []
+        for item in inner:
+            if isinstance(item, dict) and item.get("type") in LOBBY_EVENTS:
+                self.lobby.record(item["type"], item)
+            else:
+                rest.append(item)
+        if len(rest) == len(inner):
+            return message
+        if not rest:
+            return None
+        remaining = rest[0] if len(rest) == 1 else {"type": "batch", "messages": rest}
+        return OutboundMessage(json.dumps(remaining, separators=(",", ":")))
 
 
 manager = ConnectionManager()
 
+
+class BroadcastBatchMiddleware:
+    """
+    Middleware ASGI que junta los broadcasts hechos al atender una request
+    HTTP en un frame por room, enviado cuando la respuesta ya terminó. Una
+    request que falla (una excepción, o una respuesta de error después de
+    que su transacción hizo rollback) no envía ninguno.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        async with manager.batched() as batch:
+            async def send_or_discard(message):
+                # El commit (o rollback) de la request ya pasó cuando sale la respuesta
+                if message["type"] == "http.response.start" and message["status"] >= 400:
+                    batch.discard()
+                await send(message)
+
+            await self.app(scope, receive, send_or_discard)
+
+
+def is_game_player(room_id: str, player_id: int) -> bool:
+    """Si `player_id` juega la partida de la room (la room de una partida es su game_id)."""
+    if not room_id.isdigit():
+        return False
+    with session() as db:
+        return db.execute(
+            select(PlayerGame.id).where(PlayerGame.game_id == int(room_id), PlayerGame.player_id == player_id)
+        ).first() is not None
+
+
 @websocket_router.websocket("/ws/{room_id}")
-async def websocket_endpoint(websocket: WebSocket, room_id: str):
+async def websocket_endpoint(
+    websocket: WebSocket,
+    room_id: str,
+    since: int | None = None,
+    player_id: int | None = None,
+    digest: LobbyFilterEnum | None = None,
+    ticks: bool = False,
+):
+    # Con player_id el socket recibe la mano del jugador: solo para jugadores de esa partida
+    if player_id is not None and not await run_in_threadpool(is_game_player, room_id, player_id):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
     print(f"Nuevo cliente conectado a la room {room_id}")
-    await manager.connect(websocket, room_id)
+    connection = await manager.connect(
+        websocket, room_id, since=since, player_id=player_id, digest=digest, ticks=ticks
+    )
     try:
         while True:
             text = await websocket.receive_text()
+            connection.last_seen = time.monotonic()
+            if is_pong(text):
+                continue
             print(f"Received message from {websocket}: {text}")
             await manager.broadcast(text, room_id)
     except WebSocketDisconnect:
-        manager.disconnect(websocket, room_id)
\ No newline at end of file
+        pass
+    finally:
+        manager.disconnect(websocket, room_id)
+
+
+@websocket_router.get("/ws/metrics")
+def websocket_metrics(format: str = "json"):
+    """Métricas de los WebSockets en JSON o, con `?format=prometheus`, en texto para Prometheus."""
+    snapshot = manager.metrics_snapshot()
+    if format == "prometheus":
+        return PlainTextResponse(render_prometheus(snapshot), media_type="text/plain; version=0.0.4")
+    return snapshot
@@ -0,0 +1,118 @@
+"""Métricas de los WebSockets: conexiones, broadcasts, bytes y latencias."""
+
+import time
+from collections import Counter, deque
+
+# Cantidad de muestras de latencia que se usan para calcular percentiles
+LATENCY_SAMPLES = 2048
+# Ventana (en segundos) para el cálculo de broadcasts por segundo
+RATE_WINDOW_SECONDS = 60
+
+
+def percentile(samples: list[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class WebSocketMetrics:
+    """
+    Counters fed by ConnectionManager and its connections.
+
+    Fan-out latency is measured per delivered frame, from the moment the
+    message is queued for a socket until the socket finished sending it,
+    over the last LATENCY_SAMPLES frames.
+    """
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.broadcasts = 0
+        self.messages_by_type: Counter[str] = Counter()
+        self.bytes_sent = 0
+        self.frames_sent = 0
+        self.latency_sum = 0.0
+        self._latencies: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        # Broadcasts por segundo (monotonic redondeado) de la última ventana
+        self._per_second: deque[list] = deque(maxlen=RATE_WINDOW_SECONDS)
+
+    def observe_message(self, message_type: str | None, unicast: bool = False) -> None:
+        self.messages_by_type[message_type or "unknown"] += 1
+        if unicast:
+            return
+        self.broadcasts += 1
+        second = int(time.monotonic())
+        if self._per_second and self._per_second[-1][0] == second:
+            self._per_second[-1][1] += 1
+        else:
+            self._per_second.append([second, 1])
+
+    def observe_send(self, nbytes: int, latency: float) -> None:
+        self.frames_sent += 1
+        self.bytes_sent += nbytes
+        self.latency_sum += latency
+        self._latencies.append(latency)
+
+    def broadcasts_per_second(self) -> float:
+        now = time.monotonic()
+        window = min(RATE_WINDOW_SECONDS, max(now - self.started_at, 1.0))
+        recent = sum(count for second, count in list(self._per_second) if now - second <= window)
+        return recent / window
+
+    def latency_quantiles(self) -> dict[str, float]:
+        samples = list(self._latencies)
+        return {"p50": percentile(samples, 0.5), "p99": percentile(samples, 0.99)}
+
+
+def _label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus(snapshot: dict) -> str:
+    """Convierte el snapshot de ConnectionManager.metrics_snapshot() al formato de texto de Prometheus."""
+    lines = [
+        "# HELP ws_connections Open WebSocket connections per room.",
+        "# TYPE ws_connections gauge",
+    ]
+    for room_id, count in snapshot["rooms"].items():
+        lines.append(f'ws_connections{{room="{_label(room_id)}"}} {count}')
+    lines += [
+        "# HELP ws_broadcasts_total Broadcasts requested since startup.",
+        "# TYPE ws_broadcasts_total counter",
+        f"ws_broadcasts_total {snapshot['broadcasts']}",
+        "# HELP ws_messages_total Messages sent to rooms or players, by type.",
+        "# TYPE ws_messages_total counter",
+    ]
+    for message_type, count in snapshot["messages_by_type"].items():
+        lines.append(f'ws_messages_total{{type="{_label(message_type)}"}} {count}')
+    lines += [
+        "# HELP ws_sent_bytes_total Bytes written to WebSocket clients.",
+        "# TYPE ws_sent_bytes_total counter",
+        f"ws_sent_bytes_total {snapshot['bytes_sent']}",
+        "# HELP ws_fanout_latency_seconds Time from queueing a frame for a socket until it was sent.",
+        "# TYPE ws_fanout_latency_seconds summary",
+        f'ws_fanout_latency_seconds{{quantile="0.5"}} {snapshot["fanout_latency"]["p50"]}',
+        f'ws_fanout_latency_seconds{{quantile="0.99"}} {snapshot["fanout_latency"]["p99"]}',
+        f"ws_fanout_latency_seconds_sum {snapshot['fanout_latency']['sum']}",
+        f"ws_fanout_latency_seconds_count {snapshot['frames_sent']}",
+        "# HELP ws_send_queue_depth Frames waiting in each connection's send queue.",
+        "# TYPE ws_send_queue_depth gauge",
+    ]
+    for connection in snapshot["send_queues"]:
+        lines.append(
+            f'ws_send_queue_depth{{room="{_label(connection["room_id"])}",'
+            f'connection="{connection["connection_id"]}"}} {connection["queue_depth"]}'
+        )
+    lines += [
+        "# HELP ws_reaped_connections_total Sockets dropped by the heartbeat reaper.",
+        "# TYPE ws_reaped_connections_total counter",
+        f"ws_reaped_connections_total {snapshot['reaped_connections']}",
+        "# HELP ws_bus_dropped_total Messages the room bus could not hand to another worker.",
+        "# TYPE ws_bus_dropped_total counter",
+        f"ws_bus_dropped_total {snapshot['bus_dropped']}",
+        "# HELP timers_active Event timers waiting in the central scheduler.",
+        "# TYPE timers_active gauge",
+        f"timers_active {snapshot['active_timers']}",
+    ]
+    return "\n".join(lines) + "\n"
@@ -13,7 +13,7 @@ import { NotificationProvider } from '../../components/NotificationContext';
 function App() {
 
 	const [loading, setLoading] = useState(true);
-	const [wsService] = useState(() => createWSService());
+	const [wsService] = useState(() => createWSService("0", null, { digest: "all" }));
 	useEffect(() => {
 		const init = async () => {
 			try {
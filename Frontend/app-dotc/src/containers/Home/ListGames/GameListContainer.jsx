@@ -35,6 +35,19 @@ function GameListContainer({wsService}) {
                       game.id === updatedGame.id ? { ...game, ...updatedGame } : game));
             });
 
+            // Cambios del lobby agrupados por el servidor (suscripción con digest)
+            wsService.on('lobbyDigest', ({ games: { upsert, remove } }) => {
+              setGames(prev => {
+                const removed = new Set(remove);
+                const updates = new Map(upsert.map(game => [game.id, game]));
+                const next = prev
+                  .filter(game => !removed.has(game.id))
+                  .map(game => updates.has(game.id) ? { ...game, ...updates.get(game.id) } : game);
+                const known = new Set(next.map(game => game.id));
+                return [...next, ...upsert.filter(game => !known.has(game.id))];
+              });
+            });
+
           } catch (error) {
             console.error('Failed to initialize app:', error);
           } finally {
@@ -47,6 +60,7 @@ function GameListContainer({wsService}) {
           wsService.off('gameAdd');
           wsService.off('gameDelete');
           wsService.off('gameUpdate');
+          wsService.off('lobbyDigest');
         };
 
     }, [httpService, wsService]);
@@ -103,6 +103,30 @@ describe("GameListContainer", () => {
   	expect(await screen.findByText("Partida 1 - Actualizada")).toBeInTheDocument();
 	});
 
+  it("Aplica los cambios de un 'lobbyDigest'", async () => {
+    render(
+      <MemoryRouter>
+        <GameListContainer wsService={mockWsService} />
+      </MemoryRouter>
+    );
+
+    await waitFor(() => expect(mockWsService.on).toHaveBeenCalledWith("lobbyDigest", expect.any(Function)));
+
+    const digestHandler = mockWsService.on.mock.calls.find(
+      ([event]) => event === "lobbyDigest"
+    )[1];
+
+    await act(async () => {
+      digestHandler({
+        games: { upsert: [{ id: 2, name: "Partida 2" }], remove: [1] },
+        players: { upsert: [], remove: [] },
+      });
+    });
+
+    expect(await screen.findByText("Partida 2")).toBeInTheDocument();
+    expect(screen.queryByText("Partida 1")).not.toBeInTheDocument();
+  });
+
   it("Desuscribe los eventos al desmontar", async () => {
     const { unmount } = render(
       <MemoryRouter>
@@ -117,6 +141,7 @@ describe("GameListContainer", () => {
     expect(mockWsService.off).toHaveBeenCalledWith("gameAdd");
     expect(mockWsService.off).toHaveBeenCalledWith("gameDelete");
     expect(mockWsService.off).toHaveBeenCalledWith("gameUpdate");
+    expect(mockWsService.off).toHaveBeenCalledWith("lobbyDigest");
   });
 
   it("Muestra el catch si falla la carga de juegos", async () => {
@@ -42,7 +42,7 @@ function GameInterfaceContainer() {
 	const [isSocialDisgracee, setIsSocialDisgracee] = useState(false);
 
 	const [loading, setLoading] = useState(true);
-	const [wsInstance] = useState(() => createWSService(game_id));
+	const [wsInstance] = useState(() => createWSService(game_id, player_id));
 
 	const [drawCount, setDrawCount] = useState(0);
 	const [discardCount, setDiscardCount] = useState(0);
@@ -71,6 +71,50 @@ function GameInterfaceContainer() {
 		setIsSocialDisgracee(allRevealed);
 	};
 
+	// Estado completo de la partida: al entrar y cuando el servidor pide un resync
+	const loadGameState = async () => {
+		const game = await httpServiceGame.getGameById(game_id, { room_id: game_id })
+		const myCards = await httpServicePlayerCard.getPlayerCards(player_id, { room_id: game_id });
+		const playersInGame = await httpServicePlayerGame.getGamePlayers(game_id, { room_id: game_id })
+		const playerRole = await httpServicePlayerGame.getPlayerRole(game_id, player_id, { room_id: game_id })
+		const mySets = await httpServiceSetDetective.getDetectiveSetByPlayer(player_id, { room_id: game_id });
+		const mySecrets = await httpServiceSecretCards.getSecretCardByPlayer(player_id, { room_id: game_id });
+		const nonSecretCards = myCards.filter(card => !card.name.startsWith('secret_'));
+		const updatedCards = [...nonSecretCards, ...mySecrets];
+
+		const playersInfoArray = await Promise.all(
+			playersInGame.map(async (p) => {
+				const res = await httpServicePlayer.getPlayerById(p.player_id, { room_id: game_id });
+				return { ...res, position: p.position_id_player };
+			})
+		);
+
+		const playersInfoMap = Object.fromEntries(playersInfoArray.map(p => [p.id, p]));
+
+		const currentPlayer = playersInfoMap[player_id];
+			if (currentPlayer) {
+			setIsSocialDisgracee(currentPlayer.is_Social_Disgrace);
+		}
+
+		setTurnPlayerId(game.turn_id_player)
+		setPlayerRole(playerRole)
+		setCards(updatedCards)
+		setMySecrets(mySecrets)
+		setPlayers(playersInGame)
+		setPlayersData(playersInfoMap)
+		setMyPlayerSets(mySets);
+
+		const deckData = await getAmountCardsOnDeck(game_id);
+		const cardImage = await getCardOnDiscardTop(game_id)
+		const draftCardsData = await getDraftCards(game_id);
+		if (deckData) {
+			setDrawCount(deckData.drawTop);
+			setDiscardCount(deckData.discardTop);
+			setImageDiscardTop(cardImage);
+			setDraftCards(draftCardsData);
+		}
+	};
+
 	useEffect(() => {
 		if (didInit.current) return;
 		didInit.current = true;
@@ -83,47 +127,8 @@ function GameInterfaceContainer() {
 					wsInstance.connect();
 				}
 				setLoading(true);
+				await loadGameState();
 
-				const game = await httpServiceGame.getGameById(game_id, { room_id: game_id })
-				const myCards = await httpServicePlayerCard.getPlayerCards(player_id, { room_id: game_id });
-				const playersInGame = await httpServicePlayerGame.getGamePlayers(game_id, { room_id: game_id })
-				const playerRole = await httpServicePlayerGame.getPlayerRole(game_id, player_id, { room_id: game_id })
-				const mySets = await httpServiceSetDetective.getDetectiveSetByPlayer(player_id, { room_id: game_id });
-				const mySecrets = await httpServiceSecretCards.getSecretCardByPlayer(player_id, { room_id: game_id });
-				const nonSecretCards = myCards.filter(card => !card.name.startsWith('secret_'));
-				const updatedCards = [...nonSecretCards, ...mySecrets];
-
-				const playersInfoArray = await Promise.all(
-					playersInGame.map(async (p) => {
-						const res = await httpServicePlayer.getPlayerById(p.player_id, { room_id: game_id });
-						return { ...res, position: p.position_id_player };
-					})
-				);
-
-				const playersInfoMap = Object.fromEntries(playersInfoArray.map(p => [p.id, p]));
-
-				const currentPlayer = playersInfoMap[player_id];
-					if (currentPlayer) {
-					setIsSocialDisgracee(currentPlayer.is_Social_Disgrace);
-				}
-
-				setTurnPlayerId(game.turn_id_player)
-				setPlayerRole(playerRole)
-				setCards(updatedCards)
-				setMySecrets(mySecrets)
-				setPlayers(playersInGame)
-				setPlayersData(playersInfoMap)
-				setMyPlayerSets(mySets);
-
-				const deckData = await getAmountCardsOnDeck(game_id);
-				const cardImage = await getCardOnDiscardTop(game_id)
-				const draftCardsData = await getDraftCards(game_id);
-				if (deckData) {
-					setDrawCount(deckData.drawTop);
-					setDiscardCount(deckData.discardTop);
-					setImageDiscardTop(cardImage);
-					setDraftCards(draftCardsData);
-				}
 				wsInstance.on('gamePlayerDiscard', (data) => {
 					setDiscardCount(prev => prev + 1);
 					setImageDiscardTop(data.card_discard.image_url);
@@ -295,6 +300,15 @@ function GameInterfaceContainer() {
 					setCards((prev) => prev.filter((c) => c.id !== data));
 				});
 
+				wsInstance.on('resyncRequired', async () => {
+					// Se perdieron eventos que el servidor ya no guarda: se recarga todo
+					try {
+						await loadGameState();
+					} catch (error) {
+						console.error("Failed to resync game state:", error);
+					}
+				});
+
 				wsInstance.on('murdererReveled', (data) => {
 					setVictoryCondition(data)
 					setStateModal("El asesino ha sido revelado")
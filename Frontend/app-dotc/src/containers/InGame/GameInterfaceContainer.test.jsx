@@ -203,6 +203,21 @@ describe('GameInterfaceContainer', () => {
     await waitFor(() => expect(MockGameInterfaceSpy).toHaveBeenLastCalledWith(expect.objectContaining({ turnPlayerId: 5 }), undefined));
   });
 
+  it("maneja el evento 'resyncRequired' de WS y recarga el estado", async () => {
+    render(<GameInterfaceContainer />);
+    await waitFor(() => expect(mockWsOn).toHaveBeenCalledWith('resyncRequired', expect.any(Function)));
+    const resyncHandler = mockWsOn.mock.calls.find(call => call[0] === 'resyncRequired')[1];
+    mockGetGameById.mockResolvedValue({ turn_id_player: 7 });
+    mockGetAmountCardsOnDeck.mockResolvedValue({ drawTop: 4, discardTop: 9 });
+    await act(async () => { await resyncHandler(42); });
+    expect(mockGetGameById).toHaveBeenCalledTimes(2);
+    await waitFor(() => expect(MockGameInterfaceSpy).toHaveBeenLastCalledWith(expect.objectContaining({
+      turnPlayerId: 7,
+      drawTop: 4,
+      discardTop: 9,
+    }), undefined));
+  });
+
   it('cubre el `return` del useEffect si `didInit.current` es true', async () => {
     const { rerender } = render(<GameInterfaceContainer />);
     await waitFor(() => expect(mockGetGameById).toHaveBeenCalledTimes(1));
@@ -30,6 +30,8 @@ export const useNotSoFast = (gameId,
   const [httpPlayerCardService] = useState(() => createPlayerCardService());
   const [httpGamePlayerService] = useState(() => createGamePlayerService());
   const [hasNotSoFast, setHasNotSoFast] = useState(false);
+  // Fin de la ventana en el reloj local (ms); null si no hay evento en curso
+  const [countdownDeadline, setCountdownDeadline] = useState(null);
   const {lockGame, unlockGame} = useGameLock();
 
   const playedByRef = useRef(null);
@@ -113,10 +115,36 @@ export const useNotSoFast = (gameId,
     
   }, [eventCard]);
 
+  const showTime = useCallback((time) => {
+    if (hasNotSoFast) {
+      setTitleModal(`¿Quieres jugar una Not So Fast?  Tiempo: ${time}`);
+    } else {
+      setTitleModal(`No tienes Not So Fast para jugar  Tiempo: ${time}`);
+    }
+  }, [hasNotSoFast]);
+
+  // El servidor manda el deadline y su hora; la cuenta regresiva se arma acá
+  const syncDeadline = (data) => {
+    if (data.deadline != null && data.server_time != null) {
+      setCountdownDeadline(Date.now() + (data.deadline - data.server_time));
+    }
+  };
+
+  useEffect(() => {
+    if (countdownDeadline === null) return;
+    const update = () => {
+      showTime(Math.max(0, Math.round((countdownDeadline - Date.now()) / 1000)));
+    };
+    update();
+    const interval = setInterval(update, 1000);
+    return () => clearInterval(interval);
+  }, [countdownDeadline, showTime]);
+
   // EVENTO DE TIMER
 
   useEffect(() => {    
 		wsInstance.on('EVENT_STARTED', (data) => {
+      syncDeadline(data)
 			if (data.event_by_player != playerId) {
 				onTimerStart()
 			} 
@@ -135,6 +163,7 @@ export const useNotSoFast = (gameId,
 		})
 
     wsInstance.on('EVENT_CANCELLED', (data) => {
+      setCountdownDeadline(null)
 			setIsOpenSelectCards(false)
       showNotification(
         <p>El jugador <b>{data.player_name}</b> ha jugado un Not So Fast !</p>, 
@@ -144,6 +173,7 @@ export const useNotSoFast = (gameId,
 		})
 
     wsInstance.on('COUNTDOWN_END', (data) => {
+      setCountdownDeadline(null)
       setIsOpenSelectCards(false)
       unlockGame()
       if (!isDetectiveEffect) {
@@ -186,21 +216,24 @@ export const useNotSoFast = (gameId,
       eventCardRef.current = (null);
 		})
 
+    wsInstance.on('COUNTDOWN_SYNC', syncDeadline)
+
+    wsInstance.on('COUNTDOWN_CANCELLED', () => setCountdownDeadline(null))
+
+    // Solo llega a los sockets conectados con ?ticks=true
     wsInstance.on('COUNTDOWN_TICK', (data) => {
-      if (hasNotSoFast) {
-        setTitleModal(`¿Quieres jugar una Not So Fast?  Tiempo: ${data.time}`);
-      } else {
-        setTitleModal(`No tienes Not So Fast para jugar  Tiempo: ${data.time}`);
-      }
+      showTime(data.time)
     })
 
     return () => {
       wsInstance.off('EVENT_STARTED');
       wsInstance.off('COUNTDOWN_END');
+      wsInstance.off('COUNTDOWN_SYNC');
+      wsInstance.off('COUNTDOWN_CANCELLED');
       wsInstance.off('COUNTDOWN_TICK');
     };
 
-	}, [wsInstance, hasNotSoFast, isDetectiveEffect]);
+	}, [wsInstance, showTime, isDetectiveEffect]);
 
   return {
     startTimer,
@@ -356,6 +356,33 @@ describe('useNotSoFast', () => {
         expect(setTitleModal).toHaveBeenCalledWith("No tienes Not So Fast para jugar  Tiempo: 3");
     }); 
 
+    it('EVENT_STARTED con deadline arma la cuenta regresiva local', async () => {
+        vi.useFakeTimers();
+        vi.setSystemTime(1_000_000);
+        const setTitleModal = vi.fn();
+        renderHookWithDefaults({ setTitleModal, isDetectiveEffect: true });
+
+        fireWsEvent('EVENT_STARTED', {
+            event_by_player: PLAYER_ID,
+            // Reloj del servidor 5s adelantado: solo cuenta la diferencia
+            server_time: 1_005_000,
+            deadline: 1_015_000,
+        });
+        expect(setTitleModal).toHaveBeenLastCalledWith("No tienes Not So Fast para jugar  Tiempo: 10");
+
+        act(() => { vi.advanceTimersByTime(3000); });
+        expect(setTitleModal).toHaveBeenLastCalledWith("No tienes Not So Fast para jugar  Tiempo: 7");
+
+        fireWsEvent('COUNTDOWN_SYNC', { server_time: 1_008_000, deadline: 1_010_000 });
+        expect(setTitleModal).toHaveBeenLastCalledWith("No tienes Not So Fast para jugar  Tiempo: 2");
+
+        fireWsEvent('COUNTDOWN_END', { final_state: 'active' });
+        setTitleModal.mockClear();
+        act(() => { vi.advanceTimersByTime(3000); });
+        expect(setTitleModal).not.toHaveBeenCalled();
+        vi.useRealTimers();
+    });
+
     it('EVENT_CANCELLED muestra notificación correcta', async () => {
         const setIsOpenSelectCards = vi.fn();
         const { result } = renderHookWithDefaults({ setIsOpenSelectCards });
@@ -1,8 +1,18 @@
-const createWSService = (initialRoom = "0") => {
+const createWSService = (initialRoom = "0", playerId = null, { digest = null } = {}) => {
   let ws = null;
   let connected = false;
   let room = initialRoom;
-  const wsUrl = (r) => `ws://localhost:8000/ws/${r}`;
+  let lastSeq = null; // último seq recibido de la room, para reanudar al reconectar
+  const wsUrl = (r) => {
+    // player_id registra el socket para recibir los mensajes privados del jugador
+    const params = new URLSearchParams();
+    if (playerId !== null) params.set("player_id", playerId);
+    // digest ("all" | "open"): en el lobby, cambios agrupados en un lobbyDigest periódico
+    if (digest !== null) params.set("digest", digest);
+    if (lastSeq !== null) params.set("since", lastSeq);
+    const query = params.toString();
+    return query ? `ws://localhost:8000/ws/${r}?${query}` : `ws://localhost:8000/ws/${r}`;
+  };
   const listeners = {};
 
   
@@ -27,7 +37,20 @@ const createWSService = (initialRoom = "0") => {
         console.log("📩 Mensaje WS recibido:", event.data);
         try {
           const data = JSON.parse(event.data);
-          emit(data.type, data.payload);
+          if (typeof data.seq === "number") lastSeq = data.seq;
+          if (data.type === "ping") {
+            // Heartbeat del servidor: si no respondemos, nos desconecta
+            ws.send(JSON.stringify({ type: "pong" }));
+          } else if (data.type === "resyncRequired") {
+            // Se perdieron mensajes que el servidor ya no guarda: hay que recargar el estado
+            lastSeq = data.payload;
+            emit(data.type, data.payload);
+          } else if (data.type === "batch") {
+            // Varios mensajes de una misma acción llegan en un solo frame
+            data.messages.forEach(message => emit(message.type, message.payload));
+          } else {
+            emit(data.type, data.payload);
+          }
         } catch (error) {
           console.error('Error parsing WebSocket message:', error);
         }
@@ -64,6 +87,7 @@ const createWSService = (initialRoom = "0") => {
   const joinRoom = (newRoom) => {
     if (ws) ws.close(); // cerrar conexión anterior
     room = newRoom;
+    lastSeq = null;
     ws = null;
     connect(); // conectar a la nueva room
   };
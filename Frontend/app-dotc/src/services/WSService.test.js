@@ -113,6 +113,51 @@ describe('WSService', () => {
       consoleSpy.mockRestore();
     });
 
+    it('resumes from the last received seq when reconnecting', () => {
+      vi.spyOn(console, 'log').mockImplementation(() => {});
+      wsService.connect();
+      mockWebSocket.onmessage({ data: JSON.stringify({ seq: 41, type: 'gameNextTurn', payload: 2 }) });
+      mockWebSocket.onclose();
+
+      vi.advanceTimersByTime(3000);
+      expect(global.WebSocket).toHaveBeenLastCalledWith('ws://localhost:8000/ws/0?since=41');
+    });
+
+    it('resumes from the server seq after a resync notice', () => {
+      const callback = vi.fn();
+      vi.spyOn(console, 'log').mockImplementation(() => {});
+      wsService.on('resyncRequired', callback);
+      wsService.connect();
+      mockWebSocket.onmessage({ data: JSON.stringify({ type: 'resyncRequired', payload: 90 }) });
+      mockWebSocket.onclose();
+
+      vi.advanceTimersByTime(3000);
+      expect(callback).toHaveBeenCalledWith(90);
+      expect(global.WebSocket).toHaveBeenLastCalledWith('ws://localhost:8000/ws/0?since=90');
+    });
+
+    it('registers the player id when connecting', () => {
+      const service = createWSService('12', 3);
+      service.connect();
+      expect(global.WebSocket).toHaveBeenLastCalledWith('ws://localhost:8000/ws/12?player_id=3');
+    });
+
+    it('answers server pings with a pong', () => {
+      const callback = vi.fn();
+      wsService.on('ping', callback);
+      wsService.connect();
+      mockWebSocket.onmessage({ data: JSON.stringify({ type: 'ping' }) });
+
+      expect(mockWebSocket.send).toHaveBeenCalledWith(JSON.stringify({ type: 'pong' }));
+      expect(callback).not.toHaveBeenCalled();
+    });
+
+    it('subscribes to the lobby digest when asked to', () => {
+      const service = createWSService('0', null, { digest: 'open' });
+      service.connect();
+      expect(global.WebSocket).toHaveBeenLastCalledWith('ws://localhost:8000/ws/0?digest=open');
+    });
+
     it('closes WebSocket connection on disconnect', () => {
       wsService.connect();
       wsService.disconnect();
@@ -132,6 +177,25 @@ describe('WSService', () => {
       expect(typeof wsService.on).toBe('function');
     });
 
+    it('unpacks batched messages in order', () => {
+      const calls = [];
+      wsService.on('gamePlayerRestock', (payload) => calls.push(['restock', payload]));
+      wsService.on('gameNextTurn', (payload) => calls.push(['nextTurn', payload]));
+      wsService.connect();
+
+      mockWebSocket.onmessage({
+        data: JSON.stringify({
+          type: 'batch',
+          messages: [
+            { type: 'gamePlayerRestock', payload: { player_id: 1 } },
+            { type: 'gameNextTurn', payload: 2 }
+          ]
+        })
+      });
+
+      expect(calls).toEqual([['restock', { player_id: 1 }], ['nextTurn', 2]]);
+    });
+
     it('processes joinRoom messages', () => {
       const callback = vi.fn();
 